@@ -1,16 +1,49 @@
 """API dependencies."""
 
+from datetime import datetime
 from typing import AsyncGenerator
+from zoneinfo import ZoneInfo
 
+from fastapi import Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
+from services.signal_service import signal_service
 from shared.database.connection import async_session_maker
 
+ANALYTICS_CACHE_CONTROL = "max-age=30, must-revalidate"
+
+_tz = ZoneInfo(settings.TIMEZONE)
+
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session dependency."""
     async with async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+async def analytics_etag(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_db_session),
+) -> None:
+    """Answer 304 Not Modified when analytics data has not changed.
+
+    Analytics only change when a signal is stored or the local clock moves
+    to the next hour (period windows and hourly labels follow it), so the
+    weak ETag is the last signal id plus the current local hour.
+
+    Raises:
+        HTTPException: 304 if the client's If-None-Match matches
+    """
+    last_id = await signal_service.get_last_signal_id(session)
+    etag = f'W/"{last_id}-{datetime.now(_tz):%Y%m%d%H}"'
+    headers = {"ETag": etag, "Cache-Control": ANALYTICS_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
@@ -3,15 +3,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.dependencies import get_db_session
+from api.dependencies import analytics_etag, get_db_session
+from core.cache import cached, PERIOD_TTL
 from services.analytics_service import analytics_service
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
-VALID_PERIODS = ["today", "yesterday", "week", "month"]
+PERIODS = ("today", "yesterday", "week", "month")
+VALID_PERIODS: frozenset[str] = frozenset(PERIODS)
 
+# Time series has no "yesterday" view
+TIMESERIES_PERIODS: frozenset[str] = frozenset({"today", "week", "month"})
 
-@router.get("/timeseries/{period}")
+# Error details are built once instead of on every rejected request
+_INVALID_PERIOD_DETAIL = f"Invalid period. Must be one of: {', '.join(PERIODS)}"
+_INVALID_TIMESERIES_PERIOD_DETAIL = "Invalid period. Must be one of: today, week, month"
+
+
+@router.get("/timeseries/{period}", dependencies=[Depends(analytics_etag)])
+@cached("timeseries", ttl=PERIOD_TTL)
 async def get_time_series(
     period: str,
     session: AsyncSession = Depends(get_db_session),
@@ -24,17 +34,18 @@ async def get_time_series(
     Returns:
         Time series data with labels and counts
     """
-    if period not in ["today", "week", "month"]:
+    if period not in TIMESERIES_PERIODS:
         raise HTTPException(
             status_code=400,
-            detail="Invalid period. Must be one of: today, week, month",
+            detail=_INVALID_TIMESERIES_PERIOD_DETAIL,
         )
 
     data = await analytics_service.get_time_series(session, period)
     return data
 
 
-@router.get("/comparison/today")
+@router.get("/comparison/today", dependencies=[Depends(analytics_etag)])
+@cached("comparison", ttl=PERIOD_TTL["today"])
 async def get_comparison(
     session: AsyncSession = Depends(get_db_session),
 ):
@@ -43,7 +54,25 @@ async def get_comparison(
     return comparison
 
 
-@router.get("/{period}")
+@router.get("/probabilities/{period}", dependencies=[Depends(analytics_etag)])
+@cached("probabilities", ttl=PERIOD_TTL)
+async def get_probability_stats(
+    period: str,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Get average long/short probabilities per target for period."""
+    if period not in VALID_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=_INVALID_PERIOD_DETAIL,
+        )
+
+    stats = await analytics_service.get_probability_stats(session, period)
+    return stats
+
+
+@router.get("/{period}", dependencies=[Depends(analytics_etag)])
+@cached("analytics", ttl=PERIOD_TTL)
 async def get_analytics(
     period: str,
     session: AsyncSession = Depends(get_db_session),
@@ -52,7 +81,7 @@ async def get_analytics(
     if period not in VALID_PERIODS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid period. Must be one of: {VALID_PERIODS}",
+            detail=_INVALID_PERIOD_DETAIL,
         )
 
     analytics = await analytics_service.get_analytics(session, period)
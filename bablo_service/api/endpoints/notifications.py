@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_db_session
-from services.notification_service import notification_service
+from services.notification_service import REPORT_TYPES, notification_service
+from shared.schemas.bablo import BabloSettingsSchema
 from shared.utils.logger import get_logger
 from shared.utils.redis_client import get_redis_client
 from shared.utils.error_publisher import publish_error
@@ -13,36 +14,17 @@ logger = get_logger("bablo_notifications_api")
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
+VALID_REPORT_TYPES: frozenset[str] = frozenset(REPORT_TYPES)
 
-@router.get("/{user_id}")
+
+@router.get("/{user_id}", response_model=BabloSettingsSchema)
 async def get_user_settings(
     user_id: int,
     session: AsyncSession = Depends(get_db_session),
 ):
     """Get user notification settings."""
     try:
-        settings = await notification_service.get_user_settings(session, user_id)
-
-        return {
-            "user_id": settings.user_id,
-            "notifications_enabled": settings.notifications_enabled,
-            "min_quality": settings.min_quality,
-            "min_strength": settings.min_strength,
-            "timeframe_1m": settings.timeframe_1m,
-            "timeframe_5m": settings.timeframe_5m,
-            "timeframe_15m": settings.timeframe_15m,
-            "timeframe_30m": settings.timeframe_30m,
-            "timeframe_1h": settings.timeframe_1h,
-            "timeframe_4h": settings.timeframe_4h,
-            "long_signals": settings.long_signals,
-            "short_signals": settings.short_signals,
-            "morning_report": settings.morning_report,
-            "evening_report": settings.evening_report,
-            "weekly_report": settings.weekly_report,
-            "monthly_report": settings.monthly_report,
-            "activity_window_minutes": settings.activity_window_minutes,
-            "activity_threshold": settings.activity_threshold,
-        }
+        return await notification_service.get_user_settings(session, user_id)
     except Exception as e:
         logger.error(f"Error getting settings for user {user_id}: {e}", exc_info=True)
         try:
@@ -80,6 +62,18 @@ async def update_user_settings(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/reports/users")
+async def get_users_for_all_reports(
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Get subscribers of every report type in one query.
+
+    Returns:
+        Dictionary mapping report type to list of user IDs
+    """
+    return await notification_service.get_users_for_reports(session)
+
+
 @router.get("/reports/{report_type}/users")
 async def get_users_for_report(
     report_type: str,
@@ -93,7 +87,7 @@ async def get_users_for_report(
     Returns:
         List of user IDs
     """
-    if report_type not in ["morning", "evening", "weekly", "monthly"]:
+    if report_type not in VALID_REPORT_TYPES:
         raise HTTPException(status_code=400, detail="Invalid report type")
 
     users = await notification_service.get_users_for_report(session, report_type)
@@ -4,11 +4,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_db_session
+from core.cache import cached, REPORT_TTL
 from services.report_service import report_service
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-VALID_REPORT_TYPES = ["morning", "evening", "weekly", "monthly"]
+REPORT_TYPES = ("morning", "evening", "weekly", "monthly")
+VALID_REPORT_TYPES: frozenset[str] = frozenset(REPORT_TYPES)
+
+_INVALID_REPORT_TYPE_DETAIL = f"Invalid report type. Must be one of: {', '.join(REPORT_TYPES)}"
 
 
 @router.post("/generate")
@@ -20,7 +24,7 @@ async def generate_report(
     if report_type not in VALID_REPORT_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid report type. Must be one of: {VALID_REPORT_TYPES}",
+            detail=_INVALID_REPORT_TYPE_DETAIL,
         )
 
     report = await report_service.generate_report(session, report_type)
@@ -28,15 +32,20 @@ async def generate_report(
 
 
 @router.get("/data/{report_type}")
+@cached("report_data", ttl=REPORT_TTL, ttl_key="report_type")
 async def get_report_data(
     report_type: str,
     session: AsyncSession = Depends(get_db_session),
 ):
-    """Get raw report data for aggregation."""
+    """Get raw report data for aggregation.
+
+    Scheduled broadcasts request the same report for many users at once,
+    so the result is shared through Redis until the next signal arrives.
+    """
     if report_type not in VALID_REPORT_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid report type. Must be one of: {VALID_REPORT_TYPES}",
+            detail=_INVALID_REPORT_TYPE_DETAIL,
         )
 
     data = await report_service.get_report_data(session, report_type)
@@ -1,33 +1,80 @@
 """Signals API endpoints."""
 
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.dependencies import get_db_session
+from core.cache import cached
 from services.signal_service import signal_service
+from shared.database.connection import async_session_maker
+from shared.schemas.bablo import BabloSignalListResponse
 
 router = APIRouter(prefix="/signals", tags=["signals"])
 
+# Filtered totals are cached briefly (and dropped on every new signal)
+COUNT_CACHE_TTL = 30
 
-@router.get("")
+
+@cached("signals_count", ttl=COUNT_CACHE_TTL)
+async def _count_filtered_signals(
+    session: AsyncSession,
+    from_date: Optional[datetime],
+    to_date: Optional[datetime],
+    direction: Optional[str],
+    timeframes: Optional[list[str]],
+    min_quality: Optional[int],
+) -> int:
+    """Count signals matching list filters (cached in Redis)."""
+    return await signal_service.get_signals_count(
+        session,
+        from_date=from_date,
+        to_date=to_date,
+        direction=direction,
+        timeframes=timeframes,
+        min_quality=min_quality,
+    )
+
+
+@router.get("", response_model=BabloSignalListResponse)
 async def list_signals(
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
     direction: Optional[str] = None,
     timeframe: Optional[str] = None,
     timeframes: Optional[str] = Query(default=None, description="Comma-separated timeframes: 1m,5m,1h"),
     min_quality: Optional[int] = None,
+    after_received_at: Optional[datetime] = Query(default=None, description="Cursor: received_at of last seen signal"),
+    after_id: Optional[int] = Query(default=None, description="Cursor: id of last seen signal"),
     session: AsyncSession = Depends(get_db_session),
 ):
-    """List signals with optional filters."""
+    """List signals with optional filters.
+
+    Supports keyset pagination: pass ``next_cursor`` values of the previous
+    page as ``after_received_at``/``after_id`` (``offset`` is then ignored).
+    """
+    if (after_received_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_received_at and after_id must be passed together",
+        )
     from_dt = None
     if from_date:
         from_dt = datetime.fromisoformat(from_date)
 
+    to_dt = None
+    if to_date:
+        to_dt = datetime.fromisoformat(to_date)
+
+    # The page query is always range-bounded on received_at so the planner
+    # can use an index range scan instead of sorting the whole table
+    page_to_dt = to_dt or datetime.now(timezone.utc) + timedelta(days=1)
+
     # Parse comma-separated timeframes list
     tf_list = None
     if timeframes:
@@ -35,44 +82,47 @@ async def list_signals(
     elif timeframe:
         tf_list = [timeframe]
 
-    signals = await signal_service.get_signals(
-        session,
-        limit=limit,
-        offset=offset,
-        from_date=from_dt,
-        direction=direction,
-        timeframes=tf_list,
-        min_quality=min_quality,
-    )
+    # Page and total count run concurrently; an AsyncSession cannot run
+    # two queries at once, so the count gets its own pooled connection
+    async with async_session_maker() as count_session:
+        if from_dt or to_dt or direction or tf_list or min_quality:
+            count_coro = _count_filtered_signals(
+                session=count_session,
+                from_date=from_dt,
+                to_date=to_dt,
+                direction=direction,
+                timeframes=tf_list,
+                min_quality=min_quality,
+            )
+        else:
+            # Unfiltered total: planner estimate instead of a full COUNT(*)
+            count_coro = signal_service.get_signals_count_estimate(count_session)
 
-    total = await signal_service.get_signals_count(
-        session,
-        from_date=from_dt,
-        direction=direction,
-        timeframes=tf_list,
-        min_quality=min_quality,
-    )
+        signals, total = await asyncio.gather(
+            signal_service.get_signals(
+                session,
+                limit=limit,
+                offset=0 if after_id is not None else offset,
+                from_date=from_dt,
+                to_date=page_to_dt,
+                direction=direction,
+                timeframes=tf_list,
+                min_quality=min_quality,
+                after_received_at=after_received_at,
+                after_id=after_id,
+            ),
+            count_coro,
+        )
+
+    next_cursor = None
+    if len(signals) == limit:
+        last = signals[-1]
+        next_cursor = {"after_received_at": last.received_at, "after_id": last.id}
 
     return {
-        "signals": [
-            {
-                "id": s.id,
-                "symbol": s.symbol,
-                "direction": s.direction,
-                "strength": s.strength,
-                "timeframe": s.timeframe,
-                "time_horizon": s.time_horizon,
-                "quality_total": s.quality_total,
-                "quality_profit": s.quality_profit,
-                "quality_drawdown": s.quality_drawdown,
-                "quality_accuracy": s.quality_accuracy,
-                "probabilities": s.probabilities,
-                "max_drawdown": float(s.max_drawdown) if s.max_drawdown else None,
-                "received_at": s.received_at.isoformat(),
-            }
-            for s in signals
-        ],
+        "signals": signals,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
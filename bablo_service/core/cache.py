@@ -0,0 +1,17 @@
+"""Analytics cache of the Bablo service (see shared.utils.cache)."""
+
+from shared.utils.cache import PERIOD_TTL, AnalyticsCache
+
+analytics_cache = AnalyticsCache("bablo")
+
+cached = analytics_cache.cached
+local_cached = analytics_cache.local_cached
+invalidate_cache = analytics_cache.invalidate
+
+# Reports cover the same windows as the analytics periods they are built from
+REPORT_TTL = {
+    "morning": PERIOD_TTL["yesterday"],
+    "evening": PERIOD_TTL["today"],
+    "weekly": PERIOD_TTL["week"],
+    "monthly": PERIOD_TTL["month"],
+}
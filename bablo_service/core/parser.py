@@ -33,47 +33,104 @@ class ParsedBabloSignal:
     raw_message: Optional[str] = None
 
 
-class BabloParser:
-    """Parser for Bablo trading signals from Telegram channel."""
-
-    # Direction patterns (green = long, red = short)
-    LONG_PATTERN = r"(🟩+)"
-    SHORT_PATTERN = r"(🟥+)"
-
-    # Symbol pattern - extract from markdown link [SYMBOL](url)
-    # Example: [SYNUSDT.P](https://ru.tradingview.com/symbols/SYNUSDT.P/)
-    SYMBOL_PATTERN = r"\[([A-Z0-9]+(?:\.P)?)\]\(https?://[^)]+\)"
-
-    # Timeframe pattern with backticks
-    # Example: `| 1м ТФ |` or `| 30м ТФ |`
-    TIMEFRAME_PATTERN = r"`?\|?\s*(\d+)([мч])\s*ТФ\s*\|?`?"
-
-    # Quality pattern with bold markdown
-    # Example: **Качество = 7 из 10:**
-    QUALITY_PATTERN = r"\*?\*?Качество\s*=\s*(\d+)\s*из\s*10"
+# Patterns are compiled once at import time at module scope, so the hot
+# parse path uses plain global lookups and other modules can import them
+# directly.
+
+# Direction squares (green = long, red = short), checked in this order.
+# Strength is the length of the first run, counted with plain str ops.
+DIRECTION_SQUARES = (("🟩", "long"), ("🟥", "short"))
+
+# Symbol pattern - extract from markdown link [SYMBOL](url)
+# Example: [SYNUSDT.P](https://ru.tradingview.com/symbols/SYNUSDT.P/)
+SYMBOL_PATTERN = re.compile(r"\[([A-Z0-9]+(?:\.P)?)\]\(https?://[^)]+\)")
+
+# Timeframe pattern with backticks
+# Example: `| 1м ТФ |` or `| 30м ТФ |`
+TIMEFRAME_PATTERN = re.compile(r"`?\|?\s*(\d+)([мч])\s*ТФ\s*\|?`?")
+
+# Quality pattern with bold markdown
+# Example: **Качество = 7 из 10:**
+QUALITY_PATTERN = re.compile(r"\*?\*?Качество\s*=\s*(\d+)\s*из\s*10")
+
+# Quality breakdown patterns (with underscores)
+PROFIT_PATTERN = re.compile(r"Профитность\s*_*(\d+)_*\s*из")
+DRAWDOWN_QUALITY_PATTERN = re.compile(r"Просадка\s*_*(\d+)_*\s*из")
+ACCURACY_PATTERN = re.compile(r"Точность\s*_*(\d+)_*\s*из")
+
+# Time horizon pattern
+# Example: **Вероятность (60 минут):**
+HORIZON_PATTERN = re.compile(r"Вероятность\s*\(([^)]+)\)")
+
+# Probability pattern - new format with backticks
+# Example: `0.3%`: 📉 `86%`, 📈 `72%`
+PROB_PATTERN = re.compile(r"`?([\d.]+)%`?:\s*📉\s*`?(\d+)%`?,\s*📈\s*`?(\d+)%`?")
+
+# Max drawdown pattern with underscores
+# Example: Максимальная просадка = __6%__
+MAX_DRAWDOWN_PATTERN = re.compile(r"Максимальная просадка\s*=\s*_*(\d+)%?_*")
+
+# Literals every valid signal must contain (symbol link, timeframe,
+# quality header); checked with plain substring search before any regex
+REQUIRED_MARKERS = ("](http", "ТФ", "Качество")
+
+# Timeframe mapping
+TIMEFRAME_MAP = {
+    "м": "m",  # minutes
+    "ч": "h",  # hours
+}
+
+# All field patterns fused into one alternation so parse() walks the
+# message once. Each alternative is wrapped in a named group; the
+# pattern's own capture groups follow it positionally.
+COMBINED_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern.pattern})"
+        for name, pattern in (
+            ("symbol", SYMBOL_PATTERN),
+            ("timeframe", TIMEFRAME_PATTERN),
+            ("quality", QUALITY_PATTERN),
+            ("profit", PROFIT_PATTERN),
+            ("drawdown", DRAWDOWN_QUALITY_PATTERN),
+            ("accuracy", ACCURACY_PATTERN),
+            ("horizon", HORIZON_PATTERN),
+            ("prob", PROB_PATTERN),
+            ("max_drawdown", MAX_DRAWDOWN_PATTERN),
+        )
+    )
+)
+
+
+def _group(match: re.Match, index: int) -> str:
+    """Get capture group of a combined-pattern match, relative to its field."""
+    return match.group(match.lastindex + index)
+
+
+def _field_int(fields: dict[str, re.Match], kind: str) -> Optional[int]:
+    """Get integer value of a single-group field, if it was matched."""
+    match = fields.get(kind)
+    if match:
+        return int(_group(match, 1))
+    return None
+
+
+def _extract_direction_and_strength(message: str) -> tuple[Optional[str], int]:
+    """Extract signal direction and strength from emoji squares."""
+    for square, direction in DIRECTION_SQUARES:
+        start = message.find(square)
+        if start == -1:
+            continue
+
+        end = start + 1
+        while message.startswith(square, end):
+            end += 1
+        return direction, end - start
+
+    return None, 0
 
-    # Quality breakdown patterns (with underscores)
-    PROFIT_PATTERN = r"Профитность\s*_*(\d+)_*\s*из"
-    DRAWDOWN_QUALITY_PATTERN = r"Просадка\s*_*(\d+)_*\s*из"
-    ACCURACY_PATTERN = r"Точность\s*_*(\d+)_*\s*из"
 
-    # Time horizon pattern
-    # Example: **Вероятность (60 минут):**
-    HORIZON_PATTERN = r"Вероятность\s*\(([^)]+)\)"
-
-    # Probability pattern - new format with backticks
-    # Example: `0.3%`: 📉 `86%`, 📈 `72%`
-    PROB_PATTERN = r"`?([\d.]+)%`?:\s*📉\s*`?(\d+)%`?,\s*📈\s*`?(\d+)%`?"
-
-    # Max drawdown pattern with underscores
-    # Example: Максимальная просадка = __6%__
-    MAX_DRAWDOWN_PATTERN = r"Максимальная просадка\s*=\s*_*(\d+)%?_*"
-
-    # Timeframe mapping
-    TIMEFRAME_MAP = {
-        "м": "m",  # minutes
-        "ч": "h",  # hours
-    }
+class BabloParser:
+    """Parser for Bablo trading signals from Telegram channel."""
 
     def parse(self, message: str) -> Optional[ParsedBabloSignal]:
         """Parse message and extract signal data.
@@ -87,45 +144,60 @@ class BabloParser:
         if not message:
             return None
 
+        # Fast reject: most channel messages are not signals at all
+        for marker in REQUIRED_MARKERS:
+            if marker not in message:
+                return None
+
         try:
-            # Extract direction and strength
-            direction, strength = self._extract_direction_and_strength(message)
+            direction, strength = _extract_direction_and_strength(message)
             if not direction:
                 return None
 
-            # Extract header info (symbol, timeframe, quality)
-            header = self._extract_header(message)
-            if not header:
+            # Single pass: keep the first match of every field, collect
+            # all probability lines
+            fields: dict[str, re.Match] = {}
+            probabilities = {}
+
+            for match in COMBINED_PATTERN.finditer(message):
+                kind = match.lastgroup
+                if kind == "prob":
+                    probabilities[_group(match, 1)] = {
+                        "long": int(_group(match, 2)),
+                        "short": int(_group(match, 3)),
+                    }
+                elif kind not in fields:
+                    fields[kind] = match
+
+            # Header info (symbol, timeframe, quality) is mandatory
+            symbol_match = fields.get("symbol")
+            tf_match = fields.get("timeframe")
+            quality_match = fields.get("quality")
+            if not (symbol_match and tf_match and quality_match):
                 return None
 
-            symbol, timeframe, quality_total = header
-
-            # Extract quality breakdown
-            quality_profit = self._extract_pattern_int(message, self.PROFIT_PATTERN)
-            quality_drawdown = self._extract_pattern_int(message, self.DRAWDOWN_QUALITY_PATTERN)
-            quality_accuracy = self._extract_pattern_int(message, self.ACCURACY_PATTERN)
-
-            # Extract time horizon
-            time_horizon = self._extract_time_horizon(message)
+            tf_unit = _group(tf_match, 2)
+            timeframe = f"{_group(tf_match, 1)}{TIMEFRAME_MAP.get(tf_unit, tf_unit)}"
 
-            # Extract probabilities
-            probabilities = self._extract_probabilities(message)
-
-            # Extract max drawdown
-            max_drawdown = self._extract_max_drawdown(message)
+            horizon_match = fields.get("horizon")
+            max_drawdown_match = fields.get("max_drawdown")
 
             return ParsedBabloSignal(
-                symbol=symbol,
+                symbol=_group(symbol_match, 1),
                 direction=direction,
                 strength=strength,
                 timeframe=timeframe,
-                time_horizon=time_horizon,
-                quality_total=quality_total,
-                quality_profit=quality_profit,
-                quality_drawdown=quality_drawdown,
-                quality_accuracy=quality_accuracy,
+                time_horizon=_group(horizon_match, 1) if horizon_match else None,
+                quality_total=int(_group(quality_match, 1)),
+                quality_profit=_field_int(fields, "profit"),
+                quality_drawdown=_field_int(fields, "drawdown"),
+                quality_accuracy=_field_int(fields, "accuracy"),
                 probabilities=probabilities,
-                max_drawdown=max_drawdown,
+                max_drawdown=(
+                    Decimal(_group(max_drawdown_match, 1))
+                    if max_drawdown_match
+                    else None
+                ),
                 raw_message=message,
             )
 
@@ -133,82 +205,17 @@ class BabloParser:
             logger.error(f"Error parsing message: {e}")
             return None
 
-    def _extract_direction_and_strength(self, message: str) -> tuple[Optional[str], int]:
-        """Extract signal direction and strength from emoji squares."""
-        # Check for long (green squares)
-        long_match = re.search(self.LONG_PATTERN, message)
-        if long_match:
-            strength = len(long_match.group(1))
-            return "long", strength
-
-        # Check for short (red squares)
-        short_match = re.search(self.SHORT_PATTERN, message)
-        if short_match:
-            strength = len(short_match.group(1))
-            return "short", strength
-
-        return None, 0
-
-    def _extract_header(self, message: str) -> Optional[tuple[str, str, int]]:
-        """Extract symbol, timeframe, and quality from header."""
-        # Extract symbol from markdown link
-        symbol_match = re.search(self.SYMBOL_PATTERN, message)
-        if not symbol_match:
-            return None
-        symbol = symbol_match.group(1)
+    def parse_many(self, messages: list[str]) -> list[Optional[ParsedBabloSignal]]:
+        """Parse a batch of messages.
 
-        # Extract timeframe
-        tf_match = re.search(self.TIMEFRAME_PATTERN, message)
-        if not tf_match:
-            return None
-        tf_value = tf_match.group(1)
-        tf_unit = tf_match.group(2)
-
-        # Convert timeframe to standard format
-        unit = self.TIMEFRAME_MAP.get(tf_unit, tf_unit)
-        timeframe = f"{tf_value}{unit}"
+        Args:
+            messages: Raw message texts
 
-        # Extract quality
-        quality_match = re.search(self.QUALITY_PATTERN, message)
-        if not quality_match:
-            return None
-        quality = int(quality_match.group(1))
-
-        return symbol, timeframe, quality
-
-    def _extract_pattern_int(self, message: str, pattern: str) -> Optional[int]:
-        """Extract integer value from pattern match."""
-        match = re.search(pattern, message)
-        if match:
-            return int(match.group(1))
-        return None
-
-    def _extract_time_horizon(self, message: str) -> Optional[str]:
-        """Extract time horizon from probability section."""
-        match = re.search(self.HORIZON_PATTERN, message)
-        if match:
-            return match.group(1)
-        return None
-
-    def _extract_probabilities(self, message: str) -> dict:
-        """Extract probability values for different targets."""
-        probabilities = {}
-        matches = re.findall(self.PROB_PATTERN, message)
-
-        for target, long_prob, short_prob in matches:
-            probabilities[target] = {
-                "long": int(long_prob),
-                "short": int(short_prob),
-            }
-
-        return probabilities
-
-    def _extract_max_drawdown(self, message: str) -> Optional[Decimal]:
-        """Extract maximum drawdown percentage."""
-        match = re.search(self.MAX_DRAWDOWN_PATTERN, message)
-        if match:
-            return Decimal(match.group(1))
-        return None
+        Returns:
+            Parsed signal (or None) for each message, in input order
+        """
+        parse = self.parse
+        return [parse(message) for message in messages]
 
 
 # Global parser instance
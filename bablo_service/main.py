@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from api.router import router
 from config import settings
@@ -14,7 +15,12 @@ from shared.utils.redis_client import get_redis_client
 from shared.utils.logger import get_logger
 
 # Import models to register them with Base.metadata before init_db
-from models import BabloSignal, BabloUserSettings  # noqa: F401
+from models import (  # noqa: F401
+    BabloSignal,
+    BabloSignalProbability,
+    BabloSignalRollup,
+    BabloUserSettings,
+)
 
 logger = get_logger("bablo_service")
 
@@ -67,6 +73,7 @@ app = FastAPI(
     description="Trading signals service for MasterBot Platform",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -1,5 +1,15 @@
 """Bablo models."""
 
-from models.bablo import BabloSignal, BabloUserSettings
+from models.bablo import (
+    BabloSignal,
+    BabloSignalProbability,
+    BabloSignalRollup,
+    BabloUserSettings,
+)
 
-__all__ = ["BabloSignal", "BabloUserSettings"]
+__all__ = [
+    "BabloSignal",
+    "BabloSignalProbability",
+    "BabloSignalRollup",
+    "BabloUserSettings",
+]
@@ -7,20 +7,34 @@ from typing import Optional
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    Computed,
     DateTime,
+    ForeignKey,
     Index,
     Integer,
     Numeric,
+    SmallInteger,
     String,
     Text,
     Time,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func, text
 
 from shared.database.connection import Base
 
+# Bit per notification filter flag, packed into generated mask columns
+TIMEFRAME_BITS = {"1m": 1, "5m": 2, "15m": 4, "30m": 8, "1h": 16, "4h": 32}
+DIRECTION_BITS = {"long": 1, "short": 2}
+
+
+def _mask_expression(bits: dict[str, int]) -> str:
+    """Build SQL packing boolean columns into a bitmask (NULL counts as off)."""
+    return " | ".join(
+        f"(COALESCE({column}, false)::int * {bit})" for column, bit in bits.items()
+    )
+
 
 class BabloSignal(Base):
     """Bablo trading signals table."""
@@ -30,15 +44,15 @@ class BabloSignal(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     symbol: Mapped[str] = mapped_column(String(50), nullable=False)
     direction: Mapped[str] = mapped_column(String(10), nullable=False)  # 'long' | 'short'
-    strength: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5 (number of squares)
+    strength: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 1-5 (number of squares)
     timeframe: Mapped[str] = mapped_column(String(10), nullable=False)  # '1m', '15m', '1h', '4h'
     time_horizon: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # '60 минут', '12 часов'
 
     # Quality metrics
-    quality_total: Mapped[int] = mapped_column(Integer, nullable=False)
-    quality_profit: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    quality_drawdown: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    quality_accuracy: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    quality_total: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    quality_profit: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    quality_drawdown: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    quality_accuracy: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
 
     # Probabilities as JSON: {"0.9": {"long": 82, "short": 73}, ...}
     probabilities: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
@@ -50,18 +64,80 @@ class BabloSignal(Base):
         DateTime(timezone=True), server_default=func.now()
     )
 
+    # Same probabilities as narrow rows, for analytics (written with the signal)
+    probability_rows: Mapped[list["BabloSignalProbability"]] = relationship(
+        cascade="all, delete-orphan",
+        lazy="raise",
+    )
+
+    # Fetch server defaults (id, received_at) via INSERT ... RETURNING on
+    # flush, so new signals need no refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
-        Index("idx_bablo_signals_received_at", "received_at"),
+        # Keyset pagination on (received_at, id)
+        Index("idx_bablo_signals_received_at_id", "received_at", "id"),
+        # Analytics aggregates over a received_at range (index-only scans)
+        Index(
+            "idx_bablo_signals_received_at_covering",
+            "received_at",
+            postgresql_include=["direction", "timeframe", "quality_total", "symbol"],
+        ),
+        # Signals list filtered by direction, in keyset order
+        Index("idx_bablo_signals_direction_received_at_id", "direction", "received_at", "id"),
         Index("idx_bablo_signals_symbol", "symbol"),
-        Index("idx_bablo_signals_direction", "direction"),
         Index("idx_bablo_signals_timeframe", "timeframe"),
         Index("idx_bablo_signals_quality", "quality_total"),
+        # Hot filter: notifications and the signals list default to min_quality=7
+        Index(
+            "idx_bablo_signals_high_quality_received_at",
+            "received_at",
+            postgresql_where=text("quality_total >= 7"),
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<BabloSignal(id={self.id}, symbol={self.symbol}, direction={self.direction})>"
 
 
+class BabloSignalProbability(Base):
+    """Per-target probabilities of a Bablo signal (one row per target)."""
+
+    __tablename__ = "bablo_signal_probabilities"
+
+    signal_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("bablo_signals.id", ondelete="CASCADE"), primary_key=True
+    )
+    target: Mapped[Decimal] = mapped_column(Numeric(5, 2), primary_key=True)  # target move, %
+    long_pct: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    short_pct: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    __table_args__ = (
+        Index("idx_bablo_signal_probabilities_target", "target"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<BabloSignalProbability(signal_id={self.signal_id}, target={self.target})>"
+
+
+class BabloSignalRollup(Base):
+    """Hourly signal counts pre-aggregated for time-series analytics.
+
+    Maintained on every signal insert, so time-series queries scan
+    O(buckets) rows instead of the whole bablo_signals range.
+    """
+
+    __tablename__ = "bablo_signals_rollup"
+
+    bucket_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)  # UTC hour start
+    direction: Mapped[str] = mapped_column(String(10), primary_key=True)
+    timeframe: Mapped[str] = mapped_column(String(10), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<BabloSignalRollup(bucket_ts={self.bucket_ts}, direction={self.direction}, count={self.count})>"
+
+
 class BabloUserSettings(Base):
     """User settings for Bablo notifications."""
 
@@ -88,6 +164,23 @@ class BabloUserSettings(Base):
     long_signals: Mapped[bool] = mapped_column(Boolean, default=True)
     short_signals: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Timeframe/direction flags packed by the database, so the recipient
+    # lookup filters on two integers read from a covering index
+    timeframes_mask: Mapped[int] = mapped_column(
+        Integer,
+        Computed(
+            _mask_expression({f"timeframe_{tf}": bit for tf, bit in TIMEFRAME_BITS.items()}),
+            persisted=True,
+        ),
+    )
+    directions_mask: Mapped[int] = mapped_column(
+        SmallInteger,
+        Computed(
+            _mask_expression({f"{direction}_signals": bit for direction, bit in DIRECTION_BITS.items()}),
+            persisted=True,
+        ),
+    )
+
     # Report preferences
     morning_report: Mapped[bool] = mapped_column(Boolean, default=True)
     morning_report_time: Mapped[time] = mapped_column(Time, default=time(8, 0))
@@ -116,9 +209,10 @@ class BabloUserSettings(Base):
     __table_args__ = (
         # Composite index for signal notifications query
         Index(
-            "idx_bablo_settings_notif_quality",
+            "idx_bablo_settings_notif_quality_masks",
             "notifications_enabled",
             "min_quality",
+            postgresql_include=["user_id", "timeframes_mask", "directions_mask"],
             postgresql_where="notifications_enabled = true",
         ),
         # Index for activity alerts
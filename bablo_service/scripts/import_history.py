@@ -4,25 +4,116 @@
 import asyncio
 import os
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 
 from config import settings
 from core.parser import bablo_parser
-from models.bablo import Base, BabloSignal
+from models.bablo import Base
+from services.signal_service import signal_service
+from shared.database.connection import asyncpg_url
+
+# Rows per executemany INSERT; each batch is a savepoint in one transaction
+BATCH_SIZE = 500
+
+# Messages handed to a worker process at once; per-message submission
+# would cost more in pickling than the parse itself
+PARSE_CHUNK_SIZE = 200
+
+# Fetched batches waiting for the writer; bounds memory if the
+# database is slower than Telegram
+QUEUE_MAXSIZE = 2
+
+
+async def parse_in_pool(pool: ProcessPoolExecutor, texts: list[str]) -> list:
+    """Parse message texts across a process pool, preserving order.
+
+    Args:
+        pool: Worker pool to parse in
+        texts: Raw message texts
+
+    Returns:
+        Parsed signal (or None) for each text
+    """
+    if not texts:
+        return []
+
+    loop = asyncio.get_running_loop()
+    chunks = [texts[i:i + PARSE_CHUNK_SIZE] for i in range(0, len(texts), PARSE_CHUNK_SIZE)]
+
+    results = await asyncio.gather(
+        *[loop.run_in_executor(pool, bablo_parser.parse_many, chunk) for chunk in chunks]
+    )
+
+    return [parsed for chunk_result in results for parsed in chunk_result]
+
+
+async def write_batches(
+    queue: asyncio.Queue,
+    session: AsyncSession,
+    pool: ProcessPoolExecutor,
+    stats: dict[str, int],
+) -> None:
+    """Parse and store message batches as the reader produces them.
+
+    Consumes lists of messages until a ``None`` sentinel. All batches go
+    into one transaction, committed once at the end; each batch runs in
+    its own savepoint, so a failing batch is rolled back and counted as
+    failed while the rest of the import still succeeds.
+
+    Args:
+        queue: Message batches from the Telegram reader
+        session: Session holding the single import transaction
+        pool: Worker pool for parsing
+        stats: Counters updated in place
+    """
+    while (messages := await queue.get()) is not None:
+        try:
+            parsed_list = await parse_in_pool(pool, [msg.text for msg in messages])
+        except Exception as e:
+            print(f"Error parsing messages: {e}")
+            stats["failed"] += len(messages)
+            continue
+
+        batch = []
+        for msg, parsed in zip(messages, parsed_list):
+            if not parsed:
+                stats["skipped"] += 1
+                continue
+            batch.append((parsed, msg.date))
+
+        try:
+            async with session.begin_nested():
+                stats["imported"] += await signal_service.import_signals(session, batch)
+            print(f"Imported {stats['imported']} signals...")
+        except Exception as e:
+            print(f"Error saving signals: {e}")
+            stats["failed"] += len(batch)
+
+    try:
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        print(f"Error committing import: {e}")
+        stats["failed"] += stats["imported"]
+        stats["imported"] = 0
 
 
 async def import_history(days: int = 30, limit: int = 1000) -> None:
     """Import historical messages from Bablo channel.
 
+    Messages are streamed from Telegram newest-first and handed to a
+    writer task in batches, so memory stays bounded by the batch size
+    rather than by ``limit``.
+
     Args:
         days: Number of days to import (from now backwards)
         limit: Maximum number of messages to import
@@ -30,8 +121,8 @@ async def import_history(days: int = 30, limit: int = 1000) -> None:
     print(f"Starting history import for last {days} days (max {limit} messages)...")
 
     # Setup database
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    engine = create_async_engine(asyncpg_url(settings.DATABASE_URL), echo=False)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
 
     # Create tables if needed
     async with engine.begin() as conn:
@@ -48,78 +139,59 @@ async def import_history(days: int = 30, limit: int = 1000) -> None:
     print("Connected to Telegram")
 
     try:
-        # Calculate date range
-        end_date = datetime.now()
+        # Calculate date range. Telethon message dates are aware UTC datetimes, so the window is
+        # built in UTC once and compared without per-message conversion
+        end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
 
         print(f"Fetching messages from {start_date} to {end_date}...")
 
-        # Get messages from channel
-        messages = await client.get_messages(
-            settings.BABLO_CHANNEL_ID,
-            limit=limit,
-            offset_date=end_date,
-        )
-
-        print(f"Retrieved {len(messages)} messages")
-
-        imported = 0
-        skipped = 0
-        failed = 0
-
-        async with async_session() as session:
-            for msg in messages:
-                if not msg.text:
-                    skipped += 1
-                    continue
+        stats = {"imported": 0, "skipped": 0, "failed": 0}
+        retrieved = 0
 
-                # Check if message is within date range
-                if msg.date.replace(tzinfo=None) < start_date:
-                    continue
+        # Parsing is CPU-bound and runs in worker processes while the
+        # next batch is being fetched
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
 
-                # Parse message
-                parsed = bablo_parser.parse(msg.text)
-                if not parsed:
-                    skipped += 1
-                    continue
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            async with async_session() as session:
+                writer = asyncio.create_task(write_batches(queue, session, pool, stats))
 
                 try:
-                    # Create signal record
-                    signal = BabloSignal(
-                        symbol=parsed.symbol,
-                        direction=parsed.direction,
-                        strength=parsed.strength,
-                        timeframe=parsed.timeframe,
-                        time_horizon=parsed.time_horizon,
-                        quality_total=parsed.quality_total,
-                        quality_profit=parsed.quality_profit,
-                        quality_drawdown=parsed.quality_drawdown,
-                        quality_accuracy=parsed.quality_accuracy,
-                        probabilities=parsed.probabilities,
-                        max_drawdown=parsed.max_drawdown,
-                        raw_message=parsed.raw_message,
-                        received_at=msg.date.replace(tzinfo=None),
-                    )
-
-                    session.add(signal)
-                    imported += 1
-
-                    if imported % 50 == 0:
-                        await session.commit()
-                        print(f"Imported {imported} signals...")
-
-                except Exception as e:
-                    print(f"Error saving signal: {e}")
-                    failed += 1
-
-            # Final commit
-            await session.commit()
+                    messages = []
+                    async for msg in client.iter_messages(
+                        settings.BABLO_CHANNEL_ID,
+                        limit=limit,
+                        offset_date=end_date,
+                    ):
+                        # Messages arrive newest-first: everything after
+                        # this one is older still
+                        if msg.date < start_date:
+                            break
+
+                        retrieved += 1
+                        if not msg.text:
+                            stats["skipped"] += 1
+                            continue
+
+                        messages.append(msg)
+                        if len(messages) >= BATCH_SIZE:
+                            await queue.put(messages)
+                            messages = []
+
+                    if messages:
+                        await queue.put(messages)
+                finally:
+                    await queue.put(None)
+                    await writer
+
+        print(f"Retrieved {retrieved} messages")
 
         print("\n" + "=" * 50)
         print("Import completed!")
-        print(f"  Imported: {imported}")
-        print(f"  Skipped: {skipped}")
-        print(f"  Failed: {failed}")
+        print(f"  Imported: {stats['imported']}")
+        print(f"  Skipped: {stats['skipped']}")
+        print(f"  Failed: {stats['failed']}")
         print("=" * 50)
 
     finally:
@@ -1,26 +1,49 @@
 """Analytics service for Bablo signals."""
 
 import statistics
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
-import pytz
+from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, func, cast, Date, extract, text
+from sqlalchemy import and_, select, func, cast, Date, extract, literal, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.signal_service import signal_service
-from models.bablo import BabloSignal
+from models.bablo import BabloSignal, BabloSignalProbability, BabloSignalRollup
 from config import settings
+from core.cache import local_cached, PERIOD_TTL
 from shared.utils.logger import get_logger
 
 logger = get_logger("bablo_analytics_service")
 
+# Rollup bucket start in the configured timezone, built once so every
+# query renders identical SQL and reuses its compiled/prepared form
+_BUCKET_LOCAL_TIME = func.timezone(settings.TIMEZONE, BabloSignalRollup.bucket_ts)
+_BUCKET_LOCAL_DATE = func.date(_BUCKET_LOCAL_TIME)
+_BUCKET_LOCAL_HOUR = extract("hour", _BUCKET_LOCAL_TIME)
+_BUCKET_COUNT = func.coalesce(func.sum(BabloSignalRollup.count), 0)
+
 
 class AnalyticsService:
     """Service for computing Bablo signal analytics."""
 
     def __init__(self):
-        self.tz = pytz.timezone(settings.TIMEZONE)
+        self.tz = ZoneInfo(settings.TIMEZONE)
+        self._today: Optional[tuple[date, datetime]] = None
+
+    def _today_start(self, now: datetime) -> datetime:
+        """Get local midnight for ``now``, reused until the date changes.
+
+        Args:
+            now: Current time in ``self.tz``
+
+        Returns:
+            Start of the current local day
+        """
+        today = now.date()
+        if self._today is None or self._today[0] != today:
+            self._today = (today, now.replace(hour=0, minute=0, second=0, microsecond=0))
+        return self._today[1]
 
     def _get_period_dates(self, period: str) -> tuple[datetime, datetime]:
         """Get start and end dates for period.
@@ -32,7 +55,7 @@ class AnalyticsService:
             Tuple of (start_date, end_date)
         """
         now = datetime.now(self.tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_start = self._today_start(now)
 
         if period == "today":
             return today_start, now
@@ -48,6 +71,7 @@ class AnalyticsService:
         else:
             return today_start, now
 
+    @local_cached("get_analytics", ttl=PERIOD_TTL)
     async def get_analytics(
         self,
         session: AsyncSession,
@@ -64,55 +88,78 @@ class AnalyticsService:
         """
         start_date, end_date = self._get_period_dates(period)
 
-        # Get basic stats
-        total_count = await signal_service.get_signals_count(
-            session, start_date, end_date
+        # Totals, timeframe breakdown and top symbols in one scan
+        summary = await signal_service.get_aggregates(
+            session, start_date, end_date, top_limit=5
         )
 
-        # Get direction breakdown
-        direction_stats = await signal_service.get_signals_by_direction(
-            session, start_date, end_date
-        )
-
-        # Get timeframe breakdown
-        timeframe_stats = await signal_service.get_signals_by_timeframe(
-            session, start_date, end_date
-        )
-
-        # Get top symbols
-        top_symbols = await signal_service.get_top_symbols(
-            session, start_date, end_date, limit=5
-        )
-
-        # Get average quality
-        avg_quality = await signal_service.get_average_quality(
-            session, start_date, end_date
-        )
+        avg_quality = summary["average_quality"]
 
         # Calculate median (daily counts for last 14 days)
         now = datetime.now(self.tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_start = self._today_start(now)
         median_start = today_start - timedelta(days=14)
 
-        median_counts = await self._get_daily_counts(session, median_start, today_start)
-        week_median = int(statistics.median(median_counts)) if median_counts else 0
+        week_median = await self._get_daily_median(session, median_start, today_start)
 
         return {
             "period": period,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "total_signals": total_count,
-            "long_count": direction_stats.get("long", 0),
-            "short_count": direction_stats.get("short", 0),
-            "by_timeframe": timeframe_stats,
-            "top_symbols": [
-                {"symbol": symbol, "count": count}
-                for symbol, count in top_symbols
-            ],
+            "total_signals": summary["total"],
+            "long_count": summary["long"],
+            "short_count": summary["short"],
+            "by_timeframe": summary["by_timeframe"],
+            "top_symbols": summary["top_symbols"],
             "average_quality": round(avg_quality, 1) if avg_quality else None,
             "week_median": week_median,
         }
 
+    async def get_probability_stats(
+        self,
+        session: AsyncSession,
+        period: str,
+    ) -> dict:
+        """Get average long/short probabilities per target for period.
+
+        Args:
+            session: Database session
+            period: Period name
+
+        Returns:
+            Dictionary with per-target averages, ordered by target
+        """
+        start_date, end_date = self._get_period_dates(period)
+
+        query = (
+            select(
+                BabloSignalProbability.target,
+                func.avg(BabloSignalProbability.long_pct).label("avg_long"),
+                func.avg(BabloSignalProbability.short_pct).label("avg_short"),
+                func.count().label("cnt"),
+            )
+            .join(BabloSignal, BabloSignal.id == BabloSignalProbability.signal_id)
+            .where(BabloSignal.received_at >= start_date)
+            .where(BabloSignal.received_at < end_date)
+            .group_by(BabloSignalProbability.target)
+            .order_by(BabloSignalProbability.target)
+        )
+        result = await session.execute(query)
+
+        return {
+            "period": period,
+            "targets": [
+                {
+                    "target": float(target),
+                    "avg_long": round(float(avg_long), 1),
+                    "avg_short": round(float(avg_short), 1),
+                    "count": cnt,
+                }
+                for target, avg_long, avg_short, cnt in result.all()
+            ],
+        }
+
+    @local_cached("get_comparison", ttl=PERIOD_TTL["today"])
     async def get_comparison(
         self,
         session: AsyncSession,
@@ -126,24 +173,25 @@ class AnalyticsService:
             Comparison dictionary
         """
         now = datetime.now(self.tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # Today's count
-        today_count = await signal_service.get_signals_count(
-            session, today_start, now
-        )
-
-        # Yesterday's count (full day)
+        today_start = self._today_start(now)
         yesterday_start = today_start - timedelta(days=1)
-        yesterday_count = await signal_service.get_signals_count(
-            session, yesterday_start, today_start
+        week_start = today_start - timedelta(days=7)
+
+        # Today so far, yesterday (full day) and the past week, counted in
+        # one pass over the week's received_at range
+        before_today = BabloSignal.received_at < today_start
+        query = select(
+            func.count().filter(BabloSignal.received_at >= today_start),
+            func.count().filter(BabloSignal.received_at >= yesterday_start, before_today),
+            func.count().filter(before_today),
+        ).where(
+            BabloSignal.received_at >= week_start,
+            BabloSignal.received_at < now,
         )
+        result = await session.execute(query)
+        today_count, yesterday_count, week_total = result.one()
 
         # Week average
-        week_start = today_start - timedelta(days=7)
-        week_total = await signal_service.get_signals_count(
-            session, week_start, today_start
-        )
         week_avg = week_total / 7 if week_total > 0 else 0
 
         # Calculate comparisons
@@ -171,27 +219,30 @@ class AnalyticsService:
         else:
             return "0%"
 
-    async def _get_daily_counts(
+    async def _get_daily_median(
         self, session: AsyncSession, start_date: datetime, end_date: datetime
-    ) -> list[int]:
-        """Get signal counts per day for a date range."""
-        local_time = func.timezone(settings.TIMEZONE, BabloSignal.received_at)
-        local_date = func.date(local_time)
+    ) -> int:
+        """Get median of per-day signal counts for a date range.
 
-        query = (
-            select(
-                local_date.label("day"),
-                func.count().label("cnt"),
-            )
+        Computed in SQL over the hourly rollup; days without signals are
+        not counted, as before.
+        """
+        daily = (
+            select(func.sum(BabloSignalRollup.count).label("cnt"))
             .where(
-                BabloSignal.received_at >= start_date,
-                BabloSignal.received_at < end_date,
+                BabloSignalRollup.bucket_ts >= start_date,
+                BabloSignalRollup.bucket_ts < end_date,
             )
-            .group_by(local_date)
+            .group_by(_BUCKET_LOCAL_DATE)
+            .subquery()
         )
+        query = select(func.percentile_cont(0.5).within_group(daily.c.cnt))
+
         result = await session.execute(query)
-        return [row.cnt for row in result.all()]
+        median = result.scalar()
+        return int(median) if median is not None else 0
 
+    @local_cached("get_time_series", ttl=PERIOD_TTL)
     async def get_time_series(self, session: AsyncSession, period: str) -> dict:
         """Get signal counts as time series.
 
@@ -203,86 +254,66 @@ class AnalyticsService:
             Time series data with labels and counts
         """
         now = datetime.now(self.tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # Convert timestamp to local timezone for correct hour/day extraction
-        local_time = func.timezone(settings.TIMEZONE, BabloSignal.received_at)
+        today_start = self._today_start(now)
 
+        # Read pre-aggregated hourly buckets; convert bucket start to local
+        # timezone for correct hour/day extraction. The dense series (zeros
+        # for empty slots) is generated in SQL and outer-joined to the rollup.
         if period == "today":
             # Hourly counts for today (using local timezone)
+            hours = func.generate_series(0, now.hour).table_valued("n").render_derived(name="hours")
             query = (
-                select(
-                    extract("hour", local_time).label("hour"),
-                    func.count().label("count"),
+                select(hours.c.n.label("hour"), _BUCKET_COUNT.label("count"))
+                .select_from(hours)
+                .outerjoin(
+                    BabloSignalRollup,
+                    and_(
+                        BabloSignalRollup.bucket_ts >= today_start,
+                        _BUCKET_LOCAL_HOUR == hours.c.n,
+                    ),
                 )
-                .where(BabloSignal.received_at >= today_start)
-                .group_by(extract("hour", local_time))
-                .order_by(extract("hour", local_time))
+                .group_by(hours.c.n)
+                .order_by(hours.c.n)
             )
             result = await session.execute(query)
             rows = result.all()
 
-            # Fill in missing hours
-            data = {int(row.hour): row.count for row in rows}
-            current_hour = now.hour
-            labels = [f"{h:02d}:00" for h in range(current_hour + 1)]
-            counts = [data.get(h, 0) for h in range(current_hour + 1)]
-
-        elif period == "week":
-            # Daily counts for last 7 days (using local timezone for date)
-            week_start = today_start - timedelta(days=6)
-            local_date = func.date(local_time)
-            query = (
-                select(
-                    local_date.label("day"),
-                    func.count().label("count"),
-                )
-                .where(BabloSignal.received_at >= week_start)
-                .group_by(local_date)
-                .order_by(local_date)
-            )
-            result = await session.execute(query)
-            rows = result.all()
+            labels = [f"{hour:02d}:00" for hour, _ in rows]
+            counts = [int(count) for _, count in rows]
 
-            # Fill in missing days
-            data = {row.day: row.count for row in rows}
-            labels = []
-            counts = []
-            for i in range(7):
-                day = (week_start + timedelta(days=i)).date()
-                labels.append(day.strftime("%d.%m"))
-                counts.append(data.get(day, 0))
+        elif period in ("week", "month"):
+            # Daily counts for last 7 / 30 days (using local timezone for date)
+            days = 7 if period == "week" else 30
+            period_start = today_start - timedelta(days=days - 1)
 
-        elif period == "month":
-            # Daily counts for last 30 days (using local timezone for date)
-            month_start = today_start - timedelta(days=29)
-            local_date = func.date(local_time)
+            offsets = func.generate_series(0, days - 1).table_valued("n").render_derived(name="offsets")
+            day = literal(period_start.date(), Date) + offsets.c.n
             query = (
-                select(
-                    local_date.label("day"),
-                    func.count().label("count"),
+                select(day.label("day"), _BUCKET_COUNT.label("count"))
+                .select_from(offsets)
+                .outerjoin(
+                    BabloSignalRollup,
+                    and_(
+                        BabloSignalRollup.bucket_ts >= period_start,
+                        _BUCKET_LOCAL_DATE == day,
+                    ),
                 )
-                .where(BabloSignal.received_at >= month_start)
-                .group_by(local_date)
-                .order_by(local_date)
+                .group_by(offsets.c.n)
+                .order_by(offsets.c.n)
             )
             result = await session.execute(query)
             rows = result.all()
 
-            # Fill in missing days
-            data = {row.day: row.count for row in rows}
-            labels = []
-            counts = []
-            for i in range(30):
-                day = (month_start + timedelta(days=i)).date()
-                labels.append(day.strftime("%d.%m"))
-                counts.append(data.get(day, 0))
+            labels = [day.strftime("%d.%m") for day, _ in rows]
+            counts = [int(count) for _, count in rows]
 
         else:
             labels = []
             counts = []
 
-        # Calculate median for reference line
+        # Calculate median for reference line. The series has at most
+        # 31 points and statistics.median sorts in C, so this stays in
+        # Python rather than pulling in numpy
         median = int(statistics.median(counts)) if counts else 0
 
         return {
@@ -1,19 +1,43 @@
 """Notification service for Bablo user settings."""
 
+import time
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, cast, func, select, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.bablo import BabloUserSettings
+from models.bablo import BabloSignal, BabloUserSettings, DIRECTION_BITS, TIMEFRAME_BITS
 from shared.utils.logger import get_logger
 
 logger = get_logger("bablo_notification_service")
 
+# Order matches the report columns selected in get_users_for_reports
+REPORT_TYPES = ("morning", "evening", "weekly", "monthly")
+
+# Columns a settings update may write: generated masks, the key and
+# timestamps are excluded
+_UPDATABLE_COLUMNS = frozenset(
+    column.name
+    for column in BabloUserSettings.__table__.columns
+    if column.computed is None
+) - {"user_id", "created_at", "updated_at"}
+
+# Seconds the in-process snapshot of notification recipients is reused;
+# updates made through update_user_settings drop it immediately
+RECIPIENTS_TTL = 60
+
 
 class NotificationService:
     """Service for managing user notification settings."""
 
+    def __init__(self):
+        # (user_id, min_quality, timeframes_mask, directions_mask) per enabled user
+        self._recipients: list[tuple[int, int, int, int]] = []
+        self._recipients_min_quality: Optional[int] = None
+        self._recipients_expires_at = 0.0
+
     async def get_user_settings(
         self,
         session: AsyncSession,
@@ -21,6 +45,11 @@ class NotificationService:
     ) -> BabloUserSettings:
         """Get user settings, create default if not exists.
 
+        Existing settings are read with a plain SELECT. Only on first use
+        are defaults inserted, with ON CONFLICT DO NOTHING so concurrent
+        first requests for the same user cannot race into a
+        duplicate-key error.
+
         Args:
             session: Database session
             user_id: User ID
@@ -29,15 +58,22 @@ class NotificationService:
             BabloUserSettings instance
         """
         query = select(BabloUserSettings).where(BabloUserSettings.user_id == user_id)
-        result = await session.execute(query)
+        settings = await session.scalar(query)
+        if settings is not None:
+            return settings
+
+        stmt = (
+            pg_insert(BabloUserSettings)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[BabloUserSettings.user_id])
+            .returning(BabloUserSettings)
+        )
+        result = await session.execute(stmt)
         settings = result.scalar_one_or_none()
-
-        if not settings:
-            settings = BabloUserSettings(user_id=user_id)
-            session.add(settings)
-            await session.commit()
-            await session.refresh(settings)
-            logger.info(f"Created default settings for user {user_id}")
+        if settings is None:
+            # A concurrent request created the row first
+            settings = await session.scalar(query)
+        await session.commit()
 
         return settings
 
@@ -49,6 +85,9 @@ class NotificationService:
     ) -> BabloUserSettings:
         """Update user settings.
 
+        Creates the row if needed, writes and re-reads it with a single
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+
         Args:
             session: Database session
             user_id: User ID
@@ -57,14 +96,22 @@ class NotificationService:
         Returns:
             Updated BabloUserSettings instance
         """
-        settings = await self.get_user_settings(session, user_id)
-
-        for key, value in updates.items():
-            if hasattr(settings, key):
-                setattr(settings, key, value)
-
+        values = {key: value for key, value in updates.items() if key in _UPDATABLE_COLUMNS}
+
+        stmt = (
+            pg_insert(BabloUserSettings)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(
+                index_elements=[BabloUserSettings.user_id],
+                set_={**values, "updated_at": func.now()},
+            )
+            .returning(BabloUserSettings)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        settings = result.scalar_one()
         await session.commit()
-        await session.refresh(settings)
+        self.invalidate_recipients()
 
         logger.info(f"Updated settings for user {user_id}: {updates}")
         return settings
@@ -89,29 +136,76 @@ class NotificationService:
         Returns:
             List of user IDs
         """
-        query = select(BabloUserSettings.user_id).where(
-            BabloUserSettings.notifications_enabled == True,
-            BabloUserSettings.min_quality <= quality,
-        )
-
-        # Direction filter
-        if direction == "long":
-            query = query.where(BabloUserSettings.long_signals == True)
-        else:
-            query = query.where(BabloUserSettings.short_signals == True)
-
-        # Timeframe filter
-        tf_column = getattr(BabloUserSettings, f"timeframe_{timeframe}", None)
-        if tf_column is not None:
-            query = query.where(tf_column == True)
-        else:
-            # If timeframe column doesn't exist, don't send notifications
+        tf_bit = TIMEFRAME_BITS.get(timeframe)
+        if tf_bit is None:
+            # Unknown timeframe: don't send notifications
             # This prevents sending signals for unsupported timeframes
             logger.warning(f"Unsupported timeframe: {timeframe}, skipping notifications")
             return []
 
-        result = await session.execute(query)
-        return [row[0] for row in result.all()]
+        direction_bit = DIRECTION_BITS["long" if direction == "long" else "short"]
+
+        recipients = await self._get_recipients(session)
+        return [
+            user_id
+            for user_id, min_quality, timeframes_mask, directions_mask in recipients
+            if min_quality <= quality
+            and timeframes_mask & tf_bit
+            and directions_mask & direction_bit
+        ]
+
+    async def _get_recipients(
+        self,
+        session: AsyncSession,
+    ) -> list[tuple[int, int, int, int]]:
+        """Get filter settings of all users with notifications enabled.
+
+        The snapshot is loaded once per RECIPIENTS_TTL, so bursts of
+        signals are matched in memory instead of querying per signal.
+
+        Args:
+            session: Database session
+
+        Returns:
+            List of (user_id, min_quality, timeframes_mask, directions_mask)
+        """
+        now = time.monotonic()
+        if now >= self._recipients_expires_at:
+            query = select(
+                BabloUserSettings.user_id,
+                BabloUserSettings.min_quality,
+                BabloUserSettings.timeframes_mask,
+                BabloUserSettings.directions_mask,
+            ).where(BabloUserSettings.notifications_enabled == True)
+
+            result = await session.execute(query)
+            self._recipients = [tuple(row) for row in result.all()]
+            self._recipients_min_quality = min(
+                (min_quality for _, min_quality, _, _ in self._recipients),
+                default=None,
+            )
+            self._recipients_expires_at = now + RECIPIENTS_TTL
+
+        return self._recipients
+
+    async def get_global_min_quality(self, session: AsyncSession) -> Optional[int]:
+        """Get the lowest quality threshold of any enabled recipient.
+
+        Signals below it have no recipients at all, so callers can skip
+        the per-signal lookup. Served from the recipients snapshot.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Lowest min_quality, or None if nobody has notifications enabled
+        """
+        await self._get_recipients(session)
+        return self._recipients_min_quality
+
+    def invalidate_recipients(self) -> None:
+        """Force the next recipient lookup to reload from the database."""
+        self._recipients_expires_at = 0.0
 
     async def get_users_for_report(
         self,
@@ -127,41 +221,107 @@ class NotificationService:
         Returns:
             List of user IDs
         """
-        report_field = f"{report_type}_report"
+        users_by_report = await self.get_users_for_reports(session)
+        return users_by_report[report_type]
 
-        query = select(BabloUserSettings.user_id).where(
-            getattr(BabloUserSettings, report_field) == True
+    async def get_users_for_reports(
+        self,
+        session: AsyncSession,
+    ) -> dict[str, list[int]]:
+        """Get subscribers of all report types with a single query.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Dictionary mapping report type to list of user IDs
+        """
+        query = select(
+            BabloUserSettings.user_id,
+            BabloUserSettings.morning_report,
+            BabloUserSettings.evening_report,
+            BabloUserSettings.weekly_report,
+            BabloUserSettings.monthly_report,
+        ).where(
+            or_(
+                BabloUserSettings.morning_report == True,
+                BabloUserSettings.evening_report == True,
+                BabloUserSettings.weekly_report == True,
+                BabloUserSettings.monthly_report == True,
+            )
         )
 
         result = await session.execute(query)
-        return [row[0] for row in result.all()]
+
+        users_by_report: dict[str, list[int]] = {report_type: [] for report_type in REPORT_TYPES}
+        for user_id, *flags in result.all():
+            for report_type, subscribed in zip(REPORT_TYPES, flags):
+                if subscribed:
+                    users_by_report[report_type].append(user_id)
+
+        return users_by_report
 
     async def get_users_for_activity_alert(
         self,
         session: AsyncSession,
-        signal_count: int,
+        now: datetime,
     ) -> dict[int, tuple[int, int]]:
-        """Get users who should receive activity alert.
+        """Get users whose activity window holds enough signals for an alert.
+
+        The count over a user's whole window bounds the count since their
+        last alert, so users below their threshold are filtered out in SQL.
+        Signals are counted once per distinct window length, not per user.
 
         Args:
             session: Database session
-            signal_count: Current signal count in the window
+            now: End of the activity windows
 
         Returns:
             Dictionary mapping user_id to (threshold, window_minutes)
         """
+        windows = (
+            select(BabloUserSettings.activity_window_minutes.label("window"))
+            .where(BabloUserSettings.activity_threshold > 0)
+            .distinct()
+            .cte("windows")
+        )
+        window_start = cast(now, DateTime(timezone=True)) - func.make_interval(
+            0, 0, 0, 0, 0, windows.c.window
+        )
+        window_counts = select(
+            windows.c.window,
+            select(func.count())
+            .select_from(BabloSignal)
+            .where(BabloSignal.received_at >= window_start, BabloSignal.received_at < now)
+            .scalar_subquery()
+            .label("signal_count"),
+        ).cte("window_counts")
+        # MATERIALIZED keeps the CTE from being inlined into the join, so
+        # each count runs once per window rather than once per user
+        window_counts = window_counts.prefix_with("MATERIALIZED")
+
         # Activity alerts work independently of signal notifications
-        query = select(
-            BabloUserSettings.user_id,
-            BabloUserSettings.activity_threshold,
-            BabloUserSettings.activity_window_minutes,
-        ).where(
-            BabloUserSettings.activity_threshold > 0,
-            BabloUserSettings.activity_threshold <= signal_count,
+        query = (
+            select(
+                BabloUserSettings.user_id,
+                BabloUserSettings.activity_threshold,
+                BabloUserSettings.activity_window_minutes,
+            )
+            .join(
+                window_counts,
+                window_counts.c.window == BabloUserSettings.activity_window_minutes,
+            )
+            .where(
+                BabloUserSettings.activity_threshold > 0,
+                BabloUserSettings.activity_threshold <= window_counts.c.signal_count,
+            )
         )
 
         result = await session.execute(query)
-        return {row[0]: (row[1], row[2]) for row in result.all()}
+        return {
+            user_id: (threshold, window)
+            for user_id, threshold, window in result.all()
+        }
 
 
 # Global service instance
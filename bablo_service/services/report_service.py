@@ -1,14 +1,16 @@
 """Report service for Bablo signals."""
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
-import pytz
+from zoneinfo import ZoneInfo
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.signal_service import signal_service
 from services.analytics_service import analytics_service
 from config import settings
+from shared.database.connection import async_session_maker
 from shared.constants import (
     EMOJI_CHART,
     EMOJI_CHART_UP,
@@ -20,12 +22,23 @@ from shared.utils.logger import get_logger
 
 logger = get_logger("bablo_report_service")
 
+# Emoji tags and section headers don't depend on the data, so they are
+# rendered once instead of on every report
+_CHART = animated(EMOJI_CHART, "📊")
+_STAR = animated(EMOJI_STAR, "⭐")
+_TIMEFRAMES_HEADER = ("", f"{animated(EMOJI_CHART_UP, '📈')} <b>По таймфреймам:</b>")
+_TOP_SYMBOLS_HEADER = ("", f"{animated(EMOJI_TROPHY, '🏆')} <b>Топ символы:</b>")
+
 
 class ReportService:
     """Service for generating Bablo reports."""
 
     def __init__(self):
-        self.tz = pytz.timezone(settings.TIMEZONE)
+        self.tz = ZoneInfo(settings.TIMEZONE)
+
+    def _now_iso(self) -> str:
+        """Get current local time as ISO string for report timestamps."""
+        return datetime.now(self.tz).isoformat()
 
     async def generate_report(
         self,
@@ -41,18 +54,20 @@ class ReportService:
         Returns:
             Report dictionary with title and text
         """
+        generated_at = self._now_iso()
+
         if report_type == "morning":
-            return await self._generate_morning_report(session)
+            return await self._generate_morning_report(session, generated_at)
         elif report_type == "evening":
-            return await self._generate_evening_report(session)
+            return await self._generate_evening_report(session, generated_at)
         elif report_type == "weekly":
-            return await self._generate_weekly_report(session)
+            return await self._generate_weekly_report(session, generated_at)
         elif report_type == "monthly":
-            return await self._generate_monthly_report(session)
+            return await self._generate_monthly_report(session, generated_at)
         else:
             raise ValueError(f"Unknown report type: {report_type}")
 
-    async def _generate_morning_report(self, session: AsyncSession) -> dict:
+    async def _generate_morning_report(self, session: AsyncSession, generated_at: str) -> dict:
         """Generate morning report (yesterday's summary)."""
         analytics = await analytics_service.get_analytics(session, "yesterday")
 
@@ -63,13 +78,21 @@ class ReportService:
             "title": title,
             "text": text,
             "type": "morning",
-            "generated_at": datetime.now(self.tz).isoformat(),
+            "generated_at": generated_at,
         }
 
-    async def _generate_evening_report(self, session: AsyncSession) -> dict:
-        """Generate evening report (today's summary)."""
-        analytics = await analytics_service.get_analytics(session, "today")
-        comparison = await analytics_service.get_comparison(session)
+    async def _generate_evening_report(self, session: AsyncSession, generated_at: str) -> dict:
+        """Generate evening report (today's summary).
+
+        Analytics and comparison are independent; an AsyncSession cannot
+        run two queries at once, so the comparison gets its own pooled
+        connection and both run concurrently.
+        """
+        async with async_session_maker() as comparison_session:
+            analytics, comparison = await asyncio.gather(
+                analytics_service.get_analytics(session, "today"),
+                analytics_service.get_comparison(comparison_session),
+            )
 
         title = "🌆 Вечерний отчёт Bablo"
         text = self._format_report(analytics, "за сегодня", comparison)
@@ -78,10 +101,10 @@ class ReportService:
             "title": title,
             "text": text,
             "type": "evening",
-            "generated_at": datetime.now(self.tz).isoformat(),
+            "generated_at": generated_at,
         }
 
-    async def _generate_weekly_report(self, session: AsyncSession) -> dict:
+    async def _generate_weekly_report(self, session: AsyncSession, generated_at: str) -> dict:
         """Generate weekly report (last 7 days)."""
         analytics = await analytics_service.get_analytics(session, "week")
 
@@ -92,10 +115,10 @@ class ReportService:
             "title": title,
             "text": text,
             "type": "weekly",
-            "generated_at": datetime.now(self.tz).isoformat(),
+            "generated_at": generated_at,
         }
 
-    async def _generate_monthly_report(self, session: AsyncSession) -> dict:
+    async def _generate_monthly_report(self, session: AsyncSession, generated_at: str) -> dict:
         """Generate monthly report (last 30 days)."""
         analytics = await analytics_service.get_analytics(session, "month")
 
@@ -106,7 +129,7 @@ class ReportService:
             "title": title,
             "text": text,
             "type": "monthly",
-            "generated_at": datetime.now(self.tz).isoformat(),
+            "generated_at": generated_at,
         }
 
     def _format_report(
@@ -116,43 +139,34 @@ class ReportService:
         comparison: Optional[dict] = None,
     ) -> str:
         """Format analytics data into report text."""
-        total = analytics["total_signals"]
-        long_count = analytics["long_count"]
-        short_count = analytics["short_count"]
+        by_tf = analytics.get("by_timeframe")
         avg_quality = analytics.get("average_quality")
+        top_symbols = analytics.get("top_symbols")
 
         lines = [
-            f"{animated(EMOJI_CHART, '📊')} Сигналов {period_label}: <b>{total}</b>",
-            f"🟢 Long: {long_count} | 🔴 Short: {short_count}",
+            f"{_CHART} Сигналов {period_label}: <b>{analytics['total_signals']}</b>",
+            f"🟢 Long: {analytics['long_count']} | 🔴 Short: {analytics['short_count']}",
         ]
 
         # Timeframe breakdown
-        by_tf = analytics.get("by_timeframe", {})
         if by_tf:
-            lines.append("")
-            lines.append(f"{animated(EMOJI_CHART_UP, '📈')} <b>По таймфреймам:</b>")
-            for tf, count in sorted(by_tf.items()):
-                lines.append(f"  • {tf}: {count}")
+            lines += _TIMEFRAMES_HEADER
+            lines += [f"  • {tf}: {count}" for tf, count in sorted(by_tf.items())]
 
         # Average quality
         if avg_quality:
-            lines.append("")
-            lines.append(f"{animated(EMOJI_STAR, '⭐')} Средний показатель качества: <b>{avg_quality}</b>")
+            lines += ("", f"{_STAR} Средний показатель качества: <b>{avg_quality}</b>")
 
         # Top symbols
-        top_symbols = analytics.get("top_symbols", [])
         if top_symbols:
-            lines.append("")
-            lines.append(f"{animated(EMOJI_TROPHY, '🏆')} <b>Топ символы:</b>")
-            for item in top_symbols[:5]:
-                lines.append(f"  • {item['symbol']}: {item['count']}")
+            lines += _TOP_SYMBOLS_HEADER
+            lines += [f"  • {item['symbol']}: {item['count']}" for item in top_symbols[:5]]
 
         # Comparison (for evening report)
         if comparison:
-            lines.append("")
             vs_yesterday = comparison.get("vs_yesterday", "—")
             vs_week = comparison.get("vs_week_avg", "—")
-            lines.append(f"{animated(EMOJI_CHART, '📊')} vs вчера: {vs_yesterday} | vs неделя: {vs_week}")
+            lines += ("", f"{_CHART} vs вчера: {vs_yesterday} | vs неделя: {vs_week}")
 
         return "\n".join(lines)
 
@@ -188,7 +202,7 @@ class ReportService:
                 analytics,
                 self._get_period_label(report_type),
             ),
-            "generated_at": datetime.now(self.tz).isoformat(),
+            "generated_at": self._now_iso(),
         }
 
     def _get_period_label(self, report_type: str) -> str:
@@ -1,18 +1,43 @@
 """Signal service for Bablo signals."""
 
-from datetime import datetime, timedelta
+import heapq
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
 from typing import Optional
 
-from sqlalchemy import select, func, desc
+from sqlalchemy import Float, Integer, cast, insert, select, func, desc, literal, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.bablo import BabloSignal
+from models.bablo import BabloSignal, BabloSignalProbability, BabloSignalRollup
 from core.parser import ParsedBabloSignal
 from shared.utils.logger import get_logger
 
 logger = get_logger("bablo_signal_service")
 
 
+def _min_quality_clause(min_quality: int):
+    """Build the quality filter with the threshold inlined into the SQL.
+
+    A bound parameter hides the value from the planner, so it could never
+    prove that ``quality_total >= :p`` implies the partial index predicate
+    ``quality_total >= 7``. The threshold is a small bounded integer, so
+    rendering it as a literal costs only a handful of distinct statements.
+    """
+    return BabloSignal.quality_total >= literal(min_quality, Integer, literal_execute=True)
+
+
+def _average_quality():
+    """Average quality as double precision, NULL when there are no signals.
+
+    AVG over an integer column yields numeric, which the driver returns
+    as Decimal; casting in SQL hands back a float directly.
+    """
+    return cast(func.avg(BabloSignal.quality_total), Float)
+
+
 class SignalService:
     """Service for managing Bablo signals."""
 
@@ -24,6 +49,9 @@ class SignalService:
     ) -> BabloSignal:
         """Create a new signal in database.
 
+        The row is flushed, not committed: the caller commits once its
+        follow-up queries in the same transaction are done.
+
         Args:
             session: Database session
             signal_data: Parsed signal data
@@ -32,39 +60,220 @@ class SignalService:
         Returns:
             Created BabloSignal instance
         """
-        signal = BabloSignal(
-            symbol=signal_data.symbol,
-            direction=signal_data.direction,
-            strength=signal_data.strength,
-            timeframe=signal_data.timeframe,
-            time_horizon=signal_data.time_horizon,
-            quality_total=signal_data.quality_total,
-            quality_profit=signal_data.quality_profit,
-            quality_drawdown=signal_data.quality_drawdown,
-            quality_accuracy=signal_data.quality_accuracy,
-            probabilities=signal_data.probabilities,
-            max_drawdown=signal_data.max_drawdown,
-            raw_message=signal_data.raw_message,
-            telegram_message_id=telegram_message_id,
-        )
+        signal = self._build_signal(signal_data, telegram_message_id)
 
         session.add(signal)
-        await session.commit()
-        await session.refresh(signal)
+        await self.increment_rollup(session, signal_data.direction, signal_data.timeframe)
+        await session.flush()
 
         logger.info(f"Created signal: {signal.symbol} {signal.direction} {signal.timeframe}")
         return signal
 
+    async def create_signals(
+        self,
+        session: AsyncSession,
+        items: list[tuple[ParsedBabloSignal, Optional[int]]],
+    ) -> list[BabloSignal]:
+        """Create several signals in one transaction.
+
+        The rows are added together so the ORM flushes them as one batched
+        INSERT ... RETURNING instead of a round-trip per signal; rollup
+        buckets are incremented once per (direction, timeframe). As with
+        ``create_signal``, the caller commits.
+
+        Args:
+            session: Database session
+            items: Pairs of (parsed signal, optional Telegram message ID)
+
+        Returns:
+            Created BabloSignal instances, in input order
+        """
+        if not items:
+            return []
+
+        signals = [
+            self._build_signal(signal_data, telegram_message_id)
+            for signal_data, telegram_message_id in items
+        ]
+        session.add_all(signals)
+
+        rollup = Counter((signal_data.direction, signal_data.timeframe) for signal_data, _ in items)
+        for (direction, timeframe), count in rollup.items():
+            await self.increment_rollup(session, direction, timeframe, count=count)
+
+        await session.flush()
+
+        logger.info(f"Created {len(signals)} signals in batch")
+        return signals
+
+    def _build_signal(
+        self,
+        signal_data: ParsedBabloSignal,
+        telegram_message_id: Optional[int] = None,
+    ) -> BabloSignal:
+        """Build a BabloSignal row (with probability rows) from parsed data."""
+        return BabloSignal(
+            **self._signal_values(signal_data),
+            telegram_message_id=telegram_message_id,
+            probability_rows=self.build_probability_rows(signal_data.probabilities),
+        )
+
+    @staticmethod
+    def _signal_values(signal_data: ParsedBabloSignal) -> dict:
+        """Column values of a signal row taken from parsed data."""
+        return {
+            "symbol": signal_data.symbol,
+            "direction": signal_data.direction,
+            "strength": signal_data.strength,
+            "timeframe": signal_data.timeframe,
+            "time_horizon": signal_data.time_horizon,
+            "quality_total": signal_data.quality_total,
+            "quality_profit": signal_data.quality_profit,
+            "quality_drawdown": signal_data.quality_drawdown,
+            "quality_accuracy": signal_data.quality_accuracy,
+            "probabilities": signal_data.probabilities,
+            "max_drawdown": signal_data.max_drawdown,
+            "raw_message": signal_data.raw_message,
+        }
+
+    async def import_signals(
+        self,
+        session: AsyncSession,
+        items: list[tuple[ParsedBabloSignal, datetime]],
+    ) -> int:
+        """Bulk-insert historical signals (caller commits).
+
+        Uses one executemany INSERT for the signals (ids come back via
+        RETURNING), one for their probability rows and one rollup upsert
+        per hourly bucket, instead of a round-trip per signal.
+
+        Args:
+            session: Database session
+            items: Pairs of (parsed signal, original message time)
+
+        Returns:
+            Number of inserted signals
+        """
+        if not items:
+            return 0
+
+        rows = [
+            {**self._signal_values(signal_data), "received_at": received_at}
+            for signal_data, received_at in items
+        ]
+        result = await session.execute(
+            insert(BabloSignal).returning(BabloSignal.id, sort_by_parameter_order=True),
+            rows,
+        )
+        signal_ids = result.scalars().all()
+
+        probability_rows = [
+            {
+                "signal_id": signal_id,
+                "target": row.target,
+                "long_pct": row.long_pct,
+                "short_pct": row.short_pct,
+            }
+            for signal_id, (signal_data, _) in zip(signal_ids, items)
+            for row in self.build_probability_rows(signal_data.probabilities)
+        ]
+        if probability_rows:
+            await session.execute(insert(BabloSignalProbability), probability_rows)
+
+        rollup = Counter(
+            (
+                received_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0),
+                signal_data.direction,
+                signal_data.timeframe,
+            )
+            for signal_data, received_at in items
+        )
+        for (bucket, direction, timeframe), count in rollup.items():
+            await self.increment_rollup(
+                session, direction, timeframe, received_at=bucket, count=count
+            )
+
+        return len(signal_ids)
+
+    @staticmethod
+    def build_probability_rows(
+        probabilities: Optional[dict],
+    ) -> list[BabloSignalProbability]:
+        """Convert parsed probabilities into child rows of a signal.
+
+        Args:
+            probabilities: Mapping of target (e.g. "0.3") to long/short percents
+
+        Returns:
+            List of BabloSignalProbability rows (signal_id set on flush)
+        """
+        rows = []
+        for target, values in (probabilities or {}).items():
+            try:
+                target_value = Decimal(target)
+            except InvalidOperation:
+                logger.warning(f"Skipping malformed probability target: {target}")
+                continue
+            rows.append(
+                BabloSignalProbability(
+                    target=target_value,
+                    long_pct=values["long"],
+                    short_pct=values["short"],
+                )
+            )
+        return rows
+
+    async def increment_rollup(
+        self,
+        session: AsyncSession,
+        direction: str,
+        timeframe: str,
+        received_at: Optional[datetime] = None,
+        count: int = 1,
+    ) -> None:
+        """Add signals to the hourly rollup bucket (caller commits).
+
+        Args:
+            session: Database session
+            direction: Signal direction
+            timeframe: Signal timeframe
+            received_at: Signal time; defaults to transaction time (now())
+            count: Number of signals to add
+        """
+        if received_at is None:
+            bucket = func.timezone("UTC", func.date_trunc("hour", func.timezone("UTC", func.now())))
+        else:
+            bucket = received_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+        stmt = pg_insert(BabloSignalRollup).values(
+            bucket_ts=bucket,
+            direction=direction,
+            timeframe=timeframe,
+            count=count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                BabloSignalRollup.bucket_ts,
+                BabloSignalRollup.direction,
+                BabloSignalRollup.timeframe,
+            ],
+            set_={"count": BabloSignalRollup.count + stmt.excluded.count},
+        )
+        await session.execute(stmt)
+
     async def get_signals(
         self,
         session: AsyncSession,
         limit: int = 100,
         offset: int = 0,
         from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
         direction: Optional[str] = None,
         timeframe: Optional[str] = None,
         timeframes: Optional[list[str]] = None,
         min_quality: Optional[int] = None,
+        after_received_at: Optional[datetime] = None,
+        after_id: Optional[int] = None,
     ) -> list[BabloSignal]:
         """Get signals with optional filters.
 
@@ -73,19 +282,34 @@ class SignalService:
             limit: Maximum number of signals
             offset: Number of signals to skip
             from_date: Filter signals from this date
+            to_date: Filter signals before this date (exclusive)
             direction: Filter by direction ('long' or 'short')
             timeframe: Filter by single timeframe
             timeframes: Filter by multiple timeframes (e.g. ["1m", "1h"])
             min_quality: Minimum quality threshold
+            after_received_at: Keyset cursor - received_at of last seen signal
+            after_id: Keyset cursor - id of last seen signal
 
         Returns:
             List of BabloSignal instances
         """
-        query = select(BabloSignal).order_by(desc(BabloSignal.received_at))
+        query = select(BabloSignal).order_by(
+            desc(BabloSignal.received_at), desc(BabloSignal.id)
+        )
+
+        # Keyset pagination: seek past the cursor instead of OFFSET scanning
+        if after_received_at is not None and after_id is not None:
+            query = query.where(
+                tuple_(BabloSignal.received_at, BabloSignal.id)
+                < tuple_(after_received_at, after_id)
+            )
 
         if from_date:
             query = query.where(BabloSignal.received_at >= from_date)
 
+        if to_date:
+            query = query.where(BabloSignal.received_at < to_date)
+
         if direction:
             query = query.where(BabloSignal.direction == direction)
 
@@ -95,7 +319,7 @@ class SignalService:
             query = query.where(BabloSignal.timeframe == timeframe)
 
         if min_quality:
-            query = query.where(BabloSignal.quality_total >= min_quality)
+            query = query.where(_min_quality_clause(min_quality))
 
         query = query.limit(limit).offset(offset)
 
@@ -123,81 +347,119 @@ class SignalService:
         if timeframes:
             query = query.where(BabloSignal.timeframe.in_(timeframes))
         if min_quality:
-            query = query.where(BabloSignal.quality_total >= min_quality)
+            query = query.where(_min_quality_clause(min_quality))
 
         result = await session.execute(query)
-        return result.scalar() or 0
+        return result.scalar()
 
-    async def get_signals_by_direction(
+    async def get_signal_timestamps(
         self,
         session: AsyncSession,
         from_date: datetime,
         to_date: datetime,
-    ) -> dict[str, int]:
-        """Get signal counts grouped by direction."""
+    ) -> list[datetime]:
+        """Get receive times of signals in a range, oldest first.
+
+        Served by an index-only scan on received_at; callers derive
+        counts for any sub-range with bisect instead of querying again.
+        """
         query = (
-            select(BabloSignal.direction, func.count(BabloSignal.id))
+            select(BabloSignal.received_at)
             .where(BabloSignal.received_at >= from_date)
             .where(BabloSignal.received_at < to_date)
-            .group_by(BabloSignal.direction)
+            .order_by(BabloSignal.received_at)
         )
 
         result = await session.execute(query)
-        return {row[0]: row[1] for row in result.all()}
+        return list(result.scalars().all())
 
-    async def get_signals_by_timeframe(
-        self,
-        session: AsyncSession,
-        from_date: datetime,
-        to_date: datetime,
-    ) -> dict[str, int]:
-        """Get signal counts grouped by timeframe."""
-        query = (
-            select(BabloSignal.timeframe, func.count(BabloSignal.id))
-            .where(BabloSignal.received_at >= from_date)
-            .where(BabloSignal.received_at < to_date)
-            .group_by(BabloSignal.timeframe)
-        )
+    async def get_last_signal_id(self, session: AsyncSession) -> int:
+        """Get id of the most recently stored signal (0 if there are none).
 
-        result = await session.execute(query)
-        return {row[0]: row[1] for row in result.all()}
+        Resolved from the primary key index, so it is cheap enough to run
+        on every request as a change marker.
+        """
+        result = await session.execute(select(func.coalesce(func.max(BabloSignal.id), 0)))
+        return result.scalar()
 
-    async def get_top_symbols(
-        self,
-        session: AsyncSession,
-        from_date: datetime,
-        to_date: datetime,
-        limit: int = 5,
-    ) -> list[tuple[str, int]]:
-        """Get most frequent symbols."""
-        query = (
-            select(BabloSignal.symbol, func.count(BabloSignal.id).label("count"))
-            .where(BabloSignal.received_at >= from_date)
-            .where(BabloSignal.received_at < to_date)
-            .group_by(BabloSignal.symbol)
-            .order_by(desc("count"))
-            .limit(limit)
-        )
+    async def get_signals_count_estimate(self, session: AsyncSession) -> int:
+        """Get approximate total count of signals from planner statistics.
 
-        result = await session.execute(query)
-        return [(row[0], row[1]) for row in result.all()]
+        O(1) alternative to an unfiltered COUNT(*); falls back to the exact
+        count while the table has never been analyzed.
+        """
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table")
+        result = await session.execute(query, {"table": BabloSignal.__tablename__})
+        estimate = result.scalar()
+
+        if estimate is None or estimate < 0:
+            return await self.get_signals_count(session)
+        return estimate
 
-    async def get_average_quality(
+    async def get_aggregates(
         self,
         session: AsyncSession,
         from_date: datetime,
         to_date: datetime,
-    ) -> Optional[float]:
-        """Get average quality score."""
+        top_limit: int = 5,
+    ) -> dict:
+        """Get period summary, timeframe breakdown and top symbols in one scan.
+
+        Uses GROUPING SETS ((), (timeframe), (symbol)) so the range is read
+        once instead of once per aggregate.
+
+        Returns:
+            Dictionary with total, long, short, average_quality,
+            by_timeframe ({timeframe: count}) and top_symbols
+            ([{"symbol", "count"}], most frequent first)
+        """
         query = (
-            select(func.avg(BabloSignal.quality_total))
+            select(
+                func.grouping(BabloSignal.timeframe, BabloSignal.symbol),
+                BabloSignal.timeframe,
+                BabloSignal.symbol,
+                func.count(),
+                func.count().filter(BabloSignal.direction == "long"),
+                func.count().filter(BabloSignal.direction == "short"),
+                _average_quality(),
+            )
             .where(BabloSignal.received_at >= from_date)
             .where(BabloSignal.received_at < to_date)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(),
+                    tuple_(BabloSignal.timeframe),
+                    tuple_(BabloSignal.symbol),
+                )
+            )
         )
 
         result = await session.execute(query)
-        value = result.scalar()
-        return float(value) if value else None
+
+        aggregates = {
+            "total": 0,
+            "long": 0,
+            "short": 0,
+            "average_quality": None,
+            "by_timeframe": {},
+            "top_symbols": [],
+        }
+        symbol_counts = []
+
+        # grouping() bits: 2 = timeframe rolled up, 1 = symbol rolled up
+        for grouping, timeframe, symbol, count, long_count, short_count, average_quality in result.all():
+            if grouping == 3:
+                aggregates["total"] = count
+                aggregates["long"] = long_count
+                aggregates["short"] = short_count
+                aggregates["average_quality"] = average_quality
+            elif grouping == 1:
+                aggregates["by_timeframe"][timeframe] = count
+            else:
+                symbol_counts.append({"symbol": symbol, "count": count})
+
+        aggregates["top_symbols"] = heapq.nlargest(top_limit, symbol_counts, key=itemgetter("count"))
+        return aggregates
 
 
 # Global service instance
@@ -1,6 +1,7 @@
 """Telegram channel listener for Bablo signals."""
 
 import asyncio
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -8,11 +9,12 @@ from telethon import TelegramClient, events
 from telethon.sessions import StringSession
 
 from config import settings
+from core.cache import invalidate_cache
 from core.parser import bablo_parser
 from services.signal_service import signal_service
 from services.notification_service import notification_service
 from shared.database.connection import async_session_maker
-from shared.utils.redis_client import get_redis_client
+from shared.utils.redis_client import RedisClient, get_redis_client
 from shared.utils.logger import get_logger
 from shared.utils.error_publisher import publish_error
 from shared.constants import EVENT_BABLO_SIGNAL, EVENT_BABLO_ACTIVITY
@@ -21,6 +23,29 @@ logger = get_logger("bablo_listener")
 
 REDIS_CHANNEL = "bablo:notifications"
 
+# Incoming signals are buffered and stored in one transaction once the
+# buffer is full or its oldest message has waited this long
+BATCH_MAX_SIZE = 50
+BATCH_MAX_AGE = 0.5  # seconds
+
+# How long a received message id is remembered to drop redeliveries
+SEEN_MESSAGE_TTL = 3600  # seconds
+
+# Reconnect backoff after a failed connection attempt
+RECONNECT_MIN_DELAY = 10  # seconds
+RECONNECT_MAX_DELAY = 300  # seconds
+
+
+def _seen_key(chat_id: int, message_id: int) -> str:
+    """Redis key remembering that a channel message was stored."""
+    return f"bablo:seen:{chat_id}:{message_id}"
+
+
+def _log_task_exception(task: asyncio.Task) -> None:
+    """Log an exception that escaped a background task."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task failed: {task.exception()!r}")
+
 
 class BabloTelegramListener:
     """Listener for Bablo Telegram channel."""
@@ -28,82 +53,288 @@ class BabloTelegramListener:
     def __init__(self):
         self.client: Optional[TelegramClient] = None
         self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
+        self._redis: Optional[RedisClient] = None
+        self._activity_task: Optional[asyncio.Task] = None
+        # Buffered (chat_id, message) pairs and the ids of every message
+        # buffered or being stored, so redeliveries in flight are skipped
+        self._pending: list = []
+        self._inflight: set[tuple[int, int]] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
 
     async def start(self) -> None:
-        """Start listening to channel."""
+        """Start listening to channel.
+
+        Failed connection attempts are retried with exponential backoff
+        until stop() is called.
+        """
         logger.info("Initializing Bablo Telegram listener...")
+        self._stop_event = asyncio.Event()
 
         if not settings.TELEGRAM_SESSION_STRING:
             logger.warning("No Telegram session string configured, skipping listener")
             return
 
-        try:
-            logger.info("Creating Telegram client for Bablo...")
-            self.client = TelegramClient(
-                StringSession(settings.TELEGRAM_SESSION_STRING),
-                settings.TELEGRAM_API_ID,
-                settings.TELEGRAM_API_HASH,
-            )
+        # Resolved once; the hot paths use it instead of awaiting the getter
+        self._redis = await get_redis_client()
 
-            logger.info("Connecting to Telegram...")
-            await self.client.start()
-            self._running = True
-            logger.info("Telegram client connected successfully!")
+        self._running = True
+        delay = RECONNECT_MIN_DELAY
 
-            # Register handler for new messages
-            @self.client.on(events.NewMessage(chats=[settings.BABLO_CHANNEL_ID]))
-            async def handler(event):
-                logger.info(f"🔥 BABLO HANDLER TRIGGERED! Chat: {event.chat_id}")
-                await self._handle_message(event)
+        while self._running:
+            try:
+                await self._connect()
 
-            logger.info(f"✅ Bablo listener started for channel {settings.BABLO_CHANNEL_ID}")
-            logger.info("Handler is now active and waiting for messages...")
+                # Keep running until stop() is called
+                await self._stop_event.wait()
+                return
 
-            # Keep running
-            while self._running:
-                await asyncio.sleep(1)
+            except Exception as e:
+                logger.error(f"Listener error: {e}", exc_info=True)
+                await self._disconnect()
 
-        except Exception as e:
-            logger.error(f"Listener error: {e}")
-            await asyncio.sleep(10)
-            if self._running:
-                await self.start()
+            logger.info(f"Reconnecting in {delay} seconds...")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _connect(self) -> None:
+        """Create the Telegram client, connect and register the handler."""
+        logger.info("Creating Telegram client for Bablo...")
+        self.client = TelegramClient(
+            StringSession(settings.TELEGRAM_SESSION_STRING),
+            settings.TELEGRAM_API_ID,
+            settings.TELEGRAM_API_HASH,
+        )
+
+        logger.info("Connecting to Telegram...")
+        await self.client.start()
+        logger.info("Telegram client connected successfully!")
+
+        # Register handler for new messages
+        @self.client.on(events.NewMessage(chats=[settings.BABLO_CHANNEL_ID]))
+        async def handler(event):
+            logger.info("🔥 BABLO HANDLER TRIGGERED! Chat: %s", event.chat_id)
+            await self._handle_message(event)
+
+        logger.info(f"✅ Bablo listener started for channel {settings.BABLO_CHANNEL_ID}")
+        logger.info("Handler is now active and waiting for messages...")
+
+    async def _disconnect(self) -> None:
+        """Drop the client of a failed attempt so retries don't pile up clients."""
+        client, self.client = self.client, None
+        if client:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting Telegram client: {e}")
 
     async def stop(self) -> None:
         """Stop listening."""
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
+        await self._flush_pending()
         if self.client:
             await self.client.disconnect()
             logger.info("Bablo listener stopped")
 
     async def _handle_message(self, event) -> None:
         """Handle incoming message."""
-        logger.info(f"📩 Processing Bablo message from chat {event.chat_id}")
+        logger.info("📩 Processing Bablo message from chat %s", event.chat_id)
         message = event.message
         if not message.text:
             logger.debug("Message has no text, skipping")
             return
 
-        logger.info(f"📝 Bablo message text: {message.text[:200]}")
+        if await self._is_duplicate(event.chat_id, message.id):
+            logger.info("Skipping redelivered Bablo message %s", message.id)
+            return
+
+        logger.info("📝 Bablo message text: %.200s", message.text)
 
-        # Parse message
-        signal_data = bablo_parser.parse(message.text)
-        if not signal_data:
-            logger.info(f"⚠️ Bablo parser could not recognize signal format")
+        self._inflight.add((event.chat_id, message.id))
+        self._pending.append((event.chat_id, message))
+        if len(self._pending) >= BATCH_MAX_SIZE:
+            await self._flush_pending()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_delay())
+
+    async def _is_duplicate(self, chat_id: int, message_id: int) -> bool:
+        """Check whether this message was already received.
+
+        Telegram may redeliver messages after a reconnect. Messages still
+        buffered or being stored are tracked in process; stored ones have
+        a Redis key, written only after their signal is committed so that
+        a failed flush lets the redelivery through. Redis errors let the
+        message through as well.
+        """
+        if (chat_id, message_id) in self._inflight:
+            return True
+        try:
+            redis = self._redis
+            return await redis.get(_seen_key(chat_id, message_id)) is not None
+        except Exception as e:
+            logger.warning(f"Duplicate check failed for message {message_id}: {e}")
+            return False
+
+    async def _mark_seen(self, entries: list) -> None:
+        """Remember stored (chat_id, message) pairs so redeliveries are skipped."""
+        if not entries:
+            return
+        try:
+            redis = self._redis
+            await redis.set_nx_batch(
+                [_seen_key(chat_id, message.id) for chat_id, message in entries],
+                "1",
+                expire=SEEN_MESSAGE_TTL,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to remember stored Bablo messages: {e}")
+
+    async def _flush_after_delay(self) -> None:
+        """Flush buffered messages once the batch window has elapsed."""
+        await asyncio.sleep(BATCH_MAX_AGE)
+        await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        """Parse and store buffered messages, then notify users.
+
+        All signals of the batch are written in a single transaction;
+        cache invalidation and the activity check run once per batch.
+        Buffered message ids are released even if storing fails.
+        """
+        async with self._flush_lock:
+            entries, self._pending = self._pending, []
+            if not entries:
+                return
+            try:
+                await self._store_and_notify(entries)
+            finally:
+                self._inflight.difference_update(
+                    (chat_id, message.id) for chat_id, message in entries
+                )
+
+    async def _store_and_notify(self, entries: list) -> None:
+        """Store the signals of buffered (chat_id, message) pairs and notify users.
+
+        A failure is contained to the signal it belongs to: other signals
+        of the batch are still stored, and one failed publish doesn't stop
+        the remaining notifications.
+        """
+        try:
+            parsed = bablo_parser.parse_many([message.text for _, message in entries])
+        except Exception as e:
+            await self._report_error(e, "parse_messages")
             return
 
-        logger.info(f"✅ Parsed Bablo signal: {signal_data.symbol} {signal_data.direction} strength={signal_data.strength}")
+        batch = [
+            (signal_data, message)
+            for signal_data, (_, message) in zip(parsed, entries)
+            if signal_data
+        ]
 
+        skipped = len(entries) - len(batch)
+        if skipped:
+            logger.info(f"⚠️ Bablo parser could not recognize {skipped} message(s)")
+        if not batch:
+            await self._mark_seen(entries)
+            return
+
+        for signal_data, _ in batch:
+            logger.info(
+                "✅ Parsed Bablo signal: %s %s strength=%s",
+                signal_data.symbol, signal_data.direction, signal_data.strength,
+            )
+
+        stored = []
+        recipients = []
         try:
-            # Save to database
             async with async_session_maker() as session:
-                signal = await signal_service.create_signal(
+                added = await self._store_signals(session, batch)
+                await session.commit()
+                stored = added
+
+                # Get users to notify; signals below every user's quality
+                # threshold have no recipients and skip the lookup
+                if stored:
+                    recipients = await self._find_recipients(session, stored)
+        except Exception as e:
+            await self._report_error(e, "handle_message")
+            if not stored:
+                return
+
+        # Only committed and unparseable messages are remembered as seen,
+        # so signals that failed to store are retried on redelivery
+        stored_ids = {message.id for _, message in stored}
+        failed_ids = {message.id for _, message in batch} - stored_ids
+        await self._mark_seen(
+            [(chat_id, message) for chat_id, message in entries if message.id not in failed_ids]
+        )
+        if not stored:
+            return
+
+        # Cached analytics no longer reflect the stored signals
+        await invalidate_cache()
+
+        # Publish notifications
+        for signal_data, message, users in recipients:
+            try:
+                await self._publish_notifications(signal_data, users, message.text)
+            except Exception as e:
+                await self._report_error(e, "publish_notification")
+
+        # Check and notify about high activity in the background
+        self._schedule_activity_check()
+
+    async def _store_signals(self, session, batch: list) -> list:
+        """Add parsed (signal, message) pairs to the session; return the stored ones.
+
+        The whole batch is inserted at once inside a savepoint. If that
+        fails, each signal is retried in its own savepoint so one bad row
+        only loses itself.
+        """
+        try:
+            async with session.begin_nested():
+                await signal_service.create_signals(
                     session,
-                    signal_data,
-                    telegram_message_id=message.id,
+                    [(signal_data, message.id) for signal_data, message in batch],
                 )
+            return batch
+        except Exception as e:
+            if len(batch) == 1:
+                await self._report_error(e, "store_signal")
+                return []
+            logger.warning(f"Batch insert failed, storing {len(batch)} signals one by one: {e}")
 
-                # Get users to notify
+        stored = []
+        for signal_data, message in batch:
+            try:
+                async with session.begin_nested():
+                    await signal_service.create_signal(session, signal_data, message.id)
+            except Exception as e:
+                await self._report_error(e, "store_signal")
+                continue
+            stored.append((signal_data, message))
+        return stored
+
+    async def _find_recipients(self, session, stored: list) -> list:
+        """Look up (signal, message, user_ids) for stored signals that have recipients.
+
+        A failed lookup skips the notification of that signal only.
+        """
+        min_quality = await notification_service.get_global_min_quality(session)
+        if min_quality is None:
+            return []
+
+        recipients = []
+        for signal_data, message in stored:
+            if signal_data.quality_total < min_quality:
+                continue
+            try:
                 users = await notification_service.get_users_for_notification(
                     session,
                     direction=signal_data.direction,
@@ -111,59 +342,64 @@ class BabloTelegramListener:
                     quality=signal_data.quality_total,
                     strength=signal_data.strength,
                 )
-
-            # Publish notifications
+            except Exception as e:
+                await session.rollback()
+                await self._report_error(e, "find_recipients")
+                continue
             if users:
-                await self._publish_notifications(signal_data, users, message.text)
-
-            # Check and notify about high activity
-            await self._check_and_notify_activity()
-            logger.info("Activity check completed")
+                recipients.append((signal_data, message, users))
+        return recipients
 
-        except Exception as e:
-            logger.error(f"Error handling message: {e}", exc_info=True)
-            try:
-                redis = await get_redis_client()
-                await publish_error(redis, "bablo_service", e, context="handle_message")
-            except Exception:
-                pass
+    async def _report_error(self, error: Exception, context: str) -> None:
+        """Log an error and forward it to the error channel."""
+        logger.error(f"Error in {context}: {error}", exc_info=error)
+        try:
+            redis = await get_redis_client()
+            await publish_error(redis, "bablo_service", error, context=context)
+        except Exception:
+            pass
 
     async def _publish_notifications(self, signal_data, user_ids: list[int], original_text: str) -> None:
         """Publish notifications to Redis for users.
 
         Uses Redis pipeline for batch publish (1 network call instead of N).
         """
-        redis = await get_redis_client()
-
-        # Build batch of messages
-        messages = [
-            {
-                "event": EVENT_BABLO_SIGNAL,
-                "user_id": user_id,
-                "data": {
-                    "symbol": signal_data.symbol,
-                    "direction": signal_data.direction,
-                    "strength": signal_data.strength,
-                    "timeframe": signal_data.timeframe,
-                    "quality_total": signal_data.quality_total,
-                    "original_text": original_text,
-                },
-            }
-            for user_id in user_ids
-        ]
+        redis = self._redis
+
+        # Payload is identical for every recipient: serialize it once
+        data = {
+            "symbol": signal_data.symbol,
+            "direction": signal_data.direction,
+            "strength": signal_data.strength,
+            "timeframe": signal_data.timeframe,
+            "quality_total": signal_data.quality_total,
+            "original_text": original_text,
+        }
 
         # Single network call for all publishes
-        await redis.publish_batch(REDIS_CHANNEL, messages)
+        await redis.publish_to_users(REDIS_CHANNEL, EVENT_BABLO_SIGNAL, user_ids, data)
 
         logger.info(f"Published notification to {len(user_ids)} users")
 
+    def _schedule_activity_check(self) -> None:
+        """Run the activity check without blocking message ingestion.
+
+        At most one check runs at a time; signals arriving while it runs
+        are counted by the next one.
+        """
+        if self._activity_task is not None and not self._activity_task.done():
+            return
+        self._activity_task = asyncio.create_task(self._check_and_notify_activity())
+        self._activity_task.add_done_callback(_log_task_exception)
+
     async def _check_and_notify_activity(self) -> None:
         """Check for high activity and notify users.
 
         Optimized version:
         - Uses MGET to batch-fetch last notification times from Redis
-        - Groups COUNT queries by unique time windows to minimize DB calls
-        - Uses batch Redis SET for updating notification times
+        - Fetches signal timestamps for the widest window once and counts
+          each user's range with bisect, so DB calls don't grow with users
+        - Pipelines cooldown SET NX and notification-time SET EX calls
 
         Logic: count only NEW signals since last notification.
         After sending alert, remember the timestamp so next time
@@ -175,14 +411,13 @@ class BabloTelegramListener:
             async with async_session_maker() as session:
                 # Get users with activity tracking enabled
                 users_settings = await notification_service.get_users_for_activity_alert(
-                    session,
-                    signal_count=999999,  # get all users with threshold > 0
+                    session, now
                 )
 
                 if not users_settings:
                     return
 
-                redis = await get_redis_client()
+                redis = self._redis
                 user_ids = list(users_settings.keys())
 
                 # Step 1: Batch fetch last notification times (1 Redis call instead of N)
@@ -190,87 +425,72 @@ class BabloTelegramListener:
                 last_notified_values = await redis.mget(redis_keys)
                 last_notified_map = dict(zip(user_ids, last_notified_values))
 
-                # Step 2: Group users by unique windows and get counts
-                unique_windows = set(window for _, (_, window) in users_settings.items())
-                counts_by_window: dict[int, int] = {}
-
-                for window in unique_windows:
-                    window_start = now - timedelta(minutes=window)
-                    counts_by_window[window] = await signal_service.get_signals_count(
+                # Step 2: One query for the widest window; every user's
+                # count_from falls inside it
+                max_window = max(window for _, window in users_settings.values())
+                timestamps = [
+                    received_at.timestamp()
+                    for received_at in await signal_service.get_signal_timestamps(
                         session,
-                        from_date=window_start,
+                        from_date=now - timedelta(minutes=max_window),
                         to_date=now,
                     )
+                ]
 
-                # Step 3: Check each user against their threshold
-                users_to_notify = []
-                redis_updates: dict[str, str] = {}
+                # Step 3: Check each user against their threshold, comparing
+                # epoch seconds
+                now_ts = now.timestamp()
+                candidates = []
 
                 for user_id, (threshold, window) in users_settings.items():
-                    window_start = now - timedelta(minutes=window)
+                    window_start = now_ts - window * 60
                     last_notified_str = last_notified_map.get(user_id)
 
                     # Determine count_from based on last notification
                     if last_notified_str:
                         try:
-                            last_notified_at = datetime.fromisoformat(last_notified_str)
-                            count_from = max(window_start, last_notified_at)
+                            count_from = max(window_start, float(last_notified_str))
                         except ValueError:
                             count_from = window_start
                     else:
                         count_from = window_start
 
-                    # If user was notified recently, we need individual count
-                    # Otherwise use the cached window count
-                    if count_from > window_start:
-                        # User was notified within the window - need individual count
-                        user_signal_count = await signal_service.get_signals_count(
-                            session,
-                            from_date=count_from,
-                            to_date=now,
-                        )
-                    else:
-                        # Use cached count for this window
-                        user_signal_count = counts_by_window[window]
+                    user_signal_count = len(timestamps) - bisect_left(timestamps, count_from)
 
                     logger.debug(
-                        f"Activity check user {user_id}: "
-                        f"{user_signal_count} signals "
-                        f"(threshold={threshold}, window={window}m)"
+                        "Activity check user %s: %s signals (threshold=%s, window=%sm)",
+                        user_id, user_signal_count, threshold, window,
                     )
 
                     if user_signal_count < threshold:
                         continue
 
-                    # Atomic cooldown: use SET NX to prevent race condition
-                    # Only ONE of parallel _check_activity calls can set this key
-                    cooldown_key = f"bablo:activity_cooldown:{user_id}"
-                    can_notify = await redis.client.set(cooldown_key, "1", nx=True, ex=60)
-                    if not can_notify:
+                    candidates.append((user_id, threshold, window, user_signal_count))
+
+                if not candidates:
+                    return
+
+                # Atomic cooldown: SET NX for all candidates in one pipeline. Only ONE
+                # of parallel _check_activity calls can set each user's key
+                acquired = await redis.set_nx_batch(
+                    [f"bablo:activity_cooldown:{user_id}" for user_id, *_ in candidates],
+                    "1",
+                    expire=60,
+                )
+                users_to_notify = []
+                for candidate, can_notify in zip(candidates, acquired):
+                    if can_notify:
+                        users_to_notify.append(candidate)
+                    else:
                         logger.debug(
-                            f"Skipping activity alert for {user_id}: "
+                            f"Skipping activity alert for {candidate[0]}: "
                             f"cooldown (atomic lock exists)"
                         )
-                        continue
-
-                    users_to_notify.append((user_id, threshold, window, user_signal_count))
-                    # Queue Redis update
-                    redis_key = f"bablo:activity_last:{user_id}"
-                    redis_updates[redis_key] = now.isoformat()
 
                 if not users_to_notify:
                     return
 
-                # Step 4: Batch update Redis (notification times)
-                if redis_updates:
-                    await redis.mset(redis_updates)
-                    # Set expiration for each key individually (MSET doesn't support TTL)
-                    for user_id, (_, window) in users_settings.items():
-                        redis_key = f"bablo:activity_last:{user_id}"
-                        if redis_key in redis_updates:
-                            await redis.client.expire(redis_key, window * 60)
-
-                # Step 5: Publish activity notifications (batch)
+                # Step 4: Publish activity notifications (batch)
                 messages = [
                     {
                         "event": EVENT_BABLO_ACTIVITY,
@@ -283,7 +503,16 @@ class BabloTelegramListener:
                     }
                     for user_id, threshold, window, count in users_to_notify
                 ]
-                await redis.publish_batch(REDIS_CHANNEL, messages)
+                # Notification times are remembered in the same round-trip,
+                # each expiring with its window
+                await redis.publish_batch(
+                    REDIS_CHANNEL,
+                    messages,
+                    set_entries=[
+                        (f"bablo:activity_last:{user_id}", str(now_ts), window * 60)
+                        for user_id, _, window, _ in users_to_notify
+                    ],
+                )
 
                 logger.info(f"📈 Activity alert sent to {len(users_to_notify)} users")
 
@@ -14,7 +14,4 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         Database session
     """
     async with async_session_maker() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
@@ -2,14 +2,25 @@
 
 from fastapi import APIRouter, HTTPException
 
+from core.cache import cached, PERIOD_TTL
 from services.analytics_service import analytics_service
 from shared.schemas.impulse import AnalyticsResponse
 from shared.constants import AnalyticsPeriod
 
 router = APIRouter()
 
+VALID_PERIODS: frozenset[str] = frozenset(p.value for p in AnalyticsPeriod)
+
+# Time series has no "yesterday" view
+TIMESERIES_PERIODS: frozenset[str] = frozenset({"today", "week", "month"})
+
+# Error details are built once instead of on every rejected request
+_INVALID_PERIOD_DETAIL = f"Invalid period. Must be one of: {[p.value for p in AnalyticsPeriod]}"
+_INVALID_TIMESERIES_PERIOD_DETAIL = "Invalid period. Must be one of: today, week, month"
+
 
 @router.get("/timeseries/{period}")
+@cached("timeseries", ttl=PERIOD_TTL)
 async def get_time_series(period: str):
     """Get signal counts as time series.
 
@@ -19,10 +30,10 @@ async def get_time_series(period: str):
     Returns:
         Time series data with labels and counts
     """
-    if period not in ["today", "week", "month"]:
+    if period not in TIMESERIES_PERIODS:
         raise HTTPException(
             status_code=400,
-            detail="Invalid period. Must be one of: today, week, month",
+            detail=_INVALID_TIMESERIES_PERIOD_DETAIL,
         )
 
     try:
@@ -33,6 +44,7 @@ async def get_time_series(period: str):
 
 
 @router.get("/{period}", response_model=AnalyticsResponse)
+@cached("analytics", ttl=PERIOD_TTL)
 async def get_analytics(period: str):
     """Get analytics for specified period.
 
@@ -43,16 +55,15 @@ async def get_analytics(period: str):
         Analytics data
     """
     # Validate period
-    try:
-        AnalyticsPeriod(period)
-    except ValueError:
+    if period not in VALID_PERIODS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid period. Must be one of: {[p.value for p in AnalyticsPeriod]}",
+            detail=_INVALID_PERIOD_DETAIL,
         )
 
     try:
         data = await analytics_service.get_analytics(period)
-        return data
+        # Plain JSON types so the result can be stored in the Redis cache
+        return data.model_dump(mode="json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -7,6 +7,8 @@ from shared.schemas.impulse import NotificationSettingsSchema, NotificationSetti
 
 router = APIRouter()
 
+VALID_REPORT_TYPES: frozenset[str] = frozenset({"morning", "evening", "weekly", "monthly"})
+
 
 @router.get("/{user_id}", response_model=NotificationSettingsSchema)
 async def get_user_settings(user_id: int):
@@ -53,7 +55,7 @@ async def get_users_for_report(report_type: str):
     Returns:
         List of user IDs
     """
-    if report_type not in ["morning", "evening", "weekly", "monthly"]:
+    if report_type not in VALID_REPORT_TYPES:
         raise HTTPException(status_code=400, detail="Invalid report type")
 
     try:
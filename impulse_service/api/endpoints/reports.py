@@ -1,6 +1,7 @@
 """Reports API endpoints."""
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 
 from services.report_service import report_service
 from shared.schemas.impulse import ReportRequest, ReportResponse
@@ -23,7 +24,8 @@ async def generate_report(request: ReportRequest):
             report_type=request.type,
             user_id=request.user_id,
         )
-        return ReportResponse(status="success", report=report)
+        response = ReportResponse(status="success", report=report)
+        return ORJSONResponse(response.model_dump(mode="json"))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
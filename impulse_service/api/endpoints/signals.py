@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
 from services.signal_service import signal_service
 from shared.schemas.impulse import SignalListResponse, ImpulseCreate
@@ -32,7 +33,10 @@ async def get_signals(
             offset=offset,
             from_date=from_date,
         )
-        return result
+        # Built with model_construct from typed ORM rows, without
+        # validation: dump it once instead of letting response_model
+        # validate every signal
+        return ORJSONResponse(result.model_dump(mode="json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,8 +1,8 @@
 """Core analytics calculations."""
 
+import heapq
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
-from decimal import Decimal
 
 from models.impulse import Impulse
 
@@ -98,6 +98,9 @@ def get_most_active_symbols(
 ) -> List[Dict[str, Any]]:
     """Get most active symbols by impulse count.
 
+    Counts and extremes are accumulated in a single pass; only the top
+    ``limit`` symbols are converted to output dicts.
+
     Args:
         impulses: List of impulses
         limit: Maximum symbols to return
@@ -105,27 +108,32 @@ def get_most_active_symbols(
     Returns:
         List of symbol activity data
     """
-    grouped = group_by_symbol(impulses)
-
-    result = []
-    for symbol, symbol_impulses in grouped.items():
-        max_growth = max(
-            (i.percent for i in symbol_impulses if i.type == "growth"),
-            default=Decimal(0),
-        )
-        max_fall = min(
-            (i.percent for i in symbol_impulses if i.type == "fall"),
-            default=Decimal(0),
-        )
-
-        result.append({
-            "symbol": symbol,
-            "count": len(symbol_impulses),
-            "max_growth": float(max_growth),
-            "max_fall": float(max_fall),
-        })
-
-    # Sort by count descending
-    result.sort(key=lambda x: x["count"], reverse=True)
+    # symbol -> [count, max_growth, max_fall]; None until a type is seen
+    stats: Dict[str, list] = {}
 
-    return result[:limit]
+    for impulse in impulses:
+        entry = stats.get(impulse.symbol)
+        if entry is None:
+            entry = stats[impulse.symbol] = [0, None, None]
+        entry[0] += 1
+        if impulse.type == "growth":
+            percent = float(impulse.percent)
+            if entry[1] is None or percent > entry[1]:
+                entry[1] = percent
+        elif impulse.type == "fall":
+            percent = float(impulse.percent)
+            if entry[2] is None or percent < entry[2]:
+                entry[2] = percent
+
+    # Same order as a stable sort by count descending
+    top = heapq.nlargest(limit, stats.items(), key=lambda item: item[1][0])
+
+    return [
+        {
+            "symbol": symbol,
+            "count": count,
+            "max_growth": max_growth or 0.0,
+            "max_fall": max_fall or 0.0,
+        }
+        for symbol, (count, max_growth, max_fall) in top
+    ]
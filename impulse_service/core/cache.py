@@ -0,0 +1,9 @@
+"""Analytics cache of the Impulse service (see shared.utils.cache)."""
+
+from shared.utils.cache import PERIOD_TTL, AnalyticsCache
+
+analytics_cache = AnalyticsCache("impulse")
+
+cached = analytics_cache.cached
+local_cached = analytics_cache.local_cached
+invalidate_cache = analytics_cache.invalidate
@@ -9,6 +9,21 @@ from shared.utils.logger import get_logger
 
 logger = get_logger("parser")
 
+# Patterns are compiled once at import time so the per-message path does
+# not go through the re module cache
+
+# Example: Максимальный импульс: 91% or max: 25.5%
+MAX_PERCENT_PATTERNS = (
+    re.compile(r"Максимальный импульс[:\s]+([+-]?\d+\.?\d*)%", re.IGNORECASE),
+    re.compile(r"max[:\s]+([+-]?\d+\.?\d*)%", re.IGNORECASE),
+)
+
+# Example: 📈|29%|---|71%|📉 or G/F: 3.5/2.1
+RATIO_PATTERNS = (
+    re.compile(r"📈\|(\d+\.?\d*)%\|---\|(\d+\.?\d*)%\|📉", re.IGNORECASE),
+    re.compile(r"G/F[:\s]+(\d+\.?\d*)/(\d+\.?\d*)", re.IGNORECASE),
+)
+
 
 @dataclass
 class ParsedImpulse:
@@ -39,6 +54,10 @@ class ImpulseParser:
         r"\$([A-Z0-9]+)\s*([+-]?\d+\.?\d*)%",
     ]
 
+    # Tried in order: the first pattern found anywhere wins, which a single
+    # alternation (leftmost match of any branch) would not preserve
+    _COMPILED_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in PATTERNS)
+
     def parse(self, message: str) -> Optional[ParsedImpulse]:
         """Parse message and extract impulse data.
 
@@ -52,8 +71,8 @@ class ImpulseParser:
             return None
 
         # Try each pattern
-        for pattern in self.PATTERNS:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in self._COMPILED_PATTERNS:
+            match = pattern.search(message)
             if match:
                 return self._process_match(match, message)
 
@@ -114,13 +133,8 @@ class ImpulseParser:
         Returns:
             Max percent or None
         """
-        # Pattern: Максимальный импульс: 91% or max: 25.5%
-        patterns = [
-            r"Максимальный импульс[:\s]+([+-]?\d+\.?\d*)%",
-            r"max[:\s]+([+-]?\d+\.?\d*)%",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in MAX_PERCENT_PATTERNS:
+            match = pattern.search(message)
             if match:
                 try:
                     return Decimal(match.group(1))
@@ -140,13 +154,8 @@ class ImpulseParser:
         growth_ratio = None
         fall_ratio = None
 
-        # Pattern: 📈|29%|---|71%|📉 or G/F: 3.5/2.1
-        patterns = [
-            r"📈\|(\d+\.?\d*)%\|---\|(\d+\.?\d*)%\|📉",
-            r"G/F[:\s]+(\d+\.?\d*)/(\d+\.?\d*)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RATIO_PATTERNS:
+            match = pattern.search(message)
             if match:
                 try:
                     growth_ratio = Decimal(match.group(1))
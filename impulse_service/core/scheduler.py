@@ -1,10 +1,16 @@
 """Scheduler for periodic tasks."""
 
+import functools
+
 import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select
+from sqlalchemy.orm import InstrumentedAttribute
 
+from models.impulse import UserNotificationSettings
 from services.report_service import report_service
+from shared.database.connection import async_session_maker
 from shared.utils.redis_client import get_redis_client
 from shared.utils.logger import get_logger
 from shared.constants import REDIS_CHANNEL_NOTIFICATIONS, EVENT_REPORT_READY
@@ -16,139 +22,57 @@ _tz = pytz.timezone(settings.TIMEZONE)
 scheduler = AsyncIOScheduler(timezone=_tz)
 
 
-async def send_morning_reports():
-    """Send morning reports to subscribed users."""
-    logger.info("Sending morning reports...")
-
-    from sqlalchemy import select
-    from models.impulse import UserNotificationSettings
-    from shared.database.connection import async_session_maker
-
-    async with async_session_maker() as session:
-        result = await session.execute(
-            select(UserNotificationSettings.user_id).where(
-                UserNotificationSettings.morning_report == True
-            )
-        )
-        user_ids = [row[0] for row in result.all()]
-
-    if not user_ids:
-        logger.info("No users subscribed to morning reports")
-        return
+async def _send_reports(report_type: str, flag_column: InstrumentedAttribute) -> None:
+    """Send a report to every user subscribed to it.
 
-    redis = await get_redis_client()
+    The report content doesn't depend on the user, so it is generated
+    once and published to all subscribers in one pipeline; only
+    ``user_id`` varies between the messages.
 
-    for user_id in user_ids:
-        try:
-            report = await report_service.generate_report("morning", user_id)
-            await redis.publish(
-                REDIS_CHANNEL_NOTIFICATIONS,
-                {
-                    "event": EVENT_REPORT_READY,
-                    "user_id": user_id,
-                    "data": {
-                        "report_type": "morning",
-                        "text": report.text,
-                        "content": report.text,
-                        "timestamp": report.generated_at.isoformat(),
-                    },
-                },
-            )
-            logger.debug(f"Morning report sent to user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to send morning report to {user_id}: {e}")
-
-    logger.info(f"Morning reports sent to {len(user_ids)} users")
-
-
-async def send_evening_reports():
-    """Send evening reports to subscribed users."""
-    logger.info("Sending evening reports...")
-
-    from sqlalchemy import select
-    from models.impulse import UserNotificationSettings
-    from shared.database.connection import async_session_maker
+    Args:
+        report_type: Report type ('morning', 'evening', 'weekly')
+        flag_column: UserNotificationSettings subscription flag for the type
+    """
+    logger.info("Sending %s reports...", report_type)
 
     async with async_session_maker() as session:
         result = await session.execute(
-            select(UserNotificationSettings.user_id).where(
-                UserNotificationSettings.evening_report == True
-            )
+            select(UserNotificationSettings.user_id).where(flag_column == True)
         )
-        user_ids = [row[0] for row in result.all()]
+        user_ids = list(result.scalars().all())
 
     if not user_ids:
-        logger.info("No users subscribed to evening reports")
+        logger.info("No users subscribed to %s reports", report_type)
         return
 
-    redis = await get_redis_client()
+    try:
+        report = await report_service.generate_report(report_type, user_ids[0])
+    except Exception as e:
+        logger.error(f"Failed to generate {report_type} report: {e}")
+        return
 
-    for user_id in user_ids:
-        try:
-            report = await report_service.generate_report("evening", user_id)
-            await redis.publish(
-                REDIS_CHANNEL_NOTIFICATIONS,
-                {
-                    "event": EVENT_REPORT_READY,
-                    "user_id": user_id,
-                    "data": {
-                        "report_type": "evening",
-                        "text": report.text,
-                        "content": report.text,
-                        "timestamp": report.generated_at.isoformat(),
-                    },
-                },
-            )
-            logger.debug(f"Evening report sent to user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to send evening report to {user_id}: {e}")
-
-    logger.info(f"Evening reports sent to {len(user_ids)} users")
-
-
-async def send_weekly_reports():
-    """Send weekly reports to subscribed users."""
-    logger.info("Sending weekly reports...")
-
-    from sqlalchemy import select
-    from models.impulse import UserNotificationSettings
-    from shared.database.connection import async_session_maker
+    data = {
+        "report_type": report_type,
+        "text": report.text,
+        "content": report.text,
+        "timestamp": report.generated_at.isoformat(),
+    }
 
-    async with async_session_maker() as session:
-        result = await session.execute(
-            select(UserNotificationSettings.user_id).where(
-                UserNotificationSettings.weekly_report == True
-            )
-        )
-        user_ids = [row[0] for row in result.all()]
+    redis = await get_redis_client()
+    await redis.publish_to_users(REDIS_CHANNEL_NOTIFICATIONS, EVENT_REPORT_READY, user_ids, data)
 
-    if not user_ids:
-        logger.info("No users subscribed to weekly reports")
-        return
+    logger.info("%s reports sent to %d users", report_type.capitalize(), len(user_ids))
 
-    redis = await get_redis_client()
 
-    for user_id in user_ids:
-        try:
-            report = await report_service.generate_report("weekly", user_id)
-            await redis.publish(
-                REDIS_CHANNEL_NOTIFICATIONS,
-                {
-                    "event": EVENT_REPORT_READY,
-                    "user_id": user_id,
-                    "data": {
-                        "report_type": "weekly",
-                        "text": report.text,
-                        "content": report.text,
-                        "timestamp": report.generated_at.isoformat(),
-                    },
-                },
-            )
-            logger.debug(f"Weekly report sent to user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to send weekly report to {user_id}: {e}")
-
-    logger.info(f"Weekly reports sent to {len(user_ids)} users")
+send_morning_reports = functools.partial(
+    _send_reports, "morning", UserNotificationSettings.morning_report
+)
+send_evening_reports = functools.partial(
+    _send_reports, "evening", UserNotificationSettings.evening_report
+)
+send_weekly_reports = functools.partial(
+    _send_reports, "weekly", UserNotificationSettings.weekly_report
+)
 
 
 def start_scheduler():
@@ -158,6 +82,7 @@ def start_scheduler():
         send_morning_reports,
         CronTrigger(hour=8, minute=0, timezone=_tz),
         id="morning_reports",
+        name="morning_reports",
         replace_existing=True,
     )
 
@@ -166,6 +91,7 @@ def start_scheduler():
         send_evening_reports,
         CronTrigger(hour=20, minute=0, timezone=_tz),
         id="evening_reports",
+        name="evening_reports",
         replace_existing=True,
     )
 
@@ -174,6 +100,7 @@ def start_scheduler():
         send_weekly_reports,
         CronTrigger(day_of_week="mon", hour=9, minute=0, timezone=_tz),
         id="weekly_reports",
+        name="weekly_reports",
         replace_existing=True,
     )
 
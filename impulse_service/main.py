@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from api.router import api_router
 # Scheduler disabled - reports are now sent from master_bot
@@ -74,6 +75,7 @@ app = FastAPI(
     description="Microservice for crypto impulse tracking and analytics",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
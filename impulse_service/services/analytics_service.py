@@ -8,6 +8,7 @@ import pytz
 
 from sqlalchemy import select, func, and_, cast, Date, extract
 
+from core.cache import local_cached, PERIOD_TTL
 from models.impulse import Impulse
 from shared.database.connection import async_session_maker
 from shared.schemas.impulse import AnalyticsResponse, TopImpulse, ComparisonData
@@ -18,6 +19,7 @@ from config import settings
 class AnalyticsService:
     """Service for computing analytics."""
 
+    @local_cached("get_analytics", ttl=PERIOD_TTL)
     async def get_analytics(self, period: str) -> AnalyticsResponse:
         """Get analytics for specified period.
 
@@ -30,35 +32,20 @@ class AnalyticsService:
         start_date, end_date = self._get_period_dates(period)
 
         async with async_session_maker() as session:
-            # Get total counts
-            total_query = select(func.count()).where(
+            # Totals, growth and unique coins in one scan of the range
+            counts_query = select(
+                func.count(),
+                func.count().filter(Impulse.type == "growth"),
+                func.count(func.distinct(Impulse.symbol)),
+            ).where(
                 and_(
                     Impulse.received_at >= start_date,
                     Impulse.received_at <= end_date,
                 )
             )
-            total = await session.scalar(total_query) or 0
-
-            growth_query = select(func.count()).where(
-                and_(
-                    Impulse.received_at >= start_date,
-                    Impulse.received_at <= end_date,
-                    Impulse.type == "growth",
-                )
-            )
-            growth_count = await session.scalar(growth_query) or 0
-
+            total, growth_count, unique_coins = (await session.execute(counts_query)).one()
             fall_count = total - growth_count
 
-            # Get unique coins count
-            unique_query = select(func.count(func.distinct(Impulse.symbol))).where(
-                and_(
-                    Impulse.received_at >= start_date,
-                    Impulse.received_at <= end_date,
-                )
-            )
-            unique_coins = await session.scalar(unique_query) or 0
-
             # Get top growth
             top_growth = await self._get_top_impulses(
                 session, start_date, end_date, "growth", 5
@@ -285,6 +272,7 @@ class AnalyticsService:
         )
 
 
+    @local_cached("get_time_series", ttl=PERIOD_TTL)
     async def get_time_series(self, period: str) -> dict:
         """Get signal counts as time series.
 
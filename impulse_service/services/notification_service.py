@@ -1,10 +1,10 @@
 """Notification settings service."""
 
-from datetime import time
+from datetime import datetime, time
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, cast, func, select
 
-from models.impulse import UserNotificationSettings
+from models.impulse import Impulse, UserNotificationSettings
 from shared.database.connection import async_session_maker
 from shared.schemas.impulse import NotificationSettingsSchema, NotificationSettingsUpdate
 from shared.utils.logger import get_logger
@@ -133,25 +133,64 @@ class NotificationService:
                 )
 
             result = await session.execute(query)
-            return [row[0] for row in result.all()]
+            return list(result.scalars().all())
 
-    async def get_users_for_activity_alert(self) -> dict[int, tuple[int, int]]:
-        """Get users who have activity alerts enabled.
+    async def get_users_for_activity_alert(self, now: datetime) -> dict[int, tuple[int, int]]:
+        """Get users whose activity window holds enough impulses for an alert.
+
+        The count over a user's whole window bounds the count since their
+        last alert, so users below their threshold are filtered out in SQL.
+        Impulses are counted once per distinct window length, not per user.
+
+        Args:
+            now: End of the activity windows
 
         Returns:
             Dictionary mapping user_id to (threshold, window_minutes)
         """
+        windows = (
+            select(UserNotificationSettings.activity_window_minutes.label("window"))
+            .where(UserNotificationSettings.activity_threshold > 0)
+            .distinct()
+            .cte("windows")
+        )
+        window_start = cast(now, DateTime(timezone=True)) - func.make_interval(
+            0, 0, 0, 0, 0, windows.c.window
+        )
+        window_counts = select(
+            windows.c.window,
+            select(func.count())
+            .select_from(Impulse)
+            .where(Impulse.received_at >= window_start, Impulse.received_at < now)
+            .scalar_subquery()
+            .label("impulse_count"),
+        ).cte("window_counts")
+        # MATERIALIZED keeps the CTE from being inlined into the join, so
+        # each count runs once per window rather than once per user
+        window_counts = window_counts.prefix_with("MATERIALIZED")
+
         async with async_session_maker() as session:
-            query = select(
-                UserNotificationSettings.user_id,
-                UserNotificationSettings.activity_threshold,
-                UserNotificationSettings.activity_window_minutes,
-            ).where(
-                UserNotificationSettings.activity_threshold > 0,
+            query = (
+                select(
+                    UserNotificationSettings.user_id,
+                    UserNotificationSettings.activity_threshold,
+                    UserNotificationSettings.activity_window_minutes,
+                )
+                .join(
+                    window_counts,
+                    window_counts.c.window == UserNotificationSettings.activity_window_minutes,
+                )
+                .where(
+                    UserNotificationSettings.activity_threshold > 0,
+                    UserNotificationSettings.activity_threshold <= window_counts.c.impulse_count,
+                )
             )
 
             result = await session.execute(query)
-            return {row[0]: (row[1], row[2]) for row in result.all()}
+            return {
+                user_id: (threshold, window)
+                for user_id, threshold, window in result.all()
+            }
 
     async def get_users_for_report(self, report_type: str) -> list[int]:
         """Get users subscribed to specific report type.
@@ -168,7 +207,7 @@ class NotificationService:
                 getattr(UserNotificationSettings, report_field) == True
             )
             result = await session.execute(query)
-            return [row[0] for row in result.all()]
+            return list(result.scalars().all())
 
 
 # Global service instance
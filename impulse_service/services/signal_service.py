@@ -88,9 +88,11 @@ class SignalService:
             result = await session.execute(query)
             signals = result.scalars().all()
 
-            return SignalListResponse(
+            # Rows come from our own typed columns, so the schemas are built
+            # without re-running validation on every field
+            return SignalListResponse.model_construct(
                 signals=[
-                    ImpulseSchema(
+                    ImpulseSchema.model_construct(
                         id=s.id,
                         symbol=s.symbol,
                         percent=s.percent,
@@ -171,6 +173,33 @@ class SignalService:
             result = await session.scalar(query)
             return result or 0
 
+    async def get_signal_timestamps(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+    ) -> list[datetime]:
+        """Get receive times of signals in a range, oldest first.
+
+        Callers derive counts for any sub-range with bisect instead of
+        querying again.
+
+        Args:
+            from_date: Start of time range
+            to_date: End of time range (exclusive)
+
+        Returns:
+            Sorted list of received_at values
+        """
+        async with async_session_maker() as session:
+            query = (
+                select(Impulse.received_at)
+                .where(Impulse.received_at >= from_date)
+                .where(Impulse.received_at < to_date)
+                .order_by(Impulse.received_at)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
     async def get_recent_signals(self, minutes: int = 15) -> list[Impulse]:
         """Get signals from recent time window.
 
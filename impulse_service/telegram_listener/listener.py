@@ -2,17 +2,19 @@
 
 import asyncio
 import traceback
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from telethon import TelegramClient, events
 from telethon.sessions import StringSession
 
+from core.cache import invalidate_cache
 from core.parser import impulse_parser
 from services.signal_service import signal_service
 from services.notification_service import notification_service
 from shared.schemas.impulse import ImpulseCreate
-from shared.utils.redis_client import get_redis_client
+from shared.utils.redis_client import RedisClient, get_redis_client
 from shared.utils.logger import get_logger
 from shared.utils.error_publisher import publish_error
 from shared.constants import REDIS_CHANNEL_NOTIFICATIONS, EVENT_IMPULSE_ALERT, EVENT_ACTIVITY_ALERT
@@ -20,6 +22,16 @@ from config import settings
 
 logger = get_logger("telegram_listener")
 
+# Reconnect backoff after a failed connection attempt
+RECONNECT_MIN_DELAY = 10  # seconds
+RECONNECT_MAX_DELAY = 300  # seconds
+
+
+def _log_task_exception(task: asyncio.Task) -> None:
+    """Log an exception that escaped a background task."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task failed: {task.exception()!r}")
+
 
 class TelegramListener:
     """Listener for Telegram channel messages."""
@@ -27,10 +39,18 @@ class TelegramListener:
     def __init__(self):
         self._client: Optional[TelegramClient] = None
         self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
+        self._redis: Optional[RedisClient] = None
+        self._activity_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
-        """Start listening to Telegram channel."""
+        """Start listening to Telegram channel.
+
+        Failed connection attempts are retried with exponential backoff
+        until stop() is called.
+        """
         logger.info("Initializing Telegram listener...")
+        self._stop_event = asyncio.Event()
 
         # Log credentials status (without revealing values)
         logger.info(f"TELEGRAM_API_ID present: {bool(settings.TELEGRAM_API_ID)}")
@@ -50,56 +70,79 @@ class TelegramListener:
             logger.warning("Source channel ID not configured. Listener disabled.")
             return
 
+        # Resolved once; the hot paths use it instead of awaiting the getter
+        self._redis = await get_redis_client()
+
         self._running = True
-        logger.info(f"Starting Telegram listener for channel {settings.SOURCE_CHANNEL_ID}...")
+        delay = RECONNECT_MIN_DELAY
 
-        try:
-            logger.info("Creating Telegram client...")
-            logger.info(f"Session string length: {len(settings.TELEGRAM_SESSION_STRING)}")
+        while self._running:
+            try:
+                await self._connect()
 
-            self._client = TelegramClient(
-                StringSession(settings.TELEGRAM_SESSION_STRING),
-                settings.TELEGRAM_API_ID,
-                settings.TELEGRAM_API_HASH,
-            )
-            logger.info("Telegram client object created successfully")
+                # Keep running until stop() is called
+                await self._stop_event.wait()
+                return
+
+            except Exception as e:
+                logger.error(f"Telegram listener error: {e}")
+                logger.error(f"Error type: {type(e).__name__}")
+                logger.error(f"Full traceback:\n{traceback.format_exc()}")
+                await self._disconnect()
 
-            logger.info("Connecting to Telegram (this may take a few seconds)...")
+            logger.info(f"Will attempt to reconnect in {delay} seconds...")
             try:
-                await asyncio.wait_for(self._client.start(), timeout=30.0)
-                logger.info("Telegram client connected successfully!")
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
             except asyncio.TimeoutError:
-                logger.error("Timeout while connecting to Telegram (30 seconds)")
-                raise
-
-            # Register message handler
-            logger.info(f"Registering message handler for channel {settings.SOURCE_CHANNEL_ID}...")
-
-            @self._client.on(events.NewMessage(chats=[settings.SOURCE_CHANNEL_ID]))
-            async def handler(event):
-                logger.info(f"🔥 HANDLER TRIGGERED! Chat: {event.chat_id}")
-                await self._handle_message(event)
+                pass
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
 
-            logger.info(f"✅ Listening to channel: {settings.SOURCE_CHANNEL_ID}")
-            logger.info("Handler is now active and waiting for messages...")
+    async def _connect(self) -> None:
+        """Create the Telegram client, connect and register the handler."""
+        logger.info(f"Starting Telegram listener for channel {settings.SOURCE_CHANNEL_ID}...")
+        logger.info("Creating Telegram client...")
+        logger.info(f"Session string length: {len(settings.TELEGRAM_SESSION_STRING)}")
 
-            # Keep running
-            while self._running:
-                await asyncio.sleep(1)
+        self._client = TelegramClient(
+            StringSession(settings.TELEGRAM_SESSION_STRING),
+            settings.TELEGRAM_API_ID,
+            settings.TELEGRAM_API_HASH,
+        )
+        logger.info("Telegram client object created successfully")
 
-        except Exception as e:
-            logger.error(f"Telegram listener error: {e}")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
-            if self._running:
-                # Reconnect after delay
-                logger.info("Will attempt to reconnect in 10 seconds...")
-                await asyncio.sleep(10)
-                asyncio.create_task(self.start())
+        logger.info("Connecting to Telegram (this may take a few seconds)...")
+        try:
+            await asyncio.wait_for(self._client.start(), timeout=30.0)
+            logger.info("Telegram client connected successfully!")
+        except asyncio.TimeoutError:
+            logger.error("Timeout while connecting to Telegram (30 seconds)")
+            raise
+
+        # Register message handler
+        logger.info(f"Registering message handler for channel {settings.SOURCE_CHANNEL_ID}...")
+
+        @self._client.on(events.NewMessage(chats=[settings.SOURCE_CHANNEL_ID]))
+        async def handler(event):
+            logger.info("🔥 HANDLER TRIGGERED! Chat: %s", event.chat_id)
+            await self._handle_message(event)
+
+        logger.info(f"✅ Listening to channel: {settings.SOURCE_CHANNEL_ID}")
+        logger.info("Handler is now active and waiting for messages...")
+
+    async def _disconnect(self) -> None:
+        """Drop the client of a failed attempt so retries don't pile up clients."""
+        client, self._client = self._client, None
+        if client:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting Telegram client: {e}")
 
     async def stop(self) -> None:
         """Stop the listener."""
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
         if self._client:
             await self._client.disconnect()
         logger.info("Telegram listener stopped.")
@@ -111,21 +154,21 @@ class TelegramListener:
             event: Telethon event
         """
         try:
-            logger.info(f"📩 Processing message from chat {event.chat_id}")
+            logger.info("📩 Processing message from chat %s", event.chat_id)
             message_text = event.message.message
             if not message_text:
                 logger.debug("Message has no text, skipping")
                 return
 
-            logger.info(f"📝 Message text: {message_text[:200]}")
+            logger.info("📝 Message text: %.200s", message_text)
 
             # Parse the message
             parsed = impulse_parser.parse(message_text)
             if not parsed:
-                logger.info(f"⚠️ Parser could not recognize impulse format")
+                logger.info("⚠️ Parser could not recognize impulse format")
                 return
 
-            logger.info(f"Parsed impulse: {parsed.symbol} {parsed.percent}%")
+            logger.info("Parsed impulse: %s %s%%", parsed.symbol, parsed.percent)
 
             # Create impulse in database
             impulse_create = ImpulseCreate(
@@ -140,11 +183,14 @@ class TelegramListener:
 
             await signal_service.create_signal(impulse_create)
 
+            # Cached analytics no longer reflect the stored impulse
+            await invalidate_cache()
+
             # Send notifications to users
             await self._send_notifications(parsed)
 
-            # Check and notify about high activity
-            await self._check_and_notify_activity()
+            # Check and notify about high activity in the background
+            self._schedule_activity_check()
 
         except Exception as e:
             logger.error(f"Error handling message: {e}")
@@ -171,24 +217,19 @@ class TelegramListener:
             if not user_ids:
                 return
 
-            redis = await get_redis_client()
+            redis = self._redis
 
-            # Build batch of messages
-            messages = [
-                {
-                    "event": EVENT_IMPULSE_ALERT,
-                    "user_id": user_id,
-                    "data": {
-                        "symbol": parsed.symbol,
-                        "percent": float(parsed.percent),
-                        "type": parsed.type,
-                    },
-                }
-                for user_id in user_ids
-            ]
+            # Payload is identical for every recipient: serialize it once
+            data = {
+                "symbol": parsed.symbol,
+                "percent": float(parsed.percent),
+                "type": parsed.type,
+            }
 
             # Single network call for all publishes
-            await redis.publish_batch(REDIS_CHANNEL_NOTIFICATIONS, messages)
+            await redis.publish_to_users(
+                REDIS_CHANNEL_NOTIFICATIONS, EVENT_IMPULSE_ALERT, user_ids, data
+            )
 
             logger.info(f"Sent impulse alert to {len(user_ids)} users")
 
@@ -200,13 +241,25 @@ class TelegramListener:
             except Exception:
                 pass
 
+    def _schedule_activity_check(self) -> None:
+        """Run the activity check without blocking message ingestion.
+
+        At most one check runs at a time; signals arriving while it runs
+        are counted by the next one.
+        """
+        if self._activity_task is not None and not self._activity_task.done():
+            return
+        self._activity_task = asyncio.create_task(self._check_and_notify_activity())
+        self._activity_task.add_done_callback(_log_task_exception)
+
     async def _check_and_notify_activity(self) -> None:
         """Check for high activity and notify users.
 
         Optimized version:
         - Uses MGET to batch-fetch last notification times from Redis
-        - Groups COUNT queries by unique time windows to minimize DB calls
-        - Uses batch Redis SET for updating notification times
+        - Fetches impulse timestamps for the widest window once and counts
+          each user's range with bisect, so DB calls don't grow with users
+        - Pipelines cooldown SET NX and notification-time SET EX calls
 
         Logic: count only NEW impulses since last notification.
         After sending alert, remember the timestamp so next time
@@ -216,12 +269,12 @@ class TelegramListener:
             now = datetime.now(timezone.utc)
 
             # Get users with activity tracking enabled
-            users_settings = await notification_service.get_users_for_activity_alert()
+            users_settings = await notification_service.get_users_for_activity_alert(now)
 
             if not users_settings:
                 return
 
-            redis = await get_redis_client()
+            redis = self._redis
             user_ids = list(users_settings.keys())
 
             # Step 1: Batch fetch last notification times (1 Redis call instead of N)
@@ -229,85 +282,75 @@ class TelegramListener:
             last_notified_values = await redis.mget(redis_keys)
             last_notified_map = dict(zip(user_ids, last_notified_values))
 
-            # Step 2: Group users by unique windows and get counts
-            # Find unique windows to minimize COUNT queries
-            unique_windows = set(window for _, (_, window) in users_settings.items())
-            counts_by_window: dict[int, int] = {}
-
-            for window in unique_windows:
-                window_start = now - timedelta(minutes=window)
-                counts_by_window[window] = await signal_service.get_signals_count(
-                    from_date=window_start,
-                    to_date=now,
-                )
-
-            # Step 3: Check each user against their threshold
-            users_to_notify = []
-            redis_updates: dict[str, str] = {}
+            # Step 2: Determine where each user's count starts (epoch seconds)
+            now_ts = now.timestamp()
+            count_froms: dict[int, float] = {}
 
-            for user_id, (threshold, window) in users_settings.items():
-                window_start = now - timedelta(minutes=window)
+            for user_id, (_, window) in users_settings.items():
+                window_start = now_ts - window * 60
                 last_notified_str = last_notified_map.get(user_id)
 
                 # Determine count_from based on last notification
                 if last_notified_str:
                     try:
-                        last_notified_at = datetime.fromisoformat(last_notified_str)
-                        count_from = max(window_start, last_notified_at)
+                        count_from = max(window_start, float(last_notified_str))
                     except ValueError:
                         count_from = window_start
                 else:
                     count_from = window_start
 
-                # If user was notified recently, we need individual count
-                # Otherwise use the cached window count
-                if count_from > window_start:
-                    # User was notified within the window - need individual count
-                    user_impulse_count = await signal_service.get_signals_count(
-                        from_date=count_from,
-                        to_date=now,
-                    )
-                else:
-                    # Use cached count for this window
-                    user_impulse_count = counts_by_window[window]
+                count_froms[user_id] = count_from
+
+            # Step 3: One query for the widest window; every user's
+            # count_from falls inside it
+            max_window = max(window for _, window in users_settings.values())
+            timestamps = [
+                received_at.timestamp()
+                for received_at in await signal_service.get_signal_timestamps(
+                    from_date=now - timedelta(minutes=max_window),
+                    to_date=now,
+                )
+            ]
+
+            # Step 4: Check each user against their threshold
+            candidates = []
+
+            for user_id, (threshold, window) in users_settings.items():
+                user_impulse_count = len(timestamps) - bisect_left(timestamps, count_froms[user_id])
 
                 logger.debug(
-                    f"Activity check user {user_id}: "
-                    f"{user_impulse_count} impulses "
-                    f"(threshold={threshold}, window={window}m)"
+                    "Activity check user %s: %s impulses (threshold=%s, window=%sm)",
+                    user_id, user_impulse_count, threshold, window,
                 )
 
                 if user_impulse_count < threshold:
                     continue
 
-                # Atomic cooldown: use SET NX to prevent race condition
-                # Only ONE of parallel _check_activity calls can set this key
-                cooldown_key = f"impulse:activity_cooldown:{user_id}"
-                can_notify = await redis.client.set(cooldown_key, "1", nx=True, ex=60)
-                if not can_notify:
+                candidates.append((user_id, threshold, window, user_impulse_count))
+
+            if not candidates:
+                return
+
+            # Atomic cooldown: SET NX for all candidates in one pipeline. Only ONE
+            # of parallel _check_activity calls can set each user's key
+            acquired = await redis.set_nx_batch(
+                [f"impulse:activity_cooldown:{user_id}" for user_id, *_ in candidates],
+                "1",
+                expire=60,
+            )
+            users_to_notify = []
+            for candidate, can_notify in zip(candidates, acquired):
+                if can_notify:
+                    users_to_notify.append(candidate)
+                else:
                     logger.debug(
-                        f"Skipping activity alert for {user_id}: "
+                        f"Skipping activity alert for {candidate[0]}: "
                         f"cooldown (atomic lock exists)"
                     )
-                    continue
-
-                users_to_notify.append((user_id, threshold, window, user_impulse_count))
-                # Queue Redis update
-                redis_key = f"impulse:activity_last:{user_id}"
-                redis_updates[redis_key] = now.isoformat()
 
             if not users_to_notify:
                 return
 
-            # Step 4: Batch update Redis (notification times)
-            if redis_updates:
-                await redis.mset(redis_updates)
-                # Set expiration for each key individually (MSET doesn't support TTL)
-                for user_id, (_, window) in users_settings.items():
-                    redis_key = f"impulse:activity_last:{user_id}"
-                    if redis_key in redis_updates:
-                        await redis.client.expire(redis_key, window * 60)
-
             # Step 5: Publish activity notifications (batch)
             messages = [
                 {
@@ -321,7 +364,16 @@ class TelegramListener:
                 }
                 for user_id, threshold, window, count in users_to_notify
             ]
-            await redis.publish_batch(REDIS_CHANNEL_NOTIFICATIONS, messages)
+            # Notification times are remembered in the same round-trip,
+            # each expiring with its window
+            await redis.publish_batch(
+                REDIS_CHANNEL_NOTIFICATIONS,
+                messages,
+                set_entries=[
+                    (f"impulse:activity_last:{user_id}", str(now_ts), window * 60)
+                    for user_id, _, window, _ in users_to_notify
+                ],
+            )
 
             logger.info(f"📈 Activity alert sent to {len(users_to_notify)} users")
 
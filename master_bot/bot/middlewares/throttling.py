@@ -36,13 +36,11 @@ class ThrottlingMiddleware(BaseMiddleware):
         try:
             redis = await get_redis_client()
 
-            # Check if user is throttled
-            if await redis.get(key):
+            # Check and set throttle key in one atomic SET NX EX (in seconds,
+            # minimum 1); if it already exists the user is throttled
+            if not await redis.set_nx(key, "1", expire=max(1, int(self.rate_limit))):
                 return  # Silently ignore throttled messages
 
-            # Set throttle key with expiration (in seconds, minimum 1)
-            await redis.set(key, "1", expire=max(1, int(self.rate_limit)))
-
         except Exception:
             # If Redis fails, continue without throttling
             pass
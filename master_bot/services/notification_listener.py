@@ -1,11 +1,11 @@
 """Redis notification listener for push notifications."""
 
 import asyncio
-import json
 import re
 from html import escape as html_escape
 from typing import Optional
 
+import orjson
 from aiogram import Bot
 
 from services.message_queue import get_message_queue
@@ -36,6 +36,11 @@ from shared.constants import (
 
 logger = get_logger("notification_listener")
 
+# TradingView markdown used in Bablo signal texts (see _convert_tv_markdown_to_html)
+_MD_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_MD_BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*", re.DOTALL)
+_MD_EMPHASIS_PATTERN = re.compile(r"__(.+?)__")
+
 
 class NotificationListener:
     """Listener for Redis pub/sub notifications."""
@@ -84,7 +89,7 @@ class NotificationListener:
                     continue
 
                 try:
-                    data = json.loads(message["data"])
+                    data = orjson.loads(message["data"])
                     channel = message.get("channel", "")
                     if isinstance(channel, bytes):
                         channel = channel.decode()
@@ -92,7 +97,7 @@ class NotificationListener:
                     user_id = data.get("user_id", "?")
                     logger.info(f"📨 Received {event} for user {user_id} on {channel}")
                     await self._handle_notification(data, channel)
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.error(f"Invalid JSON in notification: {message['data'][:200]} - Error: {e}")
                 except Exception as e:
                     logger.error(f"Error handling notification: {e}", exc_info=True)
@@ -233,16 +238,16 @@ class NotificationListener:
             links.append((m.group(1), m.group(2)))
             return f"\x00LINK{idx}\x00"
 
-        text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", _save_link, text)
+        text = _MD_LINK_PATTERN.sub(_save_link, text)
 
         # HTML-escape the rest
         text = html_escape(text)
 
         # Convert **bold** → <b>bold</b>
-        text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text, flags=re.DOTALL)
+        text = _MD_BOLD_PATTERN.sub(r"<b>\1</b>", text)
 
         # Convert __emphasis__ → <b>emphasis</b>
-        text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+        text = _MD_EMPHASIS_PATTERN.sub(r"<b>\1</b>", text)
 
         # Restore links as HTML <a> tags
         for i, (link_text, url) in enumerate(links):
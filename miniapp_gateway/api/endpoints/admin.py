@@ -586,7 +586,7 @@ async def send_broadcast(
             WHERE is_active = true
             AND (access_expires_at IS NULL OR access_expires_at > NOW())
         """))
-        user_ids = [row[0] for row in result.fetchall()]
+        user_ids = list(result.scalars().all())
 
     if not user_ids:
         raise HTTPException(status_code=400, detail="No users to send to")
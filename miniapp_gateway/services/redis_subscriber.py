@@ -1,10 +1,10 @@
 """Redis pub/sub subscriber for real-time notifications."""
 
 import asyncio
-import json
 import logging
 from typing import Optional
 
+import orjson
 import redis.asyncio as redis
 
 from config import settings
@@ -84,13 +84,12 @@ class RedisSubscriber:
         logger.info("Starting to listen for Redis messages...")
 
         try:
-            while self._running:
-                message = await self._pubsub.get_message(
-                    ignore_subscribe_messages=True, timeout=1.0
-                )
-                if message is not None:
-                    await self._handle_message(message)
-                await asyncio.sleep(0.01)  # Small sleep to prevent tight loop
+            # Blocks on the socket until a message arrives; stop() cancels
+            # the task, so there is no polling timeout or sleep
+            async for message in self._pubsub.listen():
+                if not self._running:
+                    break
+                await self._handle_message(message)
 
         except asyncio.CancelledError:
             logger.info("Redis listener cancelled")
@@ -116,8 +115,8 @@ class RedisSubscriber:
 
             # Parse the data
             try:
-                payload = json.loads(data) if isinstance(data, str) else data
-            except json.JSONDecodeError:
+                payload = orjson.loads(data) if isinstance(data, str) else data
+            except orjson.JSONDecodeError:
                 logger.warning(f"Invalid JSON from Redis: {data[:100]}")
                 return
 
@@ -1,13 +1,13 @@
 """WebSocket connection manager."""
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Dict, Optional, Set
 
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
@@ -43,18 +43,18 @@ class WebSocketMessage:
 
     def to_json(self) -> str:
         """Serialize to JSON string."""
-        return json.dumps(
+        return orjson.dumps(
             {
                 "type": self.type.value,
                 "data": self.data,
                 "timestamp": self.timestamp.isoformat(),
             }
-        )
+        ).decode()
 
     @classmethod
     def from_json(cls, data: str) -> "WebSocketMessage":
         """Deserialize from JSON string."""
-        parsed = json.loads(data)
+        parsed = orjson.loads(data)
         return cls(
             type=WSMessageType(parsed.get("type", "error")),
             data=parsed.get("data", {}),
@@ -155,12 +155,16 @@ class ConnectionManager:
         Returns:
             True if sent successfully, False if user not connected
         """
+        return await self._send_text(user_id, message.to_json())
+
+    async def _send_text(self, user_id: int, text: str) -> bool:
+        """Send already serialized message to specific user."""
         conn = self._connections.get(user_id)
         if not conn:
             return False
 
         try:
-            await conn.websocket.send_text(message.to_json())
+            await conn.websocket.send_text(text)
             return True
         except Exception as e:
             logger.error(f"Failed to send to user {user_id}: {e}")
@@ -201,11 +205,12 @@ class ConnectionManager:
         Returns:
             Number of clients that received the message
         """
+        json_message = message.to_json()
         sent_count = 0
 
         for user_id, conn in list(self._connections.items()):
             if channel in conn.subscriptions:
-                success = await self.send_to_user(user_id, message)
+                success = await self._send_text(user_id, json_message)
                 if success:
                     sent_count += 1
 
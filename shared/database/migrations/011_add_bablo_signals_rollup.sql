@@ -0,0 +1,23 @@
+-- Migration 011: Hourly rollup of Bablo signals for time-series analytics
+-- Buckets are UTC hour starts; local-day/local-hour series are built by
+-- converting bucket_ts to the service timezone (whole-hour offsets only)
+
+CREATE TABLE IF NOT EXISTS bablo_signals_rollup (
+    bucket_ts TIMESTAMPTZ NOT NULL,
+    direction VARCHAR(10) NOT NULL,
+    timeframe VARCHAR(10) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_ts, direction, timeframe)
+);
+
+-- Backfill from existing signals
+INSERT INTO bablo_signals_rollup (bucket_ts, direction, timeframe, count)
+SELECT
+    date_trunc('hour', received_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+    direction,
+    timeframe,
+    COUNT(*)
+FROM bablo_signals
+GROUP BY 1, 2, 3
+ON CONFLICT (bucket_ts, direction, timeframe)
+DO UPDATE SET count = EXCLUDED.count;
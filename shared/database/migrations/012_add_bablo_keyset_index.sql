@@ -0,0 +1,5 @@
+-- Migration 012: Index for keyset pagination of Bablo signals
+-- Supports WHERE (received_at, id) < (:ts, :id) ORDER BY received_at DESC, id DESC
+
+CREATE INDEX IF NOT EXISTS idx_bablo_signals_received_at_id
+ON bablo_signals(received_at, id);
@@ -0,0 +1,28 @@
+-- Migration 013: Narrow per-target probabilities table for Bablo analytics
+-- The JSONB bablo_signals.probabilities column is kept for the API;
+-- analytics aggregate over this table instead of unpacking JSONB per row
+
+CREATE TABLE IF NOT EXISTS bablo_signal_probabilities (
+    signal_id INTEGER NOT NULL REFERENCES bablo_signals(id) ON DELETE CASCADE,
+    target NUMERIC(5, 2) NOT NULL,
+    long_pct SMALLINT NOT NULL,
+    short_pct SMALLINT NOT NULL,
+    PRIMARY KEY (signal_id, target)
+);
+
+CREATE INDEX IF NOT EXISTS idx_bablo_signal_probabilities_target
+    ON bablo_signal_probabilities(target);
+
+-- Backfill from existing JSONB probabilities
+INSERT INTO bablo_signal_probabilities (signal_id, target, long_pct, short_pct)
+SELECT
+    s.id,
+    p.key::NUMERIC,
+    (p.value->>'long')::SMALLINT,
+    (p.value->>'short')::SMALLINT
+FROM bablo_signals s
+CROSS JOIN LATERAL jsonb_each(s.probabilities) AS p
+WHERE s.probabilities IS NOT NULL
+  AND jsonb_typeof(s.probabilities) = 'object'
+  AND p.key ~ '^[0-9]+(\.[0-9]+)?$'
+ON CONFLICT (signal_id, target) DO NOTHING;
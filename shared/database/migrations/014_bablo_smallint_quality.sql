@@ -0,0 +1,15 @@
+-- Migration 014: Narrow Bablo quality/strength columns and add partial index
+-- Values are 0-10 (quality) and 1-5 (strength), so SMALLINT is enough.
+-- Note: ALTER COLUMN TYPE rewrites the table under an exclusive lock.
+
+ALTER TABLE bablo_signals
+    ALTER COLUMN strength TYPE SMALLINT,
+    ALTER COLUMN quality_total TYPE SMALLINT,
+    ALTER COLUMN quality_profit TYPE SMALLINT,
+    ALTER COLUMN quality_drawdown TYPE SMALLINT,
+    ALTER COLUMN quality_accuracy TYPE SMALLINT;
+
+-- Partial index for the common min_quality >= 7 filter
+CREATE INDEX IF NOT EXISTS idx_bablo_signals_high_quality_received_at
+    ON bablo_signals(received_at)
+    WHERE quality_total >= 7;
@@ -0,0 +1,28 @@
+-- Migration 016: Pack Bablo notification filter flags into bitmask columns
+-- Generated masks let the recipient lookup filter on two integers that,
+-- together with user_id, are included in the partial notifications index,
+-- so it is answered by an index-only scan instead of reading the table.
+-- Bits must match TIMEFRAME_BITS / DIRECTION_BITS in bablo_service/models/bablo.py.
+-- Adding STORED generated columns rewrites the (small) settings table.
+
+ALTER TABLE bablo_user_settings
+    ADD COLUMN IF NOT EXISTS timeframes_mask INTEGER GENERATED ALWAYS AS (
+        (COALESCE(timeframe_1m, false)::int * 1)
+        | (COALESCE(timeframe_5m, false)::int * 2)
+        | (COALESCE(timeframe_15m, false)::int * 4)
+        | (COALESCE(timeframe_30m, false)::int * 8)
+        | (COALESCE(timeframe_1h, false)::int * 16)
+        | (COALESCE(timeframe_4h, false)::int * 32)
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS directions_mask SMALLINT GENERATED ALWAYS AS (
+        (COALESCE(long_signals, false)::int * 1)
+        | (COALESCE(short_signals, false)::int * 2)
+    ) STORED;
+
+-- Covering replacement for idx_bablo_settings_notif_quality (migration 007)
+CREATE INDEX IF NOT EXISTS idx_bablo_settings_notif_quality_masks
+    ON bablo_user_settings(notifications_enabled, min_quality)
+    INCLUDE (user_id, timeframes_mask, directions_mask)
+    WHERE notifications_enabled = true;
+
+DROP INDEX IF EXISTS idx_bablo_settings_notif_quality;
@@ -0,0 +1,18 @@
+-- Migration 017: Covering indexes for Bablo analytics and filtered lists
+-- get_aggregates reads direction, timeframe, quality_total and symbol over a
+-- received_at range; with them in INCLUDE it is an index-only scan.
+-- The (direction, received_at, id) index serves the signals list filtered by
+-- direction in keyset order without a sort. A partial WHERE on direction is
+-- not useful as every row is long or short.
+-- The plain received_at and direction indexes are leading prefixes of these
+-- (and of idx_bablo_signals_received_at_id), so they only cost writes.
+-- CONCURRENTLY avoids locking writes; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bablo_signals_received_at_covering
+ON bablo_signals(received_at) INCLUDE (direction, timeframe, quality_total, symbol);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bablo_signals_direction_received_at_id
+ON bablo_signals(direction, received_at, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_bablo_signals_received_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_bablo_signals_direction;
@@ -9,6 +9,11 @@ from shared.schemas.impulse import (
     ReportResponse,
     NotificationSettingsSchema,
 )
+from shared.schemas.bablo import (
+    BabloSettingsSchema,
+    BabloSignalSchema,
+    BabloSignalListResponse,
+)
 
 __all__ = [
     "BaseSchema",
@@ -21,4 +26,7 @@ __all__ = [
     "ReportRequest",
     "ReportResponse",
     "NotificationSettingsSchema",
+    "BabloSettingsSchema",
+    "BabloSignalSchema",
+    "BabloSignalListResponse",
 ]
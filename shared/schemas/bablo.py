@@ -0,0 +1,64 @@
+"""Bablo Service Pydantic schemas."""
+
+from datetime import datetime
+from typing import Optional
+
+from shared.schemas.base import BaseSchema
+
+
+class BabloSettingsSchema(BaseSchema):
+    """User Bablo notification settings schema."""
+
+    user_id: int
+    notifications_enabled: bool
+    min_quality: int
+    min_strength: int
+    timeframe_1m: bool
+    timeframe_5m: bool
+    timeframe_15m: bool
+    timeframe_30m: bool
+    timeframe_1h: bool
+    timeframe_4h: bool
+    long_signals: bool
+    short_signals: bool
+    morning_report: bool
+    evening_report: bool
+    weekly_report: bool
+    monthly_report: bool
+    activity_window_minutes: int
+    activity_threshold: int
+
+
+class BabloSignalSchema(BaseSchema):
+    """Bablo signal schema."""
+
+    id: int
+    symbol: str
+    direction: str
+    strength: int
+    timeframe: str
+    time_horizon: Optional[str] = None
+    quality_total: int
+    quality_profit: Optional[int] = None
+    quality_drawdown: Optional[int] = None
+    quality_accuracy: Optional[int] = None
+    probabilities: Optional[dict] = None
+    max_drawdown: Optional[float] = None
+    received_at: datetime
+
+
+class BabloSignalCursor(BaseSchema):
+    """Keyset pagination cursor (last signal of a page)."""
+
+    after_received_at: datetime
+    after_id: int
+
+
+class BabloSignalListResponse(BaseSchema):
+    """Bablo signal list response schema."""
+
+    signals: list[BabloSignalSchema]
+    total: int
+    limit: int
+    offset: int
+    next_cursor: Optional[BabloSignalCursor] = None
@@ -0,0 +1,168 @@
+"""Redis-backed cache for read-heavy analytics endpoints."""
+
+import functools
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Mapping, Union
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.utils.redis_client import get_redis_client
+from shared.utils.logger import get_logger
+
+# TTL in seconds per analytics period: periods that include "now"
+# change more often than closed ones
+PERIOD_TTL = {
+    "today": 30,
+    "yesterday": 300,
+    "week": 300,
+    "month": 300,
+}
+
+DEFAULT_TTL = 60
+
+# In-process cache size per service
+LOCAL_CACHE_MAXSIZE = 64
+
+
+class AnalyticsCache:
+    """Analytics result cache of one service.
+
+    Keys live under ``<service>:cache`` in Redis, so services sharing a
+    Redis instance never see each other's entries.
+
+    Args:
+        service: Service name used for the key prefix and logger
+    """
+
+    def __init__(self, service: str):
+        self.prefix = f"{service}:cache"
+        # Set of all cache keys currently stored, used for invalidation
+        self.registry_key = f"{self.prefix}:keys"
+        self._logger = get_logger(f"{service}_cache")
+        # In-process cache for service methods: key -> (expires_at, value)
+        self._local_cache: dict[str, tuple[float, Any]] = {}
+
+    def _build_key(self, namespace: str, kwargs: dict[str, Any]) -> str:
+        """Build cache key from endpoint keyword arguments (sessions excluded)."""
+        parts = [
+            f"{name}={value}"
+            for name, value in sorted(kwargs.items())
+            if not isinstance(value, AsyncSession)
+        ]
+        return ":".join([self.prefix, namespace, *parts])
+
+    def cached(
+        self,
+        namespace: str,
+        ttl: Union[int, Mapping[str, int]] = DEFAULT_TTL,
+        ttl_key: str = "period",
+    ) -> Callable:
+        """Cache an async endpoint's JSON-serializable result in Redis.
+
+        The key is built from the endpoint keyword arguments, so path/query
+        parameters such as ``period`` become part of it. When ``ttl`` is a
+        mapping it is looked up by the ``ttl_key`` argument.
+
+        Redis failures never break the endpoint: the wrapped function is
+        simply called without caching.
+
+        Args:
+            namespace: Key namespace, usually the endpoint name
+            ttl: Expiration in seconds, or per-period expiration mapping
+            ttl_key: Endpoint argument a ``ttl`` mapping is keyed by
+        """
+        logger = self._logger
+
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = self._build_key(namespace, kwargs)
+
+                try:
+                    redis = await get_redis_client()
+                    hit = await redis.get(key)
+                    if hit is not None:
+                        return orjson.loads(hit)
+                except Exception as e:
+                    logger.warning(f"Cache read failed for {key}: {e}")
+                    return await func(*args, **kwargs)
+
+                result = await func(*args, **kwargs)
+
+                expire = ttl
+                if isinstance(ttl, Mapping):
+                    expire = ttl.get(kwargs.get(ttl_key), DEFAULT_TTL)
+
+                try:
+                    async with redis.client.pipeline(transaction=False) as pipe:
+                        pipe.set(key, orjson.dumps(result), ex=expire)
+                        pipe.sadd(self.registry_key, key)
+                        await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Cache write failed for {key}: {e}")
+
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def local_cached(
+        self,
+        namespace: str,
+        ttl: Union[int, Mapping[str, int]] = DEFAULT_TTL,
+    ) -> Callable:
+        """Cache an async service method's result in process memory.
+
+        Unlike ``cached`` this also covers internal callers such as report
+        generation and needs no network round-trip. Arguments are bound to
+        the method signature, so ``period`` may be passed positionally.
+        The cached object itself is returned, so callers must not mutate it.
+
+        Args:
+            namespace: Key namespace, usually the method name
+            ttl: Expiration in seconds, or per-period expiration mapping
+        """
+        local_cache = self._local_cache
+
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                arguments = signature.bind(*args, **kwargs).arguments
+                arguments.pop("self", None)
+                key = self._build_key(namespace, arguments)
+
+                now = time.monotonic()
+                entry = local_cache.get(key)
+                if entry is not None and entry[0] > now:
+                    return entry[1]
+
+                result = await func(*args, **kwargs)
+
+                expire = ttl
+                if isinstance(ttl, Mapping):
+                    expire = ttl.get(arguments.get("period"), DEFAULT_TTL)
+
+                if len(local_cache) >= LOCAL_CACHE_MAXSIZE:
+                    local_cache.clear()
+                local_cache[key] = (now + expire, result)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    async def invalidate(self) -> None:
+        """Drop all cached analytics results (called after new data is stored)."""
+        self._local_cache.clear()
+        try:
+            redis = await get_redis_client()
+            keys = await redis.client.smembers(self.registry_key)
+            if keys:
+                await redis.client.delete(*keys, self.registry_key)
+        except Exception as e:
+            self._logger.warning(f"Cache invalidation failed: {e}")
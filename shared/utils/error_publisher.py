@@ -1,7 +1,7 @@
 """Error publisher for microservices to report errors via Redis."""
 
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from shared.constants import REDIS_CHANNEL_ERRORS, EVENT_SERVICE_ERROR
@@ -39,7 +39,7 @@ async def publish_error(
             "stack_trace": stack_trace,
             "context": context,
             "user_id": user_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
         await redis_client.publish(REDIS_CHANNEL_ERRORS, message)
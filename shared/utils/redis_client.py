@@ -4,8 +4,12 @@ import os
 import json
 from typing import Optional, Any
 
+import orjson
 import redis.asyncio as redis
 
+# Pub/sub payloads are encoded with orjson; allow non-string keys as json did
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
 
 class RedisClient:
     """Async Redis client wrapper."""
@@ -53,6 +57,14 @@ class RedisClient:
         """Set value with optional expiration."""
         return await self.client.set(key, value, ex=expire)
 
+    async def set_nx(self, key: str, value: str, expire: int) -> bool:
+        """Set key with expiration only if it doesn't exist yet.
+
+        Returns:
+            True if the key was set by this call
+        """
+        return bool(await self.client.set(key, value, nx=True, ex=expire))
+
     async def delete(self, key: str) -> int:
         """Delete key."""
         return await self.client.delete(key)
@@ -69,6 +81,25 @@ class RedisClient:
             return True
         return await self.client.mset(mapping)
 
+    async def set_nx_batch(self, keys: list[str], value: str, expire: int) -> list[bool]:
+        """Set keys that don't exist yet, with expiration, using pipeline.
+
+        Each SET NX EX is atomic, so of several concurrent callers only
+        one gets True for a given key.
+
+        Returns:
+            For each key, True if it was set by this call
+        """
+        if not keys:
+            return []
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, value, nx=True, ex=expire)
+            results = await pipe.execute()
+
+        return [bool(result) for result in results]
+
     async def get_json(self, key: str) -> Optional[Any]:
         """Get JSON value by key."""
         value = await self.get(key)
@@ -87,9 +118,14 @@ class RedisClient:
 
     async def publish(self, channel: str, message: dict) -> int:
         """Publish message to channel."""
-        return await self.client.publish(channel, json.dumps(message))
+        return await self.client.publish(channel, orjson.dumps(message, option=_ORJSON_OPTIONS))
 
-    async def publish_batch(self, channel: str, messages: list[dict]) -> list[int]:
+    async def publish_batch(
+        self,
+        channel: str,
+        messages: list[dict],
+        set_entries: Optional[list[tuple[str, str, int]]] = None,
+    ) -> list[int]:
         """Publish multiple messages to channel using pipeline.
 
         Uses Redis pipeline to batch publish operations into a single
@@ -99,6 +135,8 @@ class RedisClient:
         Args:
             channel: Redis channel name
             messages: List of message dictionaries to publish
+            set_entries: Optional (key, value, expire) entries written in
+                the same round-trip, before the messages are published
 
         Returns:
             List of subscriber counts for each publish
@@ -106,9 +144,47 @@ class RedisClient:
         if not messages:
             return []
 
+        set_entries = set_entries or []
         async with self.client.pipeline(transaction=False) as pipe:
+            for key, value, expire in set_entries:
+                pipe.set(key, value, ex=expire)
             for message in messages:
-                pipe.publish(channel, json.dumps(message))
+                pipe.publish(channel, orjson.dumps(message, option=_ORJSON_OPTIONS))
+            results = await pipe.execute()
+
+        return results[len(set_entries):]
+
+    async def publish_to_users(
+        self,
+        channel: str,
+        event: str,
+        user_ids: list[int],
+        data: dict,
+    ) -> list[int]:
+        """Publish the same event to many users using pipeline.
+
+        Produces the same messages as ``publish_batch`` with
+        ``{"event", "user_id", "data"}`` dicts, but the shared part is
+        encoded once and only the user ID is spliced in per message.
+
+        Args:
+            channel: Redis channel name
+            event: Event name
+            user_ids: Recipient user IDs
+            data: Event payload shared by all recipients
+
+        Returns:
+            List of subscriber counts for each publish
+        """
+        if not user_ids:
+            return []
+
+        prefix = b'{"event":' + orjson.dumps(event) + b',"user_id":'
+        suffix = b',"data":' + orjson.dumps(data, option=_ORJSON_OPTIONS) + b"}"
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.publish(channel, b"%s%d%s" % (prefix, user_id, suffix))
             results = await pipe.execute()
 
         return results
@@ -41,6 +41,10 @@ class StrongSignal(Base):
         DateTime(timezone=True), nullable=True
     )
 
+    # Fetch server defaults (id, received_at) via INSERT ... RETURNING on
+    # flush, so new signals need no refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("idx_strong_signals_received_at", "received_at"),
         Index("idx_strong_signals_symbol", "symbol"),
@@ -1,6 +1,7 @@
 """Strong Signal notification service."""
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.strong import StrongUserSettings
@@ -45,6 +46,11 @@ class NotificationService:
     ) -> StrongUserSettings:
         """Get or create user notification settings.
 
+        Existing settings are read with a plain SELECT. Only on first use
+        are defaults inserted, with ON CONFLICT DO NOTHING so concurrent
+        first requests for the same user cannot race into a
+        duplicate-key error.
+
         Args:
             session: Database session
             user_id: Telegram user ID
@@ -52,16 +58,23 @@ class NotificationService:
         Returns:
             StrongUserSettings instance
         """
-        result = await session.execute(
-            select(StrongUserSettings).where(StrongUserSettings.user_id == user_id)
+        query = select(StrongUserSettings).where(StrongUserSettings.user_id == user_id)
+        user_settings = await session.scalar(query)
+        if user_settings is not None:
+            return user_settings
+
+        stmt = (
+            pg_insert(StrongUserSettings)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[StrongUserSettings.user_id])
+            .returning(StrongUserSettings)
         )
+        result = await session.execute(stmt)
         user_settings = result.scalar_one_or_none()
-
-        if not user_settings:
-            user_settings = StrongUserSettings(user_id=user_id)
-            session.add(user_settings)
-            await session.commit()
-            await session.refresh(user_settings)
+        if user_settings is None:
+            # A concurrent request created the row first
+            user_settings = await session.scalar(query)
+        await session.commit()
 
         return user_settings
 
@@ -4,6 +4,7 @@ import asyncio
 import json
 
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 
 from sqlalchemy import select
 
@@ -24,22 +25,31 @@ class PerformanceScheduler:
     def __init__(self, interval_minutes: int = 30):
         self._interval = interval_minutes * 60
         self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
         self._task = None
 
     async def start(self) -> None:
         """Start the scheduler loop."""
         self._running = True
+        self._stop_event = asyncio.Event()
         logger.info(f"Performance scheduler started (every {self._interval // 60} min)")
         while self._running:
             try:
                 await self._check_and_calculate()
             except Exception as e:
                 logger.error(f"Scheduler error: {e}", exc_info=True)
-            await asyncio.sleep(self._interval)
+
+            # Wait for the next run; stop() ends the wait immediately
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                pass
 
     async def stop(self) -> None:
         """Stop the scheduler."""
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
         logger.info("Performance scheduler stopped")
 
     async def _check_and_calculate(self) -> None:
@@ -95,22 +105,15 @@ class PerformanceScheduler:
                 return
 
             redis = await get_redis_client()
-            messages = [
-                {
-                    "event": EVENT_STRONG_PERFORMANCE,
-                    "user_id": user_id,
-                    "data": {
-                        "symbol": signal.symbol,
-                        "direction": signal.direction,
-                        "max_profit_pct": result["max_profit_pct"],
-                        "entry_price": result["entry_price"],
-                        "bars_to_max": result["bars_to_max"],
-                    },
-                }
-                for user_id in users
-            ]
-
-            await redis.publish_batch(REDIS_CHANNEL_STRONG, messages)
+            data = {
+                "symbol": signal.symbol,
+                "direction": signal.direction,
+                "max_profit_pct": result["max_profit_pct"],
+                "entry_price": result["entry_price"],
+                "bars_to_max": result["bars_to_max"],
+            }
+
+            await redis.publish_to_users(REDIS_CHANNEL_STRONG, EVENT_STRONG_PERFORMANCE, users, data)
             logger.info(f"Published performance notification for {signal.symbol} to {len(users)} users")
 
         except Exception as e:
@@ -24,6 +24,9 @@ class SignalService:
     ) -> StrongSignal:
         """Create a new signal record.
 
+        The row is flushed, not committed: the caller commits once its
+        follow-up queries in the same transaction are done.
+
         Args:
             session: Database session
             signal_data: Parsed signal data
@@ -39,8 +42,7 @@ class SignalService:
             telegram_message_id=telegram_message_id,
         )
         session.add(signal)
-        await session.commit()
-        await session.refresh(signal)
+        await session.flush()
 
         logger.info(f"Created signal: {signal.symbol} {signal.direction}")
         return signal
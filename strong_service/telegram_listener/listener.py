@@ -18,6 +18,10 @@ from shared.constants import EVENT_STRONG_SIGNAL, REDIS_CHANNEL_STRONG
 
 logger = get_logger("strong_listener")
 
+# Reconnect backoff after a failed connection attempt
+RECONNECT_MIN_DELAY = 10  # seconds
+RECONNECT_MAX_DELAY = 300  # seconds
+
 
 class StrongTelegramListener:
     """Listener for Strong Signal Telegram channel."""
@@ -25,67 +29,97 @@ class StrongTelegramListener:
     def __init__(self):
         self.client: Optional[TelegramClient] = None
         self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
 
     async def start(self) -> None:
-        """Start listening to channel."""
+        """Start listening to channel.
+
+        Failed connection attempts are retried with exponential backoff
+        until stop() is called.
+        """
         logger.info("Initializing Strong Signal Telegram listener...")
+        self._stop_event = asyncio.Event()
 
         if not settings.TELEGRAM_SESSION_STRING:
             logger.warning("No Telegram session string configured, skipping listener")
             return
 
-        try:
-            logger.info("Creating Telegram client for Strong Signal...")
-            self.client = TelegramClient(
-                StringSession(settings.TELEGRAM_SESSION_STRING),
-                settings.TELEGRAM_API_ID,
-                settings.TELEGRAM_API_HASH,
-            )
+        self._running = True
+        delay = RECONNECT_MIN_DELAY
 
-            logger.info("Connecting to Telegram...")
-            await self.client.start()
-            self._running = True
-            logger.info("Telegram client connected successfully!")
-
-            @self.client.on(events.NewMessage(chats=[settings.STRONG_CHANNEL_ID]))
-            async def handler(event):
-                logger.info(f"🔥 STRONG HANDLER TRIGGERED! Chat: {event.chat_id}")
-                await self._handle_message(event)
+        while self._running:
+            try:
+                await self._connect()
 
-            logger.info(f"✅ Strong listener started for channel {settings.STRONG_CHANNEL_ID}")
+                # Block until stop() is called
+                await self._stop_event.wait()
+                return
 
-            while self._running:
-                await asyncio.sleep(1)
+            except Exception as e:
+                logger.error(f"Listener error: {e}", exc_info=True)
+                await self._disconnect()
 
-        except Exception as e:
-            logger.error(f"Listener error: {e}")
-            await asyncio.sleep(10)
-            if self._running:
-                await self.start()
+            logger.info(f"Reconnecting in {delay} seconds...")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _connect(self) -> None:
+        """Create the Telegram client, connect and register the handler."""
+        logger.info("Creating Telegram client for Strong Signal...")
+        self.client = TelegramClient(
+            StringSession(settings.TELEGRAM_SESSION_STRING),
+            settings.TELEGRAM_API_ID,
+            settings.TELEGRAM_API_HASH,
+        )
+
+        logger.info("Connecting to Telegram...")
+        await self.client.start()
+        logger.info("Telegram client connected successfully!")
+
+        @self.client.on(events.NewMessage(chats=[settings.STRONG_CHANNEL_ID]))
+        async def handler(event):
+            logger.info("🔥 STRONG HANDLER TRIGGERED! Chat: %s", event.chat_id)
+            await self._handle_message(event)
+
+        logger.info(f"✅ Strong listener started for channel {settings.STRONG_CHANNEL_ID}")
+
+    async def _disconnect(self) -> None:
+        """Drop the client of a failed attempt so retries don't pile up clients."""
+        client, self.client = self.client, None
+        if client:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting Telegram client: {e}")
 
     async def stop(self) -> None:
         """Stop listening."""
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
         if self.client:
             await self.client.disconnect()
             logger.info("Strong listener stopped")
 
     async def _handle_message(self, event) -> None:
         """Handle incoming message."""
-        logger.info(f"📩 Processing Strong message from chat {event.chat_id}")
+        logger.info("📩 Processing Strong message from chat %s", event.chat_id)
         message = event.message
         if not message.text:
             logger.debug("Message has no text, skipping")
             return
 
-        logger.info(f"📝 Strong message text: {message.text[:200]}")
+        logger.info("📝 Strong message text: %.200s", message.text)
 
         signal_data = strong_parser.parse(message.text)
         if not signal_data:
             logger.info("⚠️ Strong parser could not recognize signal format")
             return
 
-        logger.info(f"✅ Parsed Strong signal: {signal_data.symbol} {signal_data.direction}")
+        logger.info("✅ Parsed Strong signal: %s %s", signal_data.symbol, signal_data.direction)
 
         try:
             async with async_session_maker() as session:
@@ -99,6 +133,7 @@ class StrongTelegramListener:
                     session,
                     direction=signal_data.direction,
                 )
+                await session.commit()
 
             if users:
                 await self._publish_notifications(signal_data, users)
@@ -117,19 +152,12 @@ class StrongTelegramListener:
         """Publish notifications to Redis for users."""
         redis = await get_redis_client()
 
-        messages = [
-            {
-                "event": EVENT_STRONG_SIGNAL,
-                "user_id": user_id,
-                "data": {
-                    "symbol": signal_data.symbol,
-                    "direction": signal_data.direction,
-                },
-            }
-            for user_id in user_ids
-        ]
-
-        await redis.publish_batch(REDIS_CHANNEL_STRONG, messages)
+        data = {
+            "symbol": signal_data.symbol,
+            "direction": signal_data.direction,
+        }
+
+        await redis.publish_to_users(REDIS_CHANNEL_STRONG, EVENT_STRONG_SIGNAL, user_ids, data)
         logger.info(f"Published notification to {len(user_ids)} users")
 
 
@@ -386,3 +386,131 @@ class TestRedisClientPublishBatch:
             "bablo:activity_last:200",
             "bablo:activity_last:300",
         ]
+
+
+class TestRedisClientPublishToUsers:
+    """Tests for RedisClient.publish_to_users method."""
+
+    @pytest.fixture
+    def client_with_pipeline(self):
+        """Create RedisClient whose pipeline records publishes."""
+        from shared.utils.redis_client import RedisClient
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1, 1])
+        pipe_ctx = MagicMock()
+        pipe_ctx.__aenter__ = AsyncMock(return_value=pipe)
+        pipe_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        client = RedisClient(url="redis://localhost:6379/0")
+        client._client = MagicMock()
+        client._client.pipeline.return_value = pipe_ctx
+        return client, pipe
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_messages_match_publish_batch_format(self, client_with_pipeline):
+        """Each user gets the same JSON a publish_batch dict would produce."""
+        client, pipe = client_with_pipeline
+        data = {"symbol": "BTCUSDT", "original_text": "«Лонг» \"x\"\n", "quality_total": 8}
+
+        result = await client.publish_to_users("chan", "bablo_signal", [1, 2], data)
+
+        assert result == [1, 1]
+        published = [call.args for call in pipe.publish.call_args_list]
+        assert [channel for channel, _ in published] == ["chan", "chan"]
+        assert [json.loads(message) for _, message in published] == [
+            {"event": "bablo_signal", "user_id": 1, "data": data},
+            {"event": "bablo_signal", "user_id": 2, "data": data},
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_users_skips_pipeline(self, client_with_pipeline):
+        """Empty recipient list does not touch Redis."""
+        client, pipe = client_with_pipeline
+
+        assert await client.publish_to_users("chan", "event", [], {"a": 1}) == []
+        client._client.pipeline.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_batch_allows_int_keys(self, client_with_pipeline):
+        """orjson encoding keeps json's handling of integer dict keys."""
+        client, pipe = client_with_pipeline
+
+        await client.publish_batch("chan", [{"event": "x", "data": {1: "a"}}])
+
+        _, message = pipe.publish.call_args.args
+        assert json.loads(message) == {"event": "x", "data": {"1": "a"}}
+
+
+class TestRedisClientBatchSet:
+    """Tests for RedisClient.set_nx and set_nx_batch methods."""
+
+    @pytest.fixture
+    def client_with_pipeline(self):
+        """Create RedisClient whose pipeline records SET calls."""
+        from shared.utils.redis_client import RedisClient
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, None, True])
+        pipe_ctx = MagicMock()
+        pipe_ctx.__aenter__ = AsyncMock(return_value=pipe)
+        pipe_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        client = RedisClient(url="redis://localhost:6379/0")
+        client._client = MagicMock()
+        client._client.pipeline.return_value = pipe_ctx
+        return client, pipe
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_set_nx_batch_reports_acquired_keys(self, client_with_pipeline):
+        """Keys that already existed come back False."""
+        client, pipe = client_with_pipeline
+
+        result = await client.set_nx_batch(["a", "b", "c"], "1", expire=60)
+
+        assert result == [True, False, True]
+        pipe.set.assert_any_call("b", "1", nx=True, ex=60)
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_set_nx_single_key(self, client_with_pipeline):
+        """SET NX EX reports whether this call created the key."""
+        client, _ = client_with_pipeline
+        client._client.set = AsyncMock(side_effect=[True, None])
+
+        assert await client.set_nx("seen:1", "1", expire=3600) is True
+        assert await client.set_nx("seen:1", "1", expire=3600) is False
+        client._client.set.assert_awaited_with("seen:1", "1", nx=True, ex=3600)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_empty_batches_skip_pipeline(self, client_with_pipeline):
+        """Nothing to write means no Redis round-trip."""
+        client, _ = client_with_pipeline
+
+        assert await client.set_nx_batch([], "1", expire=60) == []
+        client._client.pipeline.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_batch_with_set_entries(self, client_with_pipeline):
+        """Keys are written before publishing, in the same pipeline."""
+        client, pipe = client_with_pipeline
+        pipe.execute = AsyncMock(return_value=[True, 1])
+        calls = MagicMock()
+        calls.attach_mock(pipe.set, "set")
+        calls.attach_mock(pipe.publish, "publish")
+
+        result = await client.publish_batch(
+            "chan", [{"event": "x"}], set_entries=[("last:1", "now", 900)]
+        )
+
+        assert result == [1]
+        assert [name for name, *_ in calls.mock_calls] == ["set", "publish"]
+        pipe.set.assert_called_once_with("last:1", "now", ex=900)
+        pipe.execute.assert_awaited_once()
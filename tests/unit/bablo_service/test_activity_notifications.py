@@ -86,6 +86,102 @@ class TestActivityTimestampCounting:
         assert not (4 >= threshold)  # below threshold -> don't notify
 
 
+class TestCheckAndNotifyActivity:
+    """Test the listener's activity check against mocked DB and Redis."""
+
+    @pytest.fixture
+    def listener(self):
+        """Create listener with mocked Redis client."""
+        from telegram_listener.listener import BabloTelegramListener
+
+        listener = BabloTelegramListener()
+        listener._redis = MagicMock()
+        listener._redis.mget = AsyncMock(return_value=[None, None, None])
+        listener._redis.set_nx_batch = AsyncMock(side_effect=lambda keys, *a, **kw: [True] * len(keys))
+        listener._redis.publish_batch = AsyncMock()
+        return listener
+
+    async def _run_check(self, listener, users_settings, minutes_ago):
+        """Run the activity check with signals received ``minutes_ago``."""
+        from telegram_listener import listener as listener_module
+
+        now = datetime.now(timezone.utc)
+        timestamps = [now - timedelta(minutes=m) for m in sorted(minutes_ago, reverse=True)]
+        session_ctx = MagicMock()
+        session_ctx.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(listener_module, "async_session_maker", MagicMock(return_value=session_ctx)), \
+             patch.object(listener_module, "notification_service") as notifications, \
+             patch.object(listener_module, "signal_service") as signals:
+            notifications.get_users_for_activity_alert = AsyncMock(return_value=users_settings)
+            signals.get_signal_timestamps = AsyncMock(return_value=timestamps)
+            await listener._check_and_notify_activity()
+
+        return now, signals.get_signal_timestamps
+
+    @staticmethod
+    def _notified(listener):
+        """Map notified user id -> published signal count."""
+        if not listener._redis.publish_batch.await_count:
+            return {}
+        messages = listener._redis.publish_batch.call_args[0][1]
+        return {m["user_id"]: m["data"]["signal_count"] for m in messages}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_per_user_counts_from_one_query(self, listener):
+        """Each user's window is counted from one query over the widest window."""
+        users = {1: (3, 15), 2: (2, 5), 3: (7, 60)}
+
+        now, get_timestamps = await self._run_check(
+            listener, users, minutes_ago=[50, 30, 12, 4, 3, 0.5]
+        )
+
+        get_timestamps.assert_awaited_once()
+        from_date = get_timestamps.call_args.kwargs["from_date"]
+        assert abs((now - from_date) - timedelta(minutes=60)) < timedelta(seconds=5)
+        assert self._notified(listener) == {1: 4, 2: 3}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_counts_only_signals_after_last_alert(self, listener):
+        """Signals already reported in the previous alert are not counted again."""
+        last = datetime.now(timezone.utc) - timedelta(minutes=3.5)
+        listener._redis.mget = AsyncMock(return_value=[str(last.timestamp())])
+
+        await self._run_check(listener, {1: (3, 15)}, minutes_ago=[12, 4, 3, 0.5])
+
+        assert self._notified(listener) == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cooldown_lock_skips_user(self, listener):
+        """Users whose cooldown key is already held are not notified."""
+        listener._redis.set_nx_batch = AsyncMock(return_value=[True, False])
+
+        await self._run_check(listener, {1: (1, 15), 2: (1, 15)}, minutes_ago=[2])
+
+        keys = listener._redis.set_nx_batch.call_args[0][0]
+        assert keys == ["bablo:activity_cooldown:1", "bablo:activity_cooldown:2"]
+        assert self._notified(listener) == {1: 1}
+        set_entries = listener._redis.publish_batch.call_args.kwargs["set_entries"]
+        assert [(key, expire) for key, _, expire in set_entries] == [
+            ("bablo:activity_last:1", 15 * 60)
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_legacy_isoformat_last_alert_falls_back_to_window(self, listener):
+        """ISO strings written before the epoch switch count from the window start."""
+        legacy = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+        listener._redis.mget = AsyncMock(return_value=[legacy])
+
+        await self._run_check(listener, {1: (3, 15)}, minutes_ago=[12, 4, 3, 0.5])
+
+        assert self._notified(listener) == {1: 4}
+
+
 class TestBabloReportFormat:
     """Test that Bablo report no longer has duplicate header."""
 
@@ -131,14 +227,13 @@ class TestRedisActivityKeys:
         assert key == "bablo:activity_last:123"
 
     @pytest.mark.unit
-    def test_timestamp_stored_as_isoformat(self):
-        """Test timestamps are stored in ISO format."""
+    def test_timestamp_stored_as_epoch_seconds(self):
+        """Test timestamps are stored as epoch seconds."""
         now = datetime.now(timezone.utc)
-        stored = now.isoformat()
+        stored = str(now.timestamp())
 
-        # Should be parseable back
-        parsed = datetime.fromisoformat(stored)
-        assert parsed == now
+        # Should be parseable back without building a datetime
+        assert float(stored) == now.timestamp()
 
 
 class TestActivityCooldown:
@@ -200,7 +295,7 @@ class TestActivityCooldown:
         should_skip = False
 
         try:
-            datetime.fromisoformat(last_notified_str)
+            float(last_notified_str)
         except ValueError:
             # Invalid timestamp - don't skip (pass through)
             should_skip = False
@@ -214,10 +309,10 @@ class TestActivityCooldown:
         test_cases = [
             # (last_notified_str, expected_skip)
             (None, False),  # No previous notification
-            ((now - timedelta(seconds=10)).isoformat(), True),   # 10s ago - skip
-            ((now - timedelta(seconds=59)).isoformat(), True),   # 59s ago - skip
-            ((now - timedelta(seconds=60)).isoformat(), False),  # 60s ago - allow
-            ((now - timedelta(seconds=120)).isoformat(), False), # 2min ago - allow
+            (str(now.timestamp() - 10), True),   # 10s ago - skip
+            (str(now.timestamp() - 59), True),   # 59s ago - skip
+            (str(now.timestamp() - 60), False),  # 60s ago - allow
+            (str(now.timestamp() - 120), False), # 2min ago - allow
             ("invalid", False),  # Invalid timestamp - allow
         ]
 
@@ -226,11 +321,218 @@ class TestActivityCooldown:
 
             if last_notified_str:
                 try:
-                    last_notified_at = datetime.fromisoformat(last_notified_str)
-                    seconds_since_last = (now - last_notified_at).total_seconds()
+                    seconds_since_last = now.timestamp() - float(last_notified_str)
                     if seconds_since_last < 60:
                         should_skip = True
                 except ValueError:
                     pass
 
             assert should_skip == expected_skip, f"Failed for {last_notified_str}"
+
+
+class TestListenerRedelivery:
+    """Test that redelivered messages are skipped only once stored."""
+
+    @pytest.fixture
+    def listener(self):
+        """Create listener with mocked Redis client."""
+        from telegram_listener.listener import BabloTelegramListener
+
+        listener = BabloTelegramListener()
+        listener._redis = MagicMock()
+        listener._redis.get = AsyncMock(return_value=None)
+        listener._redis.set_nx_batch = AsyncMock(return_value=[True])
+        listener._schedule_activity_check = MagicMock()
+        return listener
+
+    @staticmethod
+    def _event(message_id=7, text="signal"):
+        return MagicMock(chat_id=-100, message=MagicMock(id=message_id, text=text))
+
+    @staticmethod
+    def _session():
+        session = AsyncMock()
+        savepoint = MagicMock()
+        savepoint.__aenter__ = AsyncMock()
+        savepoint.__aexit__ = AsyncMock(return_value=False)
+        session.begin_nested = MagicMock(return_value=savepoint)
+        return session
+
+    @staticmethod
+    def _session_maker(session):
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return MagicMock(return_value=ctx)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_buffered_message_redelivery_skipped(self, listener):
+        """A redelivery of a message still waiting in the buffer is dropped."""
+        await listener._handle_message(self._event())
+        await listener._handle_message(self._event())
+        listener._flush_task.cancel()
+
+        assert len(listener._pending) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stored_message_redelivery_skipped(self, listener):
+        """A message whose seen key exists in Redis is not buffered again."""
+        listener._redis.get = AsyncMock(return_value="1")
+
+        await listener._handle_message(self._event())
+
+        assert listener._pending == []
+        listener._redis.get.assert_awaited_once_with("bablo:seen:-100:7")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_seen_keys_written_after_commit(self, listener):
+        """Stored messages are remembered once the transaction commits."""
+        from telegram_listener import listener as listener_module
+
+        session = self._session()
+        event = self._event()
+        listener._inflight.add((-100, 7))
+        listener._pending = [(event.chat_id, event.message)]
+
+        with patch.object(listener_module, "async_session_maker", self._session_maker(session)), \
+             patch.object(listener_module, "bablo_parser") as parser, \
+             patch.object(listener_module, "signal_service") as signals, \
+             patch.object(listener_module, "notification_service") as notifications, \
+             patch.object(listener_module, "invalidate_cache", AsyncMock()):
+            parser.parse_many.return_value = [MagicMock(quality_total=5)]
+            signals.create_signals = AsyncMock()
+            notifications.get_global_min_quality = AsyncMock(return_value=None)
+            await listener._flush_pending()
+
+        session.commit.assert_awaited_once()
+        listener._redis.set_nx_batch.assert_awaited_once_with(
+            ["bablo:seen:-100:7"], "1", expire=listener_module.SEEN_MESSAGE_TTL
+        )
+        assert listener._inflight == set()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_flush_lets_redelivery_through(self, listener):
+        """Messages of a failed flush are not remembered, so a redelivery retries."""
+        from telegram_listener import listener as listener_module
+
+        session = self._session()
+        event = self._event()
+        listener._inflight.add((-100, 7))
+        listener._pending = [(event.chat_id, event.message)]
+
+        with patch.object(listener_module, "async_session_maker", self._session_maker(session)), \
+             patch.object(listener_module, "bablo_parser") as parser, \
+             patch.object(listener_module, "signal_service") as signals, \
+             patch.object(listener_module, "get_redis_client", AsyncMock()), \
+             patch.object(listener_module, "publish_error", AsyncMock()):
+            parser.parse_many.return_value = [MagicMock(quality_total=5)]
+            signals.create_signals = AsyncMock(side_effect=RuntimeError("db down"))
+            await listener._flush_pending()
+
+        listener._redis.set_nx_batch.assert_not_awaited()
+        assert not await listener._is_duplicate(-100, 7)
+
+
+class TestListenerFlushIsolation:
+    """Test that one failing signal doesn't take the batch down with it."""
+
+    @pytest.fixture
+    def listener(self):
+        """Create listener with mocked Redis client."""
+        from telegram_listener.listener import BabloTelegramListener
+
+        listener = BabloTelegramListener()
+        listener._redis = MagicMock()
+        listener._redis.set_nx_batch = AsyncMock()
+        listener._schedule_activity_check = MagicMock()
+        listener._report_error = AsyncMock()
+        return listener
+
+    @staticmethod
+    def _buffer(listener, *message_ids):
+        listener._pending = [
+            (-100, MagicMock(id=message_id, text=f"signal {message_id}"))
+            for message_id in message_ids
+        ]
+
+    @staticmethod
+    def _signal(quality=5):
+        return MagicMock(direction="long", timeframe="1h", quality_total=quality, strength=3)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_bad_row_only_loses_itself(self, listener):
+        """A failed batch insert is retried per signal in savepoints."""
+        from telegram_listener import listener as listener_module
+
+        session = TestListenerRedelivery._session()
+        self._buffer(listener, 1, 2, 3)
+        signals = [self._signal(), self._signal(), self._signal()]
+
+        async def create_signal(session, signal_data, message_id):
+            if message_id == 2:
+                raise ValueError("bad row")
+
+        with patch.object(listener_module, "async_session_maker",
+                          TestListenerRedelivery._session_maker(session)), \
+             patch.object(listener_module, "bablo_parser") as parser, \
+             patch.object(listener_module, "signal_service") as signal_service, \
+             patch.object(listener_module, "notification_service") as notifications, \
+             patch.object(listener_module, "invalidate_cache", AsyncMock()):
+            parser.parse_many.return_value = signals
+            signal_service.create_signals = AsyncMock(side_effect=ValueError("bad row"))
+            signal_service.create_signal = AsyncMock(side_effect=create_signal)
+            notifications.get_global_min_quality = AsyncMock(return_value=None)
+            await listener._flush_pending()
+
+        assert session.begin_nested.call_count == 4
+        session.commit.assert_awaited_once()
+        listener._report_error.assert_awaited_once()
+        seen = listener._redis.set_nx_batch.call_args[0][0]
+        assert seen == ["bablo:seen:-100:1", "bablo:seen:-100:3"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parser_error_is_reported(self, listener):
+        """Parser exceptions are reported instead of escaping the flush task."""
+        from telegram_listener import listener as listener_module
+
+        self._buffer(listener, 1)
+
+        with patch.object(listener_module, "bablo_parser") as parser:
+            parser.parse_many.side_effect = RuntimeError("parser bug")
+            await listener._flush_pending()
+
+        listener._report_error.assert_awaited_once()
+        assert listener._report_error.call_args[0][1] == "parse_messages"
+        assert listener._inflight == set()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_publish_does_not_stop_others(self, listener):
+        """Every signal with recipients is published even if one publish fails."""
+        from telegram_listener import listener as listener_module
+
+        session = TestListenerRedelivery._session()
+        self._buffer(listener, 1, 2)
+        listener._publish_notifications = AsyncMock(side_effect=[ConnectionError, None])
+
+        with patch.object(listener_module, "async_session_maker",
+                          TestListenerRedelivery._session_maker(session)), \
+             patch.object(listener_module, "bablo_parser") as parser, \
+             patch.object(listener_module, "signal_service") as signal_service, \
+             patch.object(listener_module, "notification_service") as notifications, \
+             patch.object(listener_module, "invalidate_cache", AsyncMock()):
+            parser.parse_many.return_value = [self._signal(), self._signal()]
+            signal_service.create_signals = AsyncMock()
+            notifications.get_global_min_quality = AsyncMock(return_value=5)
+            notifications.get_users_for_notification = AsyncMock(return_value=[42])
+            await listener._flush_pending()
+
+        assert listener._publish_notifications.await_count == 2
+        listener._report_error.assert_awaited_once()
+        listener._schedule_activity_check.assert_called_once()
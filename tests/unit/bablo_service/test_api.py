@@ -194,6 +194,46 @@ class TestBabloAnalyticsEndpoint:
             # Simulate endpoint call
             assert period in valid_periods
 
+    @pytest.mark.unit
+    def test_period_sets(self):
+        """Period constants are immutable sets; time series has no yesterday."""
+        from api.endpoints.analytics import TIMESERIES_PERIODS, VALID_PERIODS
+
+        assert isinstance(VALID_PERIODS, frozenset)
+        assert VALID_PERIODS == {"today", "yesterday", "week", "month"}
+        assert TIMESERIES_PERIODS == VALID_PERIODS - {"yesterday"}
+
+    @pytest.mark.unit
+    def test_analytics_etag_not_modified(self):
+        """Matching If-None-Match short-circuits with 304 before any analytics work."""
+        from api import dependencies
+        from api.dependencies import analytics_etag, get_db_session
+
+        app = FastAPI()
+
+        @app.get("/analytics/today", dependencies=[fastapi.Depends(analytics_etag)])
+        async def endpoint():
+            return {"total": 1}
+
+        async def fake_session():
+            yield MagicMock()
+
+        app.dependency_overrides[get_db_session] = fake_session
+        client = TestClient(app)
+
+        with patch.object(
+            dependencies.signal_service, "get_last_signal_id", AsyncMock(return_value=42)
+        ):
+            first = client.get("/analytics/today")
+            etag = first.headers["etag"]
+            second = client.get("/analytics/today", headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert etag.startswith('W/"42-')
+        assert first.headers["cache-control"] == dependencies.ANALYTICS_CACHE_CONTROL
+        assert second.status_code == 304
+        assert second.content == b""
+
     @pytest.mark.unit
     def test_analytics_response_structure(self):
         """Test analytics response structure."""
@@ -327,6 +367,76 @@ class TestBabloNotificationsEndpoint:
         assert "min_quality" in update
         assert "user_id" not in update  # Not updateable
 
+    @pytest.mark.unit
+    def test_settings_schema_from_orm(self):
+        """Settings response is built straight from the ORM object."""
+        from models.bablo import BabloUserSettings
+        from shared.schemas.bablo import BabloSettingsSchema
+
+        settings = BabloUserSettings(
+            user_id=123,
+            notifications_enabled=True,
+            min_quality=7,
+            min_strength=3,
+            timeframe_1m=False,
+            timeframe_5m=True,
+            timeframe_15m=True,
+            timeframe_30m=True,
+            timeframe_1h=True,
+            timeframe_4h=True,
+            long_signals=True,
+            short_signals=False,
+            morning_report=True,
+            evening_report=True,
+            weekly_report=False,
+            monthly_report=True,
+            activity_window_minutes=15,
+            activity_threshold=10,
+            timezone="Europe/Moscow",
+        )
+
+        data = BabloSettingsSchema.model_validate(settings).model_dump()
+
+        assert data["user_id"] == 123
+        assert data["short_signals"] is False
+        assert data["activity_threshold"] == 10
+        assert "timezone" not in data
+
+    @pytest.mark.unit
+    def test_router_has_no_duplicate_routes(self):
+        """Every method/path pair is declared by exactly one handler.
+
+        Routes are read from the endpoint sources, so the check does not
+        depend on which modules other tests have replaced in sys.modules.
+        """
+        import ast
+        from pathlib import Path
+
+        endpoints_dir = Path(__file__).parents[3] / "bablo_service" / "api" / "endpoints"
+        seen = {}
+        for module in sorted(endpoints_dir.glob("*.py")):
+            tree = ast.parse(module.read_text(encoding="utf-8"))
+            prefix = ""
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "APIRouter":
+                    for kw in node.keywords:
+                        if kw.arg == "prefix":
+                            prefix = kw.value.value
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.AsyncFunctionDef):
+                    continue
+                for deco in node.decorator_list:
+                    if (
+                        isinstance(deco, ast.Call)
+                        and isinstance(deco.func, ast.Attribute)
+                        and getattr(deco.func.value, "id", None) == "router"
+                    ):
+                        key = (deco.func.attr, prefix + deco.args[0].value)
+                        assert key not in seen, f"Duplicate route {key} in {module.name} and {seen[key]}"
+                        seen[key] = module.name
+
+        assert ("get", "/notifications/{user_id}") in seen
+
 
 class TestBabloHealthEndpoint:
     """Tests for Bablo health endpoint."""
@@ -0,0 +1,284 @@
+"""Unit tests for Bablo NotificationService."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+class TestBabloNotificationServiceUnit:
+    """Unit tests for Bablo NotificationService."""
+
+    @pytest.fixture
+    def mock_session(self):
+        """Create mock async session."""
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.execute = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def notification_service(self):
+        """Create NotificationService instance."""
+        from services.notification_service import NotificationService
+
+        return NotificationService()
+
+    # =========================================================================
+    # Report Subscribers Tests
+    # =========================================================================
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_users_for_reports_single_query(
+        self, notification_service, mock_session
+    ):
+        """All report types are bucketed from one result set."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            (1, True, True, False, False),
+            (2, False, True, True, False),
+            (3, False, False, False, True),
+        ]
+        mock_session.execute.return_value = mock_result
+
+        result = await notification_service.get_users_for_reports(mock_session)
+
+        assert result == {
+            "morning": [1],
+            "evening": [1, 2],
+            "weekly": [2],
+            "monthly": [3],
+        }
+        mock_session.execute.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_users_for_report_single_type(
+        self, notification_service, mock_session
+    ):
+        """Per-type lookup is served from the batch query."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(1, True, False, False, False)]
+        mock_session.execute.return_value = mock_result
+
+        assert await notification_service.get_users_for_report(mock_session, "morning") == [1]
+        assert await notification_service.get_users_for_report(mock_session, "weekly") == []
+
+    # =========================================================================
+    # Signal Recipients Tests
+    # =========================================================================
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_users_for_notification_filters_snapshot(
+        self, notification_service, mock_session
+    ):
+        """Quality, timeframe and direction are matched against the masks."""
+        from models.bablo import DIRECTION_BITS, TIMEFRAME_BITS
+
+        all_timeframes = sum(TIMEFRAME_BITS.values())
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            (1, 7, all_timeframes, DIRECTION_BITS["short"]),
+            (2, 9, all_timeframes, DIRECTION_BITS["short"]),
+            (3, 5, TIMEFRAME_BITS["1h"], DIRECTION_BITS["short"]),
+            (4, 5, all_timeframes, DIRECTION_BITS["long"]),
+        ]
+        mock_session.execute.return_value = mock_result
+
+        result = await notification_service.get_users_for_notification(
+            mock_session, "short", "4h", quality=8, strength=3
+        )
+
+        assert result == [1]
+        query = str(mock_session.execute.call_args[0][0])
+        assert "timeframes_mask" in query
+        assert "notifications_enabled" in query
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_recipients_snapshot_reused_until_invalidated(
+        self, notification_service, mock_session
+    ):
+        """Consecutive signals share one query; settings updates reload it."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(1, 5, 0b111111, 0b11)]
+        mock_session.execute.return_value = mock_result
+
+        for timeframe in ("1h", "4h", "15m"):
+            assert await notification_service.get_users_for_notification(
+                mock_session, "long", timeframe, quality=7, strength=3
+            ) == [1]
+        assert mock_session.execute.call_count == 1
+
+        notification_service.invalidate_recipients()
+        await notification_service.get_users_for_notification(
+            mock_session, "long", "1h", quality=7, strength=3
+        )
+        assert mock_session.execute.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_global_min_quality(self, notification_service, mock_session):
+        """Lowest threshold comes from the same snapshot as the recipients."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(1, 7, 0b111111, 0b11), (2, 5, 0b1, 0b1)]
+        mock_session.execute.return_value = mock_result
+
+        assert await notification_service.get_global_min_quality(mock_session) == 5
+        await notification_service.get_users_for_notification(
+            mock_session, "long", "1m", quality=6, strength=3
+        )
+        mock_session.execute.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_global_min_quality_no_recipients(
+        self, notification_service, mock_session
+    ):
+        """Nobody subscribed means there is no threshold at all."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_session.execute.return_value = mock_result
+
+        assert await notification_service.get_global_min_quality(mock_session) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_users_for_notification_unknown_timeframe(
+        self, notification_service, mock_session
+    ):
+        """Unsupported timeframes notify nobody and skip the query."""
+        result = await notification_service.get_users_for_notification(
+            mock_session, "long", "2h", quality=8, strength=3
+        )
+
+        assert result == []
+        mock_session.execute.assert_not_called()
+
+    # =========================================================================
+    # User Settings Tests
+    # =========================================================================
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_user_settings_existing_is_read_only(
+        self, notification_service, mock_session
+    ):
+        """Existing settings are selected without any write or commit."""
+        settings = MagicMock(user_id=42)
+        mock_session.scalar = AsyncMock(return_value=settings)
+
+        result = await notification_service.get_user_settings(mock_session, 42)
+
+        assert result is settings
+        mock_session.scalar.assert_awaited_once()
+        mock_session.execute.assert_not_called()
+        mock_session.commit.assert_not_awaited()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_user_settings_created_on_first_use(
+        self, notification_service, mock_session
+    ):
+        """Missing settings are inserted with ON CONFLICT DO NOTHING."""
+        from sqlalchemy.dialects import postgresql
+
+        settings = MagicMock(user_id=42)
+        mock_session.scalar = AsyncMock(return_value=None)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = settings
+        mock_session.execute.return_value = mock_result
+
+        result = await notification_service.get_user_settings(mock_session, 42)
+
+        assert result is settings
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_awaited_once()
+        mock_session.add.assert_not_called()
+
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id) DO NOTHING" in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_user_settings_lost_insert_race(
+        self, notification_service, mock_session
+    ):
+        """If a concurrent request inserted first, the row is selected again."""
+        settings = MagicMock(user_id=42)
+        mock_session.scalar = AsyncMock(side_effect=[None, settings])
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_session.execute.return_value = mock_result
+
+        result = await notification_service.get_user_settings(mock_session, 42)
+
+        assert result is settings
+        assert mock_session.scalar.await_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_update_user_settings_single_statement(
+        self, notification_service, mock_session
+    ):
+        """Updates are written and re-read in one statement, no refresh."""
+        from sqlalchemy.dialects import postgresql
+
+        settings = MagicMock(user_id=42)
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = settings
+        mock_session.execute.return_value = mock_result
+        notification_service._recipients_expires_at = float("inf")
+
+        result = await notification_service.update_user_settings(
+            mock_session, 42, {"min_quality": 9, "unknown_field": 1, "user_id": 7}
+        )
+
+        assert result is settings
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_awaited_once()
+        mock_session.refresh.assert_not_called()
+        assert notification_service._recipients_expires_at == 0.0
+
+        compiled = mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "DO UPDATE SET min_quality" in sql
+        assert "unknown_field" not in sql
+        assert "RETURNING" in sql
+        assert compiled.params["user_id"] == 42
+
+    @pytest.mark.unit
+    def test_updatable_columns_exclude_generated_and_key(self):
+        """Generated masks, the key and timestamps cannot be written."""
+        from services.notification_service import _UPDATABLE_COLUMNS
+
+        assert {"min_quality", "timeframe_4h", "long_signals", "timezone"} <= _UPDATABLE_COLUMNS
+        assert not {
+            "user_id", "created_at", "updated_at", "timeframes_mask", "directions_mask"
+        } & _UPDATABLE_COLUMNS
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_users_for_activity_alert(self, notification_service, mock_session):
+        """Activity subscribers map to (threshold, window_minutes)."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(1, 10, 15), (2, 5, 30)]
+        mock_session.execute.return_value = mock_result
+
+        result = await notification_service.get_users_for_activity_alert(
+            mock_session, datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+
+        assert result == {1: (10, 15), 2: (5, 30)}
+        mock_session.execute.assert_called_once()
+
+        # Signals are counted once per distinct window, then joined to users
+        query = str(mock_session.execute.call_args[0][0])
+        assert "SELECT DISTINCT bablo_user_settings.activity_window_minutes" in query
+        assert "make_interval(" in query and "windows.window)" in query
+        assert "window_counts AS MATERIALIZED" in query
+        assert "activity_threshold <= window_counts.signal_count" in query
@@ -1,15 +1,9 @@
 """Unit tests for BabloParser."""
 
 from decimal import Decimal
-from unittest.mock import MagicMock
-import sys
 
 import pytest
 
-# Mock the logger before importing parser
-sys.modules['shared.utils.logger'] = MagicMock()
-sys.modules['shared.utils'] = MagicMock()
-
 from core.parser import BabloParser, ParsedBabloSignal
 
 
@@ -43,6 +37,23 @@ class TestBabloParser:
         for msg in messages:
             assert parser.parse(msg) is None
 
+    @pytest.mark.unit
+    def test_parse_rejects_without_regex_scan(self, parser):
+        """Messages missing the signal markers are rejected before any regex runs."""
+        from unittest.mock import patch
+
+        import core.parser as parser_module
+
+        messages = [
+            "Обзор рынка на сегодня: [BTC](https://example.com)",
+            "🟩🟩🟩 без заголовка сигнала",
+            "`| 1м ТФ |` **Качество = 7 из 10:** без ссылки",
+        ]
+        with patch.object(parser_module, "COMBINED_PATTERN") as combined:
+            for msg in messages:
+                assert parser.parse(msg) is None
+            combined.finditer.assert_not_called()
+
     # =========================================================================
     # Long Signal Tests (Green Squares)
     # =========================================================================
@@ -612,6 +623,40 @@ class TestBabloParser:
         assert result is not None
         assert result.symbol == "BTCUSDT.P"
 
+    @pytest.mark.unit
+    def test_parse_first_occurrence_wins(self, parser):
+        """Long squares take precedence and the first match of a field is used."""
+        message = """[BTCUSDT.P](https://example.com)
+🟥🟥🟥
+`| 1м ТФ |`
+🟩🟩
+**Качество = 5 из 10:**
+**Качество = 9 из 10:**
+`1%`: 📉 `70%`, 📈 `65%`"""
+
+        result = parser.parse(message)
+
+        assert result is not None
+        assert result.direction == "long"
+        assert result.strength == 2
+        assert result.quality_total == 5
+
+    @pytest.mark.unit
+    def test_parse_many_keeps_input_order(self, parser):
+        """parse_many returns one result per message, None for non-signals."""
+        signal = """[BTCUSDT.P](https://example.com)
+🟩🟩
+`| 15м ТФ |`
+**Качество = 8 из 10:**"""
+
+        results = parser.parse_many(["hello", signal, ""])
+
+        assert len(results) == 3
+        assert results[0] is None
+        assert results[1].symbol == "BTCUSDT.P"
+        assert results[1].timeframe == "15m"
+        assert results[2] is None
+
 
 class TestParsedBabloSignalDataclass:
     """Tests for ParsedBabloSignal dataclass."""
@@ -671,84 +716,78 @@ class TestParsedBabloSignalDataclass:
         assert signal.raw_message == "test message"
 
 
-class TestBabloParserInternalMethods:
-    """Tests for internal BabloParser methods."""
+class TestBabloParserFields:
+    """Field extraction checked through parse() on a minimal signal."""
+
+    HEADER = "[BTCUSDT.P](https://ru.tradingview.com/symbols/BTCUSDT.P/)\n"
 
     @pytest.fixture
     def parser(self) -> BabloParser:
         """Create parser instance."""
         return BabloParser()
 
+    def _message(self, squares: str = "🟩", body: str = "") -> str:
+        """Build a minimal valid signal with the given squares and extra lines."""
+        return f"{self.HEADER}{squares}\n`| 1м ТФ |`\n**Качество = 7 из 10:**\n{body}"
+
     @pytest.mark.unit
-    def test_extract_direction_long(self, parser):
-        """Test direction extraction for long signals."""
-        message = "🟩🟩🟩🟩"
-        direction, strength = parser._extract_direction_and_strength(message)
+    def test_direction_long(self, parser):
+        """Green squares give a long signal, strength is their count."""
+        result = parser.parse(self._message("🟩🟩🟩🟩"))
 
-        assert direction == "long"
-        assert strength == 4
+        assert result.direction == "long"
+        assert result.strength == 4
 
     @pytest.mark.unit
-    def test_extract_direction_short(self, parser):
-        """Test direction extraction for short signals."""
-        message = "🟥🟥"
-        direction, strength = parser._extract_direction_and_strength(message)
+    def test_direction_short(self, parser):
+        """Red squares give a short signal."""
+        result = parser.parse(self._message("🟥🟥"))
 
-        assert direction == "short"
-        assert strength == 2
+        assert result.direction == "short"
+        assert result.strength == 2
 
     @pytest.mark.unit
-    def test_extract_direction_none(self, parser):
-        """Test direction extraction when no squares present."""
-        message = "No squares here"
-        direction, strength = parser._extract_direction_and_strength(message)
-
-        assert direction is None
-        assert strength == 0
+    def test_direction_missing(self, parser):
+        """Messages without squares are not signals."""
+        assert parser.parse(self._message("No squares here")) is None
 
     @pytest.mark.unit
-    def test_extract_pattern_int(self, parser):
-        """Test integer pattern extraction."""
-        message = "Профитность _8_ из 10"
-        result = parser._extract_pattern_int(message, parser.PROFIT_PATTERN)
+    def test_quality_breakdown(self, parser):
+        """Quality breakdown values are parsed as integers."""
+        result = parser.parse(self._message(body="  ° Профитность _8_ из 10"))
 
-        assert result == 8
+        assert result.quality_profit == 8
 
     @pytest.mark.unit
-    def test_extract_pattern_int_no_match(self, parser):
-        """Test integer pattern extraction with no match."""
-        message = "No pattern here"
-        result = parser._extract_pattern_int(message, parser.PROFIT_PATTERN)
+    def test_quality_breakdown_missing(self, parser):
+        """Missing breakdown values stay None."""
+        result = parser.parse(self._message())
 
-        assert result is None
+        assert result.quality_profit is None
+        assert result.quality_drawdown is None
+        assert result.quality_accuracy is None
 
     @pytest.mark.unit
-    def test_extract_probabilities(self, parser):
-        """Test probability extraction."""
-        message = """`0.3%`: 📉 `86%`, 📈 `72%`
-`0.6%`: 📉 `75%`, 📈 `60%`"""
+    def test_probabilities(self, parser):
+        """Every probability line is collected by target."""
+        result = parser.parse(self._message(body="""`0.3%`: 📉 `86%`, 📈 `72%`
+`0.6%`: 📉 `75%`, 📈 `60%`"""))
 
-        result = parser._extract_probabilities(message)
-
-        assert len(result) == 2
+        assert len(result.probabilities) == 2
         # Parser assigns: 📉 → "long", 📈 → "short"
-        assert result["0.3"]["long"] == 86  # 📉 value
-        assert result["0.3"]["short"] == 72  # 📈 value
-        assert result["0.6"]["long"] == 75  # 📉 value
-        assert result["0.6"]["short"] == 60  # 📈 value
+        assert result.probabilities["0.3"] == {"long": 86, "short": 72}
+        assert result.probabilities["0.6"] == {"long": 75, "short": 60}
 
     @pytest.mark.unit
-    def test_extract_max_drawdown(self, parser):
-        """Test max drawdown extraction."""
-        message = "Максимальная просадка = __15%__"
-        result = parser._extract_max_drawdown(message)
+    def test_max_drawdown(self, parser):
+        """Max drawdown is parsed as Decimal."""
+        result = parser.parse(self._message(body="Максимальная просадка = __15%__"))
 
-        assert result == Decimal("15")
+        assert result.max_drawdown == Decimal("15")
 
     @pytest.mark.unit
-    def test_extract_time_horizon(self, parser):
-        """Test time horizon extraction."""
-        message = "**Вероятность (60 минут):**"
-        result = parser._extract_time_horizon(message)
+    def test_time_horizon(self, parser):
+        """Time horizon comes from the probability header."""
+        result = parser.parse(self._message(body="**Вероятность (60 минут):**"))
 
-        assert result == "60 минут"
+        assert result.time_horizon == "60 минут"
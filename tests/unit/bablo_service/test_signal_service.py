@@ -17,6 +17,7 @@ class TestBabloSignalServiceUnit:
         """Create mock async session."""
         session = AsyncMock()
         session.add = MagicMock()
+        session.add_all = MagicMock()
         session.commit = AsyncMock()
         session.refresh = AsyncMock()
         session.execute = AsyncMock()
@@ -70,8 +71,16 @@ class TestBabloSignalServiceUnit:
         )
 
         mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
+        mock_session.flush.assert_awaited_once()
+        mock_session.commit.assert_not_called()
+        mock_session.refresh.assert_not_called()
+
+    @pytest.mark.unit
+    def test_signal_model_fetches_server_defaults_on_insert(self):
+        """received_at comes back with the INSERT, so no refresh is needed."""
+        from models.bablo import BabloSignal
+
+        assert BabloSignal.__mapper__.eager_defaults is True
 
     @pytest.mark.unit
     @pytest.mark.asyncio
@@ -85,6 +94,110 @@ class TestBabloSignalServiceUnit:
         added_signal = mock_session.add.call_args[0][0]
         assert added_signal.telegram_message_id is None
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_signal_updates_rollup(
+        self, signal_service, mock_session, sample_parsed_signal
+    ):
+        """Test that create_signal upserts the hourly rollup in the same transaction."""
+        await signal_service.create_signal(mock_session, sample_parsed_signal)
+
+        mock_session.execute.assert_called_once()
+        stmt = mock_session.execute.call_args[0][0]
+        assert stmt.table.name == "bablo_signals_rollup"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_signal_writes_probability_rows(
+        self, signal_service, mock_session, sample_parsed_signal
+    ):
+        """Probabilities are stored as child rows alongside the JSONB column."""
+        await signal_service.create_signal(mock_session, sample_parsed_signal)
+
+        added_signal = mock_session.add.call_args[0][0]
+        rows = {
+            row.target: (row.long_pct, row.short_pct)
+            for row in added_signal.probability_rows
+        }
+        assert rows == {Decimal("0.3"): (72, 86), Decimal("0.6"): (60, 75)}
+        assert added_signal.probabilities == sample_parsed_signal.probabilities
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_signals_batch(
+        self, signal_service, mock_session, sample_parsed_signal
+    ):
+        """Batch insert adds all rows at once and flushes once."""
+        other = ParsedBabloSignal(
+            symbol="ETHUSDT.P",
+            direction="short",
+            strength=2,
+            timeframe="1m",
+            quality_total=8,
+        )
+
+        signals = await signal_service.create_signals(
+            mock_session,
+            [(sample_parsed_signal, 1), (sample_parsed_signal, 2), (other, None)],
+        )
+
+        assert [s.telegram_message_id for s in signals] == [1, 2, None]
+        mock_session.add_all.assert_called_once_with(signals)
+        mock_session.flush.assert_awaited_once()
+        mock_session.commit.assert_not_called()
+        # One rollup upsert per (direction, timeframe) pair
+        assert mock_session.execute.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_signals_empty(self, signal_service, mock_session):
+        """Empty batch does not touch the database."""
+        assert await signal_service.create_signals(mock_session, []) == []
+        mock_session.flush.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_import_signals_bulk(
+        self, signal_service, mock_session, sample_parsed_signal
+    ):
+        """Historical import uses executemany inserts and per-bucket rollups."""
+        inserted = MagicMock()
+        inserted.scalars.return_value.all.return_value = [10, 11]
+        mock_session.execute.return_value = inserted
+
+        hour = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+        count = await signal_service.import_signals(
+            mock_session,
+            [
+                (sample_parsed_signal, hour + timedelta(minutes=5)),
+                (sample_parsed_signal, hour + timedelta(minutes=50)),
+            ],
+        )
+
+        assert count == 2
+        # signals + probability rows + one rollup bucket
+        assert mock_session.execute.call_count == 3
+
+        signal_rows = mock_session.execute.call_args_list[0][0][1]
+        assert [row["received_at"].minute for row in signal_rows] == [5, 50]
+
+        probability_rows = mock_session.execute.call_args_list[1][0][1]
+        assert {row["signal_id"] for row in probability_rows} == {10, 11}
+        assert len(probability_rows) == 4
+
+        mock_session.add.assert_not_called()
+        mock_session.commit.assert_not_called()
+
+    @pytest.mark.unit
+    def test_build_probability_rows_skips_malformed_target(self, signal_service):
+        """Targets that are not numbers are skipped."""
+        rows = signal_service.build_probability_rows(
+            {"0.9": {"long": 82, "short": 73}, "1.2.3": {"long": 1, "short": 2}}
+        )
+
+        assert [row.target for row in rows] == [Decimal("0.9")]
+        assert signal_service.build_probability_rows(None) == []
+
     # =========================================================================
     # Get Signals Tests
     # =========================================================================
@@ -123,6 +236,42 @@ class TestBabloSignalServiceUnit:
         assert result == []
         mock_session.execute.assert_called_once()
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_signals_keyset_cursor(self, signal_service, mock_session):
+        """Test get_signals seeks past the (received_at, id) cursor."""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_session.execute.return_value = mock_result
+
+        await signal_service.get_signals(
+            mock_session,
+            after_received_at=datetime.now(timezone.utc),
+            after_id=100,
+        )
+
+        query = str(mock_session.execute.call_args[0][0])
+        assert "(bablo_signals.received_at, bablo_signals.id) <" in query
+        assert "bablo_signals.id DESC" in query
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_signals_min_quality_inlined(self, signal_service, mock_session):
+        """Quality threshold is rendered inline so the partial index can match."""
+        from sqlalchemy.dialects import postgresql
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_session.execute.return_value = mock_result
+
+        await signal_service.get_signals(mock_session, min_quality=8)
+
+        query = mock_session.execute.call_args[0][0].compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"render_postcompile": True},
+        )
+        assert "bablo_signals.quality_total >= 8" in str(query)
+
     # =========================================================================
     # Get Signals Count Tests
     # =========================================================================
@@ -144,12 +293,24 @@ class TestBabloSignalServiceUnit:
     async def test_get_signals_count_zero(self, signal_service, mock_session):
         """Test signal count returns 0 when no signals."""
         mock_result = MagicMock()
-        mock_result.scalar.return_value = None
+        mock_result.scalar.return_value = 0
         mock_session.execute.return_value = mock_result
 
         result = await signal_service.get_signals_count(mock_session)
 
         assert result == 0
+        assert "count(bablo_signals.id)" in str(mock_session.execute.call_args[0][0])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_last_signal_id_coalesced(self, signal_service, mock_session):
+        """Empty table yields 0 from SQL, not NULL."""
+        mock_result = MagicMock()
+        mock_result.scalar.return_value = 0
+        mock_session.execute.return_value = mock_result
+
+        assert await signal_service.get_last_signal_id(mock_session) == 0
+        assert "coalesce(max(bablo_signals.id)" in str(mock_session.execute.call_args[0][0])
 
     @pytest.mark.unit
     @pytest.mark.asyncio
@@ -170,154 +331,93 @@ class TestBabloSignalServiceUnit:
 
         assert result == 15
 
-    # =========================================================================
-    # Get Signals by Direction Tests
-    # =========================================================================
-
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_get_signals_by_direction(self, signal_service, mock_session):
-        """Test getting signals grouped by direction."""
+    async def test_get_signals_count_estimate(self, signal_service, mock_session):
+        """Test estimated count comes from planner statistics."""
         mock_result = MagicMock()
-        mock_result.all.return_value = [("long", 60), ("short", 40)]
+        mock_result.scalar.return_value = 12345
         mock_session.execute.return_value = mock_result
 
-        now = datetime.now(timezone.utc)
-        result = await signal_service.get_signals_by_direction(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-        )
+        result = await signal_service.get_signals_count_estimate(mock_session)
 
-        assert result == {"long": 60, "short": 40}
+        assert result == 12345
+        mock_session.execute.assert_called_once()
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_get_signals_by_direction_empty(self, signal_service, mock_session):
-        """Test getting signals by direction when empty."""
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        mock_session.execute.return_value = mock_result
+    async def test_get_signals_count_estimate_not_analyzed(
+        self, signal_service, mock_session
+    ):
+        """Test estimate falls back to exact count for never-analyzed table."""
+        estimate_result = MagicMock()
+        estimate_result.scalar.return_value = -1
+        count_result = MagicMock()
+        count_result.scalar.return_value = 42
+        mock_session.execute.side_effect = [estimate_result, count_result]
 
-        now = datetime.now(timezone.utc)
-        result = await signal_service.get_signals_by_direction(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-        )
+        result = await signal_service.get_signals_count_estimate(mock_session)
 
-        assert result == {}
+        assert result == 42
+        assert mock_session.execute.call_count == 2
 
     # =========================================================================
-    # Get Signals by Timeframe Tests
+    # Timestamps and Aggregates Tests
     # =========================================================================
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_get_signals_by_timeframe(self, signal_service, mock_session):
-        """Test getting signals grouped by timeframe."""
+    async def test_get_signal_timestamps(self, signal_service, mock_session):
+        """Receive times come back as a sorted list from one query."""
+        now = datetime.now(timezone.utc)
+        stamps = [now - timedelta(minutes=m) for m in (20, 10, 1)]
         mock_result = MagicMock()
-        mock_result.all.return_value = [
-            ("1m", 50),
-            ("15m", 30),
-            ("1h", 15),
-            ("4h", 5),
-        ]
+        mock_result.scalars.return_value.all.return_value = stamps
         mock_session.execute.return_value = mock_result
 
-        now = datetime.now(timezone.utc)
-        result = await signal_service.get_signals_by_timeframe(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
+        result = await signal_service.get_signal_timestamps(
+            mock_session, now - timedelta(hours=1), now
         )
 
-        assert result == {"1m": 50, "15m": 30, "1h": 15, "4h": 5}
-
-    # =========================================================================
-    # Get Top Symbols Tests
-    # =========================================================================
+        assert result == stamps
+        query = str(mock_session.execute.call_args[0][0])
+        assert "ORDER BY bablo_signals.received_at" in query
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_get_top_symbols(self, signal_service, mock_session):
-        """Test getting top symbols by frequency."""
+    async def test_get_aggregates_grouping_sets(self, signal_service, mock_session):
+        """Summary, timeframes and top symbols are split from one result."""
         mock_result = MagicMock()
         mock_result.all.return_value = [
-            ("BTCUSDT.P", 25),
-            ("ETHUSDT.P", 20),
-            ("XRPUSDT.P", 15),
+            (3, None, None, 10, 6, 4, 7.5),
+            (1, "1h", None, 7, 4, 3, 7.0),
+            (1, "4h", None, 3, 2, 1, 8.0),
+            (2, None, "BTCUSDT", 5, 3, 2, 8.0),
+            (2, None, "ETHUSDT", 2, 1, 1, 7.0),
+            (2, None, "SOLUSDT", 3, 2, 1, 7.0),
         ]
         mock_session.execute.return_value = mock_result
 
         now = datetime.now(timezone.utc)
-        result = await signal_service.get_top_symbols(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-            limit=3,
+        result = await signal_service.get_aggregates(
+            mock_session, now - timedelta(days=1), now, top_limit=2
         )
 
-        assert len(result) == 3
-        assert result[0] == ("BTCUSDT.P", 25)
-        assert result[1] == ("ETHUSDT.P", 20)
-        assert result[2] == ("XRPUSDT.P", 15)
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_get_top_symbols_default_limit(self, signal_service, mock_session):
-        """Test top symbols uses default limit of 5."""
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        mock_session.execute.return_value = mock_result
-
-        now = datetime.now(timezone.utc)
-        await signal_service.get_top_symbols(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-        )
-
-        # Verify the query was executed (limit is in the query)
+        assert result == {
+            "total": 10,
+            "long": 6,
+            "short": 4,
+            "average_quality": 7.5,
+            "by_timeframe": {"1h": 7, "4h": 3},
+            "top_symbols": [
+                {"symbol": "BTCUSDT", "count": 5},
+                {"symbol": "SOLUSDT", "count": 3},
+            ],
+        }
         mock_session.execute.assert_called_once()
-
-    # =========================================================================
-    # Get Average Quality Tests
-    # =========================================================================
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_get_average_quality(self, signal_service, mock_session):
-        """Test getting average quality score."""
-        mock_result = MagicMock()
-        mock_result.scalar.return_value = Decimal("7.5")
-        mock_session.execute.return_value = mock_result
-
-        now = datetime.now(timezone.utc)
-        result = await signal_service.get_average_quality(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-        )
-
-        assert result == 7.5
-
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_get_average_quality_none(self, signal_service, mock_session):
-        """Test average quality returns None when no signals."""
-        mock_result = MagicMock()
-        mock_result.scalar.return_value = None
-        mock_session.execute.return_value = mock_result
-
-        now = datetime.now(timezone.utc)
-        result = await signal_service.get_average_quality(
-            mock_session,
-            from_date=now - timedelta(days=1),
-            to_date=now,
-        )
-
-        assert result is None
+        query = str(mock_session.execute.call_args[0][0])
+        assert "GROUPING SETS" in query
+        assert "CAST(avg(bablo_signals.quality_total) AS FLOAT)" in query
 
 
 class TestParsedBabloSignalDataclass:
@@ -524,6 +624,124 @@ class TestBabloAnalyticsLogic:
         assert get_zone(0.2) == "very_low"  # < 0.25
 
 
+class TestBabloAnalyticsServiceUnit:
+    """Unit tests for Bablo AnalyticsService queries."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_daily_median_computed_in_sql(self):
+        """Daily median comes from percentile_cont over the rollup."""
+        from services.analytics_service import AnalyticsService
+
+        mock_result = MagicMock()
+        mock_result.scalar.return_value = 12.5
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=mock_result)
+
+        now = datetime.now(timezone.utc)
+        median = await AnalyticsService()._get_daily_median(
+            session, now - timedelta(days=14), now
+        )
+
+        assert median == 12
+        query = str(session.execute.call_args[0][0])
+        assert "percentile_cont" in query
+        assert "bablo_signals_rollup" in query
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_daily_median_no_data(self):
+        """No signals in range gives zero median."""
+        from services.analytics_service import AnalyticsService
+
+        mock_result = MagicMock()
+        mock_result.scalar.return_value = None
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=mock_result)
+
+        now = datetime.now(timezone.utc)
+        assert await AnalyticsService()._get_daily_median(session, now, now) == 0
+
+    @pytest.mark.unit
+    def test_today_start_reused_within_day(self):
+        """Local midnight is computed once per date."""
+        from services.analytics_service import AnalyticsService
+
+        service = AnalyticsService()
+        now = datetime(2024, 3, 10, 15, 30, tzinfo=service.tz)
+
+        first = service._today_start(now)
+        assert first == datetime(2024, 3, 10, tzinfo=service.tz)
+        assert service._today_start(now + timedelta(hours=1)) is first
+        assert service._today_start(now + timedelta(days=1)).day == 11
+
+    @pytest.mark.unit
+    def test_period_dates_local_midnight(self):
+        """Periods start at local midnight in the configured timezone."""
+        from services.analytics_service import AnalyticsService
+
+        service = AnalyticsService()
+        start, end = service._get_period_dates("yesterday")
+
+        assert (end - start) == timedelta(days=1)
+        assert end.tzinfo is service.tz
+        assert (end.hour, end.minute, end.second) == (0, 0, 0)
+
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_time_series_dense_rows_from_sql(self):
+        """Zero-filled series comes straight from generate_series rows."""
+        from datetime import date
+
+        from core import cache
+        from services.analytics_service import AnalyticsService
+
+        cache.analytics_cache._local_cache.clear()
+        start = date(2024, 1, 1)
+        rows = [
+            (start + timedelta(days=i), c)
+            for i, c in enumerate([3, 0, 0, 5, 1, 0, 2])
+        ]
+        mock_result = MagicMock()
+        mock_result.all.return_value = rows
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=mock_result)
+
+        data = await AnalyticsService().get_time_series(session, "week")
+
+        assert data["labels"] == ["01.01", "02.01", "03.01", "04.01", "05.01", "06.01", "07.01"]
+        assert data["counts"] == [3, 0, 0, 5, 1, 0, 2]
+        assert data["total"] == 11
+        assert data["median"] == 1
+        assert "generate_series" in str(session.execute.call_args[0][0])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_comparison_counts_in_one_query(self):
+        """Today, yesterday and week counts come from a single scan."""
+        from core import cache
+        from services.analytics_service import AnalyticsService
+
+        cache.analytics_cache._local_cache.clear()
+        mock_result = MagicMock()
+        mock_result.one.return_value = (12, 10, 70)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=mock_result)
+
+        data = await AnalyticsService().get_comparison(session)
+
+        session.execute.assert_awaited_once()
+        assert "FILTER (WHERE" in str(session.execute.call_args[0][0])
+        assert data == {
+            "today": 12,
+            "yesterday": 10,
+            "week_avg": 10.0,
+            "vs_yesterday": "+20%",
+            "vs_week_avg": "+20%",
+        }
+
+
 class TestBabloServiceIntegrationPatterns:
     """Test patterns for service integration."""
 
@@ -0,0 +1,66 @@
+"""Unit tests for Impulse core analytics."""
+
+from decimal import Decimal
+
+import pytest
+
+
+class TestAnalyticsUnit:
+    """Unit tests for in-memory impulse aggregations."""
+
+    @pytest.mark.unit
+    def test_aggregations_use_float_percent(self):
+        """Decimal percents are aggregated and returned as floats."""
+        from core.analytics import calculate_volatility, get_most_active_symbols
+        from models.impulse import Impulse
+
+        impulses = [
+            Impulse(symbol="BTC", percent=Decimal("12.50"), type="growth"),
+            Impulse(symbol="BTC", percent=Decimal("-8.25"), type="fall"),
+            Impulse(symbol="ETH", percent=Decimal("25.00"), type="growth"),
+        ]
+
+        assert calculate_volatility(impulses) == "medium"
+
+        result = get_most_active_symbols(impulses, limit=1)
+        assert result == [
+            {"symbol": "BTC", "count": 2, "max_growth": 12.5, "max_fall": -8.25}
+        ]
+        assert type(result[0]["max_growth"]) is float
+
+
+class TestAnalyticsServiceUnit:
+    """Unit tests for AnalyticsService with mocked database."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_analytics_counts_in_one_query(self):
+        """Total, growth and unique coin counts come from a single SELECT."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from core.cache import analytics_cache
+        from services.analytics_service import AnalyticsService
+
+        analytics_cache._local_cache.clear()
+        mock_result = MagicMock()
+        mock_result.one.return_value = (10, 6, 4)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=mock_result)
+        session_ctx = MagicMock()
+        session_ctx.__aenter__ = AsyncMock(return_value=session)
+        session_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        service = AnalyticsService()
+        with patch("services.analytics_service.async_session_maker", MagicMock(return_value=session_ctx)), \
+             patch.object(service, "_get_top_impulses", AsyncMock(return_value=[])), \
+             patch.object(service, "_get_comparison", AsyncMock(return_value=None)):
+            data = await service.get_analytics("week")
+
+        session.execute.assert_awaited_once()
+        session.scalar.assert_not_called()
+        query = str(session.execute.call_args[0][0])
+        assert "FILTER (WHERE impulses.type" in query
+        assert "count(distinct(impulses.symbol))" in query
+        assert (data.total_impulses, data.growth_count, data.fall_count, data.unique_coins) == (
+            10, 6, 4, 4
+        )
@@ -87,6 +87,17 @@ class TestSignalsEndpoint:
             assert "limit" in data
             assert "offset" in data
 
+    @pytest.mark.unit
+    def test_get_signals_body_matches_schema_dump(self, client, mock_signal_service):
+        """Response is the service model dumped once, same as response_model."""
+        with patch(
+            "api.endpoints.signals.signal_service", mock_signal_service
+        ):
+            response = client.get("/signals")
+
+        expected = mock_signal_service.get_signals.return_value.model_dump(mode="json")
+        assert response.json() == expected
+
     @pytest.mark.unit
     def test_get_signals_with_pagination(self, client, mock_signal_service):
         """Test signals retrieval with pagination parameters."""
@@ -267,6 +278,43 @@ class TestAnalyticsEndpoint:
         assert len(data["top_growth"]) == 1
         assert len(data["top_fall"]) == 1
 
+    @pytest.mark.unit
+    def test_analytics_served_from_redis_cache(self):
+        """A cached period is returned without recomputing analytics."""
+        import orjson
+
+        from api.endpoints.analytics import router
+        from shared.utils import cache
+
+        app = FastAPI()
+        app.include_router(router, prefix="/analytics")
+        now = datetime.now(timezone.utc).isoformat()
+        cached_body = {
+            "period": "week",
+            "start_date": now,
+            "end_date": now,
+            "total_impulses": 7,
+            "growth_count": 4,
+            "fall_count": 3,
+            "unique_coins": 2,
+            "top_growth": [],
+            "top_fall": [],
+            "comparison": None,
+        }
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=orjson.dumps(cached_body).decode())
+        service = AsyncMock()
+
+        with patch.object(cache, "get_redis_client", AsyncMock(return_value=redis)), patch(
+            "api.endpoints.analytics.analytics_service", service
+        ):
+            response = TestClient(app).get("/analytics/week")
+
+        assert response.status_code == 200
+        assert response.json()["total_impulses"] == 7
+        redis.get.assert_awaited_once_with("impulse:cache:analytics:period=week")
+        service.get_analytics.assert_not_called()
+
 
 class TestNotificationsEndpoint:
     """Tests for /notifications endpoint."""
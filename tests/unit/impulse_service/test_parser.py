@@ -1,15 +1,9 @@
 """Unit tests for ImpulseParser."""
 
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
-import sys
 
 import pytest
 
-# Mock the logger before importing parser
-sys.modules['shared.utils.logger'] = MagicMock()
-sys.modules['shared.utils'] = MagicMock()
-
 
 class TestImpulseParser:
     """Test suite for ImpulseParser class."""
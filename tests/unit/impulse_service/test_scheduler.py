@@ -265,3 +265,37 @@ class TestActivityEmoji:
         service = ReportService()
 
         assert service._activity_emoji("unknown") == "unknown"
+
+
+class TestSendReports:
+    """Test the scheduled report jobs."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_report_job_generates_once_and_publishes_to_subscribers(self):
+        """Each job queries its flag column, renders once and publishes in a batch."""
+        from core import scheduler
+
+        session = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [1, 2, 3]
+        session.execute = AsyncMock(return_value=result)
+        session_ctx = MagicMock()
+        session_ctx.__aenter__ = AsyncMock(return_value=session)
+        session_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        report = MagicMock(text="Report", generated_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        redis = MagicMock()
+        redis.publish_to_users = AsyncMock()
+
+        with patch.object(scheduler, "async_session_maker", MagicMock(return_value=session_ctx)), \
+             patch.object(scheduler, "report_service") as mock_reports, \
+             patch.object(scheduler, "get_redis_client", AsyncMock(return_value=redis)):
+            mock_reports.generate_report = AsyncMock(return_value=report)
+            await scheduler.send_evening_reports()
+
+        assert "evening_report" in str(session.execute.call_args[0][0])
+        mock_reports.generate_report.assert_awaited_once_with("evening", 1)
+        args = redis.publish_to_users.call_args[0]
+        assert args[2] == [1, 2, 3]
+        assert args[3]["report_type"] == "evening"
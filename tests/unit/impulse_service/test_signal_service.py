@@ -84,6 +84,61 @@ class TestSignalServiceUnit:
             # In practice, you'd use a test database or more sophisticated mocking
             pass
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_signal_timestamps_sorted_range(
+        self, signal_service, mock_session, mock_session_maker
+    ):
+        """Receive times of the range come back oldest first from one query."""
+        from datetime import datetime, timedelta, timezone
+
+        now = datetime.now(timezone.utc)
+        stamps = [now - timedelta(minutes=m) for m in (30, 10, 1)]
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = stamps
+        mock_session.execute.return_value = mock_result
+
+        with patch("services.signal_service.async_session_maker", mock_session_maker):
+            result = await signal_service.get_signal_timestamps(now - timedelta(hours=1), now)
+
+        assert result == stamps
+        mock_session.execute.assert_called_once()
+        assert "ORDER BY impulses.received_at" in str(mock_session.execute.call_args[0][0])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_signals_builds_schemas_from_rows(
+        self, signal_service, mock_session, mock_session_maker
+    ):
+        """Page rows are copied into schemas that dump like validated ones."""
+        from datetime import datetime, timezone
+
+        from shared.schemas.impulse import ImpulseSchema
+
+        row = MagicMock(
+            id=1,
+            symbol="BTCUSDT",
+            percent=Decimal("15.50"),
+            max_percent=None,
+            type="growth",
+            growth_ratio=Decimal("1.20"),
+            fall_ratio=None,
+            raw_message="raw",
+            received_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        mock_session.scalar.return_value = 1
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [row]
+        mock_session.execute.return_value = mock_result
+
+        with patch("services.signal_service.async_session_maker", mock_session_maker):
+            result = await signal_service.get_signals(limit=10)
+
+        assert result.total == 1
+        dumped = result.model_dump(mode="json")
+        validated = ImpulseSchema.model_validate(row, from_attributes=True)
+        assert dumped["signals"] == [validated.model_dump(mode="json")]
+
     @pytest.mark.unit
     def test_impulse_create_schema_validation(self):
         """Test ImpulseCreate schema validation."""
@@ -0,0 +1,152 @@
+"""Unit tests for the shared analytics cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.utils import cache
+
+
+@pytest.fixture
+def analytics():
+    """Create a cache for a test service."""
+    return cache.AnalyticsCache("bablo")
+
+
+@pytest.fixture
+def mock_redis():
+    """Create mock RedisClient with pipeline support."""
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, 1])
+    pipe_ctx = MagicMock()
+    pipe_ctx.__aenter__ = AsyncMock(return_value=pipe)
+    pipe_ctx.__aexit__ = AsyncMock(return_value=False)
+    redis.client.pipeline.return_value = pipe_ctx
+    redis.pipe = pipe
+    return redis
+
+
+class TestCachedDecorator:
+    """Tests for the cached() decorator."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_miss_calls_function_and_stores_result(self, analytics, mock_redis):
+        """Cache miss computes result and stores it with per-period TTL."""
+        compute = AsyncMock(return_value={"total": 5})
+        endpoint = analytics.cached("analytics", ttl=cache.PERIOD_TTL)(compute)
+
+        with patch.object(cache, "get_redis_client", AsyncMock(return_value=mock_redis)):
+            result = await endpoint(period="week", session=MagicMock(spec=AsyncSession))
+
+        assert result == {"total": 5}
+        compute.assert_awaited_once()
+        key = "bablo:cache:analytics:period=week"
+        mock_redis.pipe.set.assert_called_once_with(
+            key, orjson.dumps({"total": 5}), ex=cache.PERIOD_TTL["week"]
+        )
+        mock_redis.pipe.sadd.assert_called_once_with(analytics.registry_key, key)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ttl_mapping_uses_ttl_key(self, analytics, mock_redis):
+        """TTL mappings can be keyed by an argument other than period."""
+        compute = AsyncMock(return_value={"service": "bablo"})
+        endpoint = analytics.cached(
+            "report_data", ttl={"evening": 30}, ttl_key="report_type"
+        )(compute)
+
+        with patch.object(cache, "get_redis_client", AsyncMock(return_value=mock_redis)):
+            await endpoint(report_type="evening", session=MagicMock(spec=AsyncSession))
+
+        mock_redis.pipe.set.assert_called_once_with(
+            "bablo:cache:report_data:report_type=evening",
+            orjson.dumps({"service": "bablo"}),
+            ex=30,
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_hit_skips_function(self, analytics, mock_redis):
+        """Cache hit returns stored value without calling the endpoint."""
+        mock_redis.get = AsyncMock(return_value=orjson.dumps({"total": 7}).decode())
+        compute = AsyncMock()
+        endpoint = analytics.cached("analytics", ttl=30)(compute)
+
+        with patch.object(cache, "get_redis_client", AsyncMock(return_value=mock_redis)):
+            result = await endpoint(period="today")
+
+        assert result == {"total": 7}
+        compute.assert_not_awaited()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_function(self, analytics):
+        """Redis errors must not break the endpoint."""
+        compute = AsyncMock(return_value={"total": 1})
+        endpoint = analytics.cached("analytics")(compute)
+
+        failing = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch.object(cache, "get_redis_client", failing):
+            result = await endpoint(period="today")
+
+        assert result == {"total": 1}
+
+
+class TestLocalCached:
+    """Tests for the in-process local_cached() decorator."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_positional_period_is_cached(self, analytics):
+        """Repeated calls with the same period hit memory, not the method."""
+        calls = []
+
+        class Service:
+            @analytics.local_cached("analytics", ttl=cache.PERIOD_TTL)
+            async def get_analytics(self, session, period):
+                calls.append(period)
+                return {"period": period}
+
+        service = Service()
+        session = MagicMock(spec=AsyncSession)
+
+        assert await service.get_analytics(session, "week") == {"period": "week"}
+        assert await service.get_analytics(MagicMock(spec=AsyncSession), "week") == {"period": "week"}
+        assert await service.get_analytics(session, "today") == {"period": "today"}
+        assert calls == ["week", "today"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_local_entries(self, analytics):
+        """invalidate_cache() drops in-process entries even if Redis is down."""
+        compute = AsyncMock(return_value={"total": 1})
+        cached_compute = analytics.local_cached("analytics", ttl=300)(compute)
+
+        await cached_compute(period="month")
+        with patch.object(cache, "get_redis_client", AsyncMock(side_effect=ConnectionError)):
+            await analytics.invalidate()
+        await cached_compute(period="month")
+
+        assert compute.await_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_expired_entry_recomputed(self, analytics):
+        """Entries past their TTL are recomputed."""
+        compute = AsyncMock(return_value={"total": 1})
+        cached_compute = analytics.local_cached("analytics", ttl=30)(compute)
+
+        await cached_compute(period="today")
+        key = next(iter(analytics._local_cache))
+        analytics._local_cache[key] = (0.0, {"total": 0})
+        result = await cached_compute(period="today")
+
+        assert result == {"total": 1}
+
+        assert compute.await_count == 2
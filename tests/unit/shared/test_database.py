@@ -0,0 +1,31 @@
+"""Tests for database connection helpers."""
+
+import pytest
+
+pytest.importorskip("asyncpg", reason="asyncpg not installed")
+
+
+class TestAsyncpgUrl:
+    """Tests for asyncpg_url function."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "postgresql://user:pass@db:5432/app",
+            "postgres://user:pass@db:5432/app",
+            "postgresql+asyncpg://user:pass@db:5432/app",
+        ],
+    )
+    def test_postgres_urls_use_asyncpg(self, url):
+        """Plain PostgreSQL URLs are rewritten to the asyncpg driver."""
+        from shared.database.connection import asyncpg_url
+
+        assert asyncpg_url(url) == "postgresql+asyncpg://user:pass@db:5432/app"
+
+    @pytest.mark.unit
+    def test_other_urls_unchanged(self):
+        """Non-PostgreSQL URLs are left as is."""
+        from shared.database.connection import asyncpg_url
+
+        assert asyncpg_url("sqlite+aiosqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"